@@ -0,0 +1,100 @@
+"""
+End-to-end chat latency for common questions, with and without direct answers.
+
+Drives /v1/chat/send/stream in-process against a stand-in Ollama server
+whose /api/chat replies after --llm-ms, so the numbers show what skipping
+the summarization turn saves for a model of that speed. Tools run for real;
+the databases are created in a scratch directory.
+
+Usage (from the ollama-toolchat directory):
+    python -m benchmarks.bench_chat_latency --rounds 20 --llm-ms 800
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fastapi.testclient import TestClient
+from src.toolchat.config import settings
+
+QUESTIONS = [
+    "what's my hostname",
+    "who am i",
+    "how much memory do I have",
+    "what's the system uptime",
+    "what kernel am I running",
+]
+
+
+def _fake_ollama(llm_ms: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            time.sleep(llm_ms / 1000)
+            reply = json.dumps({"message": {"role": "assistant", "content": "Here is what the tool reported for you."}})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(reply.encode())
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+def _ask(client: TestClient, question: str) -> float:
+    started = time.perf_counter()
+    with client.stream("POST", "/v1/chat/send/stream", json={"message": question}) as response:
+        for line in response.iter_lines():
+            if line.startswith("data: ") and json.loads(line[6:])["type"] in ("done", "error"):
+                break
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--llm-ms", type=float, default=800, help="Simulated duration of one LLM chat call")
+    args = parser.parse_args()
+    
+    # Keep benchmark sessions and audit rows out of the real databases
+    scratch = tempfile.mkdtemp(prefix="toolchat-bench-")
+    for field in ("audit_db_path", "chat_db_path", "exif_cache_db_path", "photo_hash_db_path", "metrics_db_path"):
+        setattr(settings, field, os.path.join(scratch, os.path.basename(getattr(settings, field))))
+    settings.metrics_enabled = False
+    server = _fake_ollama(args.llm_ms)
+    from src.toolchat.agent.ollama_client import ollama_client
+    from src.toolchat.main import app
+    ollama_client.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    logging.disable(logging.WARNING)
+    
+    report = {"llm_ms": args.llm_ms, "rounds": args.rounds, "questions": QUESTIONS}
+    try:
+        with TestClient(app) as client:
+            for label, enabled in (("summarized", False), ("direct", True)):
+                settings.direct_answers = enabled
+                samples = [_ask(client, q) for _ in range(args.rounds) for q in QUESTIONS]
+                report[label] = {
+                    "median_ms": round(statistics.median(samples), 1),
+                    "mean_ms": round(statistics.fmean(samples), 1),
+                }
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(scratch, ignore_errors=True)
+    
+    report["median_saved_ms"] = round(report["summarized"]["median_ms"] - report["direct"]["median_ms"], 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
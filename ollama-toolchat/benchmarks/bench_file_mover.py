@@ -0,0 +1,90 @@
+"""
+Throughput of FileMover for same-filesystem renames and cross-device copies.
+
+Usage (from the ollama-toolchat directory):
+    python -m benchmarks.bench_file_mover --count 2000 --size-kb 256 --other-fs /dev/shm
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from src.toolchat.tools.file_mover import FileMover
+
+
+def _populate(directory: Path, count: int, size: int) -> list:
+    payload = os.urandom(size)
+    paths = []
+    for i in range(count):
+        path = directory / f"sub{i % 16}" / f"IMG_{i:05d}.jpg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+        paths.append(path)
+    return paths
+
+
+def _run(source_root: Path, dest_root: Path, count: int, size: int, workers: int) -> dict:
+    sources = _populate(source_root, count, size)
+    moves = [(p, dest_root / "2024_01" / p.name) for p in sources]
+    
+    mover = FileMover(workers=workers)
+    started = time.perf_counter()
+    for _ in mover.move_all(moves, dest_root / ".journal"):
+        pass
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "files": count,
+        "bytes_per_file": size,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "files_per_sec": round(count / elapsed, 1),
+        "mb_per_sec": round(count * size / (1024 * 1024) / elapsed, 1),
+        "renamed": mover.stats["renamed"],
+        "copied": mover.stats["copied"],
+    }
+
+
+def _run_shutil(source_root: Path, dest_root: Path, count: int, size: int) -> dict:
+    sources = _populate(source_root, count, size)
+    started = time.perf_counter()
+    for p in sources:
+        target = dest_root / "2024_01" / p.name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(p), str(target))
+    elapsed = time.perf_counter() - started
+    return {"files": count, "seconds": round(elapsed, 3), "files_per_sec": round(count / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--base-dir", default=None, help="Directory for the destination tree (default: system temp)")
+    parser.add_argument("--other-fs", default="/dev/shm", help="Directory on a different filesystem for the cross-device case")
+    args = parser.parse_args()
+    size = args.size_kb * 1024
+    
+    report = {}
+    with tempfile.TemporaryDirectory(dir=args.base_dir) as base:
+        base = Path(base)
+        report["same_fs"] = _run(base / "src1", base / "dst1", args.count, size, args.workers)
+        report["same_fs_shutil_move"] = _run_shutil(base / "src2", base / "dst2", args.count, size)
+        
+        if os.path.isdir(args.other_fs) and os.stat(args.other_fs).st_dev != os.stat(base).st_dev:
+            with tempfile.TemporaryDirectory(dir=args.other_fs) as other:
+                other = Path(other)
+                report["cross_device"] = _run(other / "src1", base / "dst3", args.count, size, args.workers)
+                report["cross_device_shutil_move"] = _run_shutil(other / "src2", base / "dst4", args.count, size)
+        else:
+            report["cross_device"] = "skipped: --other-fs is missing or on the same filesystem"
+    
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
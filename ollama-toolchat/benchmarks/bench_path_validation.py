@@ -0,0 +1,101 @@
+"""
+Cost of PathValidator.can_read / validate_read per call.
+
+Compares the current validator (prefix tries plus a short-lived resolve
+cache) with the previous approach, re-implemented here: resolve on every
+call, then try relative_to() against each denied path and each root.
+
+Usage (from the ollama-toolchat directory):
+    python -m benchmarks.bench_path_validation --calls 100000 --roots 8
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from src.toolchat.infra.security import PathValidator
+
+
+class LinearValidator:
+    """The validator as it was before the tries and the resolve cache."""
+    
+    def __init__(self, read_roots, denied_paths):
+        self.read_roots = [Path(r).resolve() for r in read_roots]
+        self.denied_paths = denied_paths
+    
+    def normalize_path(self, path):
+        p = Path(path).expanduser()
+        return p.resolve() if p.exists() else p.resolve(strict=False)
+    
+    def can_read(self, path):
+        normalized = self.normalize_path(path)
+        for denied in self.denied_paths:
+            try:
+                normalized.relative_to(denied)
+                return False
+            except ValueError:
+                continue
+        for root in self.read_roots:
+            try:
+                normalized.relative_to(root)
+                return True
+            except ValueError:
+                continue
+        return False
+    
+    def validate_read(self, path):
+        if not self.can_read(path):
+            raise ValueError(path)
+        return self.normalize_path(path)
+
+
+def _time(fn, paths, calls):
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(paths[i % len(paths)])
+    elapsed = time.perf_counter() - started
+    return round(elapsed / calls * 1e6, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--roots", type=int, default=8, help="Number of read roots")
+    parser.add_argument("--depth", type=int, default=6, help="Directory depth of the checked paths")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as base:
+        roots = [Path(base) / f"root{i}" for i in range(args.roots)]
+        paths = []
+        for root in roots:
+            leaf = root.joinpath(*[f"d{d}" for d in range(args.depth)])
+            leaf.mkdir(parents=True)
+            paths.append(str(leaf))
+            paths.append(str(leaf / "missing.txt"))
+        
+        current = PathValidator(read_roots=[str(r) for r in roots], write_roots=[])
+        linear = LinearValidator([str(r) for r in roots], current.denied_paths)
+        assert all(current.can_read(p) == linear.can_read(p) for p in paths)
+        
+        report = {
+            "calls": args.calls,
+            "roots": args.roots,
+            "depth": args.depth,
+            "can_read_us": {
+                "linear": _time(linear.can_read, paths, args.calls),
+                "trie_cached": _time(current.can_read, paths, args.calls),
+            },
+            "validate_read_us": {
+                "linear": _time(linear.validate_read, paths, args.calls),
+                "trie_cached": _time(current.validate_read, paths, args.calls),
+            },
+        }
+        uncached = PathValidator(read_roots=[str(r) for r in roots], write_roots=[], resolve_ttl=0)
+        report["can_read_us"]["trie_uncached"] = _time(uncached.can_read, paths, args.calls)
+    
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
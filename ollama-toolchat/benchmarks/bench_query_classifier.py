@@ -0,0 +1,168 @@
+"""
+Cost of classify_query per query.
+
+Compares the word-level Aho-Corasick classifier with the previous approach,
+re-implemented here: a substring scan over every auto-response and system
+pattern, then nine regexes compiled (via the re cache) on each call. Also
+reports how many queries the two classify differently, since whole-word
+matching intentionally drops matches inside longer words, and how both
+scale when --extra-patterns synthetic phrases are added to the table.
+
+Usage (from the ollama-toolchat directory):
+    python -m benchmarks.bench_query_classifier --rounds 2000
+    python -m benchmarks.bench_query_classifier --queries my-queries.txt
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from src.toolchat.agent.phrase_matcher import PhraseMatcher
+from src.toolchat.agent.query_classifier import (
+    AUTO_RESPONSE_PATTERNS,
+    REGEX_PATTERNS,
+    SYSTEM_QUERY_PATTERNS,
+    classify_query,
+)
+
+# Queries as typed into the chat UI
+CORPUS = [
+    "how much memory do I have",
+    "How much RAM is free right now?",
+    "what's using my ram",
+    "which processes using the most memory",
+    "what is my cpu temperature",
+    "cpu temps please",
+    "show me the gpu utilization",
+    "is my graphics card temp ok",
+    "how much disk space is left on /home",
+    "check my disk usage",
+    "list block devices",
+    "what's mounted under /mnt",
+    "what is my ip address",
+    "show the routing table",
+    "which ports are listening? show listening ports",
+    "is dns working",
+    "how long has this machine been up - uptime",
+    "what kernel am I running",
+    "who am i logged in as",
+    "what's running on this box",
+    "top processes by cpu",
+    "list usb devices",
+    "show pci devices",
+    "read the system logs from the last hour",
+    "show dmesg errors",
+    "what can you do",
+    "help",
+    "what tools do you have",
+    "how can you help me organize my photos",
+    "organize my photos by date",
+    "find duplicate files in ~/Downloads",
+    "move the pdfs from Downloads to Documents",
+    "tell me a joke",
+    "what's the weather like",
+    "write a haiku about linux",
+    "summarize the readme in my projects folder",
+    "restart the docker service",
+    "show me the last 50 lines of /var/log/syslog",
+    "how big is my Pictures directory",
+    "find large files over 1GB",
+    "search my notes for 'backup'",
+    "display my memory",
+    "get my ip",
+    "what is the processor temp",
+    "any network connection problems?",
+    "are there any unmounted partitions",
+    "is the nvidia temp too high while gaming",
+    "nvidia temperature",
+    "what's my graphics card temperature?",
+    "show graphics card temperature",
+    "gpu temperatures while idle",
+    "memory usage by processes",
+    "how long is the journalctl output",
+    "how helpful is the manual",
+    "ping the shipping server at 10.0.0.5",
+    "what are your capabilities exactly",
+    "explain what swap is",
+    "compare the two config files in ~/dotfiles",
+]
+
+
+def legacy_classify(query):
+    query_lower = query.lower().strip()
+    for pattern, response_type in AUTO_RESPONSE_PATTERNS.items():
+        if pattern in query_lower:
+            return True, f"auto_response:{response_type}"
+    for pattern, tool_name in SYSTEM_QUERY_PATTERNS.items():
+        if pattern in query_lower:
+            return True, tool_name
+    for regex, tool_name in REGEX_PATTERNS:
+        if re.search(regex.pattern, query_lower):
+            return True, tool_name
+    return False, None
+
+
+def _scaling(queries, extra, rounds):
+    """Phrase lookup alone with the real patterns plus `extra` made-up ones."""
+    patterns = list(AUTO_RESPONSE_PATTERNS) + list(SYSTEM_QUERY_PATTERNS)
+    patterns += [f"synthetic{i} pattern{i % 97}" for i in range(extra)]
+    matcher = PhraseMatcher([(pattern, pattern) for pattern in patterns])
+    
+    def linear(query):
+        query_lower = query.lower()
+        return next((pattern for pattern in patterns if pattern in query_lower), None)
+    
+    return {
+        "patterns": len(patterns),
+        "linear_us": _time(linear, queries, rounds),
+        "aho_corasick_us": _time(matcher.best, queries, rounds),
+    }
+
+
+def _time(fn, queries, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            fn(query)
+    elapsed = time.perf_counter() - started
+    return round(elapsed / (rounds * len(queries)) * 1e6, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000, help="Passes over the corpus")
+    parser.add_argument("--extra-patterns", type=int, default=1000, help="Synthetic phrases for the scaling run")
+    parser.add_argument("--queries", default=None, help="File with one query per line instead of the built-in corpus")
+    args = parser.parse_args()
+    
+    if args.queries:
+        with open(args.queries) as f:
+            queries = [line.strip() for line in f if line.strip()]
+    else:
+        queries = CORPUS
+    
+    # classify_query logs every hit; keep that out of the timing
+    logging.disable(logging.INFO)
+    
+    changed = {}
+    for query in queries:
+        before, after = legacy_classify(query)[1], classify_query(query)[1]
+        if before != after:
+            changed[query] = {"legacy": before, "current": after}
+    
+    report = {
+        "queries": len(queries),
+        "rounds": args.rounds,
+        "classify_us": {
+            "legacy": _time(legacy_classify, queries, args.rounds),
+            "aho_corasick": _time(classify_query, queries, args.rounds),
+        },
+        "scaling": _scaling(queries, args.extra_patterns, max(args.rounds // 10, 1)),
+        "classified_differently": changed,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Overhead of each SANDBOX_MODE for representative tool commands.
+
+Every mode runs in its own worker process so CPU time and peak RSS of the
+commands (and of any warm helpers) are attributed to that mode alone. Modes
+whose binaries are missing or unusable here are skipped. The report is
+written as JSON; pass --baseline with an earlier report to fail (exit 1)
+when a mode's p50 latency regresses by more than --tolerance.
+
+Usage (from the ollama-toolchat directory):
+    python -m benchmarks.bench_sandbox --iterations 100 --output sandbox-bench.json
+    python -m benchmarks.bench_sandbox --baseline sandbox-bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+from src.toolchat.infra.sandbox import SandboxRunner
+from src.toolchat.tools.cmd.specs_perf import create_free_tool, create_ps_tool, create_uptime_tool
+from src.toolchat.tools.cmd.specs_storage import create_df_tool, create_lsblk_tool
+from src.toolchat.tools.cmd.specs_system_info import create_uname_tool
+
+# mode -> (SandboxRunner arguments, binary it needs)
+MODES: Dict[str, Tuple[dict, Optional[str]]] = {
+    "none": ({"mode": "none"}, None),
+    "bwrap": ({"mode": "bwrap"}, "bwrap"),
+    "bwrap_warm": ({"mode": "bwrap", "warm": True}, "bwrap"),
+    "systemd": ({"mode": "systemd"}, "systemd-run"),
+    "systemd_pool": ({"mode": "systemd", "systemd_pool_size": 2}, "systemd-run"),
+}
+
+TOOL_FACTORIES = [
+    create_df_tool, create_free_tool, create_ps_tool,
+    create_uptime_tool, create_lsblk_tool, create_uname_tool,
+]
+
+
+def _commands() -> Dict[str, List[str]]:
+    """Commands exactly as the tools build them, for binaries present here."""
+    commands = {}
+    for factory in TOOL_FACTORIES:
+        tool = factory()
+        if os.path.exists(tool.command_spec.binary):
+            commands[tool.spec.name] = tool._build_command(tool.command_spec.default_args)
+    return commands
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
+
+
+def _latency(runner: SandboxRunner, command: List[str], iterations: int) -> dict:
+    runner.run(command)  # warm-up; starts helpers in the pooled modes
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = runner.run(command, timeout=30, max_output_bytes=1 << 20)
+        samples.append((time.perf_counter() - started) * 1000)
+        if not result["ok"]:
+            raise RuntimeError(f"{command[0]} failed: {result['stderr'].strip()}")
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": _percentile(samples, 0.50),
+        "p99_ms": _percentile(samples, 0.99),
+    }
+
+
+async def _throughput(runner: SandboxRunner, command: List[str], total: int, concurrency: int) -> float:
+    gate = asyncio.Semaphore(concurrency)
+    
+    async def one():
+        async with gate:
+            await runner.run_async(command, timeout=30, max_output_bytes=1 << 20)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(total)])
+    return round(total / (time.perf_counter() - started), 1)
+
+
+def _helper_rss_kb(runner: SandboxRunner) -> int:
+    total = 0
+    for helper in runner._helpers.values():
+        if helper.alive:
+            with open(f"/proc/{helper.process.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+    return total
+
+
+def _worker(mode: str, iterations: int, concurrency: int) -> dict:
+    runner = SandboxRunner(**MODES[mode][0])
+    commands = _commands()
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    try:
+        probe = runner.run(["true"], timeout=10)
+        if not probe["ok"]:
+            return {"skipped": f"probe failed: {probe['stderr'].strip()[:200]}"}
+        report = {"commands": {}}
+        for name, command in commands.items():
+            report["commands"][name] = _latency(runner, command, iterations)
+        first = next(iter(commands.values()))
+        report["throughput_per_sec"] = asyncio.run(
+            _throughput(runner, first, iterations, concurrency)
+        )
+        report["helper_rss_kb"] = _helper_rss_kb(runner)
+        # Setup vs. total split as recorded by the runner itself
+        report["timings"] = runner.stats.snapshot()
+    finally:
+        runner.close()
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    executed = len(commands) * (iterations + 1) + iterations + 1
+    report["cpu_ms_per_command"] = round(
+        ((after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)) * 1000 / executed, 3
+    )
+    # Largest single child (or helper) seen by this worker
+    report["peak_child_rss_kb"] = after.ru_maxrss
+    p50s = [c["p50_ms"] for c in report["commands"].values()]
+    report["p50_ms"] = round(statistics.median(p50s), 3)
+    return report
+
+
+def _run_worker(mode: str, iterations: int, concurrency: int) -> dict:
+    binary = MODES[mode][1]
+    if binary and shutil.which(binary) is None:
+        return {"skipped": f"{binary} is not installed"}
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_sandbox", "--worker", mode,
+             "--iterations", str(iterations), "--concurrency", str(concurrency),
+             "--output", output.name],
+            check=True,
+        )
+        with open(output.name) as f:
+            return json.load(f)
+
+
+def _regressions(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    found = []
+    for mode, result in report["modes"].items():
+        before = baseline.get("modes", {}).get(mode, {})
+        if "p50_ms" in result and "p50_ms" in before:
+            if result["p50_ms"] > before["p50_ms"] * (1 + tolerance):
+                found.append(f"{mode}: p50 {before['p50_ms']}ms -> {result['p50_ms']}ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated subset of " + ", ".join(MODES))
+    parser.add_argument("--output", default="sandbox-bench.json")
+    parser.add_argument("--baseline", default=None, help="Earlier report to compare p50 latency against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown vs. the baseline")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        try:
+            result = _worker(args.worker, args.iterations, args.concurrency)
+        except RuntimeError as e:
+            result = {"skipped": str(e)}
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+        return
+    
+    report = {
+        "host": platform.node(),
+        "kernel": platform.release(),
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "commands": {name: " ".join(command) for name, command in _commands().items()},
+        "modes": {},
+    }
+    for mode in args.modes.split(","):
+        report["modes"][mode] = _run_worker(mode, args.iterations, args.concurrency)
+    
+    baseline_p50 = report["modes"].get("none", {}).get("p50_ms")
+    for result in report["modes"].values():
+        if baseline_p50 and "p50_ms" in result:
+            result["overhead_vs_none_ms"] = round(result["p50_ms"] - baseline_p50, 3)
+    
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = _regressions(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
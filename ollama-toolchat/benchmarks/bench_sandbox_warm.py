@@ -0,0 +1,73 @@
+"""
+Per-command latency of a fresh bwrap sandbox versus the warm sandbox helper.
+
+Without bwrap installed, pass --unwrapped to compare a plain fork/exec with
+the helper protocol alone (no namespace), which bounds the helper's own cost.
+
+Usage (from the ollama-toolchat directory):
+    python -m benchmarks.bench_sandbox_warm --iterations 200 --command "df -h /"
+"""
+
+import argparse
+import json
+import shlex
+import shutil
+import statistics
+import sys
+import time
+from src.toolchat.infra.sandbox import SandboxRunner
+from src.toolchat.infra.warm_sandbox import WarmSandbox
+
+
+def _latencies(run, iterations: int) -> dict:
+    run()  # warm-up (starts the helper in warm mode)
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        result = run()
+        samples.append((time.perf_counter() - started) * 1000)
+        if not result["ok"]:
+            raise SystemExit(f"Command failed: {result['stderr']}")
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--command", default="df -h /")
+    parser.add_argument("--unwrapped", action="store_true", help="Measure the helper without bwrap")
+    args = parser.parse_args()
+    command = shlex.split(args.command)
+    
+    report = {"command": args.command}
+    if args.unwrapped:
+        direct = SandboxRunner(mode="none")
+        helper = WarmSandbox(lambda argv, runtime_dir: argv, python=sys.executable)
+        try:
+            report["direct"] = _latencies(lambda: direct.run(command), args.iterations)
+            report["helper"] = _latencies(lambda: helper.run(command), args.iterations)
+        finally:
+            helper.close()
+    elif shutil.which("bwrap") is None:
+        report["bwrap"] = "skipped: bwrap is not installed (try --unwrapped)"
+    else:
+        cold = SandboxRunner(mode="bwrap")
+        warm = SandboxRunner(mode="bwrap", warm=True)
+        try:
+            report["bwrap_cold"] = _latencies(lambda: cold.run(command), args.iterations)
+            report["bwrap_warm"] = _latencies(lambda: warm.run(command), args.iterations)
+        finally:
+            warm.close()
+        report["speedup"] = round(report["bwrap_cold"]["p50_ms"] / report["bwrap_warm"]["p50_ms"], 2)
+    
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
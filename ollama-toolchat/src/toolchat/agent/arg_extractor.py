@@ -0,0 +1,155 @@
+"""
+Deterministic argument extraction for the classifier fast path.
+
+Pulls paths, service names, line counts, hosts and the like out of the
+user's message and fills the matching properties of a tool's args_schema,
+so tools that need an argument can still be called without asking the LLM.
+Anything not recognised is left out; if a required argument is missing the
+caller falls back to the LLM.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from ..tools.registry import registry
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+_QUOTED_RE = re.compile(r"[\"'`]([^\"'`]+)[\"'`]")
+# A path starts at ~ or / not preceded by a word character ("and/or" is not a path)
+_PATH_RE = re.compile(r"(?<![\w/~.])(~(?:/[^\s\"'`,;!?()]*)?|/[^\s\"'`,;!?()]*)")
+_HOME_FOLDER_RE = re.compile(r"\b(downloads|documents|pictures|music|videos|desktop)\b", re.IGNORECASE)
+
+_SERVICE_PATTERNS = [
+    re.compile(r"\b([\w@-]+(?:\.[\w@-]+)*)\.service\b", re.IGNORECASE),
+    re.compile(r"\b(?:service|daemon|unit)\s+(?:called\s+|named\s+)?([\w@-]+(?:\.[\w@-]+)*)", re.IGNORECASE),
+    re.compile(r"\b([\w@-]+(?:\.[\w@-]+)*)\s+(?:service|daemon|unit)\b", re.IGNORECASE),
+    re.compile(r"\bis\s+([\w@-]+)\s+(?:running|active|up)\b", re.IGNORECASE),
+]
+_NOT_A_NAME = {
+    "a", "an", "the", "my", "this", "that", "which", "what", "any", "each", "every",
+    "it", "system", "systemd", "status", "is", "of", "for", "running", "active",
+}
+
+_LINES_RE = re.compile(r"\b(\d{1,5})\s+(?:lines|entries|messages|logs|log lines|log entries)\b", re.IGNORECASE)
+_LAST_N_RE = re.compile(r"\b(?:last|latest|recent|first|top)\s+(\d{1,5})\b", re.IGNORECASE)
+_DEPTH_RE = re.compile(r"\b(?:depth(?:\s+of)?\s+(\d)|(\d)\s+levels?(?:\s+deep)?)\b", re.IGNORECASE)
+
+_IPV4_RE = re.compile(r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b")
+_HOSTNAME_RE = re.compile(r"\b((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,63})\b", re.IGNORECASE)
+
+
+def extract_path(query: str) -> Optional[str]:
+    """First filesystem path in the query, with ~ expanded."""
+    for quoted in _QUOTED_RE.findall(query):
+        if quoted.startswith(("/", "~")):
+            return os.path.expanduser(quoted)
+    
+    match = _PATH_RE.search(query)
+    if match:
+        path = match.group(1).rstrip(".:")
+        if path.endswith("/") and len(path) > 1:
+            path = path.rstrip("/")
+        return os.path.expanduser(path)
+    
+    # "duplicates in my Downloads folder"
+    match = _HOME_FOLDER_RE.search(query)
+    if match:
+        return str(Path.home() / match.group(1).capitalize())
+    
+    return None
+
+
+def extract_service(query: str) -> Optional[str]:
+    for pattern in _SERVICE_PATTERNS:
+        for name in pattern.findall(query):
+            if name.lower() not in _NOT_A_NAME:
+                return name
+    return None
+
+
+def extract_lines(query: str) -> Optional[int]:
+    match = _LINES_RE.search(query) or _LAST_N_RE.search(query)
+    return int(match.group(1)) if match else None
+
+
+def extract_depth(query: str) -> Optional[int]:
+    match = _DEPTH_RE.search(query)
+    return int(match.group(1) or match.group(2)) if match else None
+
+
+def extract_host(query: str) -> Optional[str]:
+    match = _IPV4_RE.search(query)
+    if match:
+        return match.group(0)
+    # Drop paths first so "/etc/hosts.d" is not read as a hostname
+    without_paths = _PATH_RE.sub(" ", query)
+    match = _HOSTNAME_RE.search(without_paths)
+    if match:
+        return match.group(1).lower()
+    if re.search(r"\blocalhost\b", query, re.IGNORECASE):
+        return "localhost"
+    return None
+
+
+def extract_pattern(query: str) -> Optional[str]:
+    """A quoted search term that is not a path."""
+    for quoted in _QUOTED_RE.findall(query):
+        if not quoted.startswith(("/", "~")):
+            return quoted
+    return None
+
+
+# Schema property name -> extractor
+EXTRACTORS: Dict[str, Callable[[str], Any]] = {
+    "path": extract_path,
+    "target": extract_path,
+    "service": extract_service,
+    "lines": extract_lines,
+    "depth": extract_depth,
+    "max_depth": extract_depth,
+    "host": extract_host,
+    "pattern": extract_pattern,
+    "name": extract_pattern,
+}
+
+_TYPES = {"string": str, "integer": int}
+
+
+def extract_args(query: str, args_schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Fill the schema's properties from the query.
+    
+    Returns:
+        The arguments found (possibly empty), or None if a required
+        argument could not be extracted.
+    """
+    properties = args_schema.get("properties", {})
+    args: Dict[str, Any] = {}
+    
+    for name, prop in properties.items():
+        extractor = EXTRACTORS.get(name)
+        if extractor is None:
+            continue
+        value = extractor(query)
+        if value is None or not isinstance(value, _TYPES.get(prop.get("type"), object)):
+            continue
+        if "enum" in prop and value not in prop["enum"]:
+            continue
+        args[name] = value
+    
+    missing = [name for name in args_schema.get("required", []) if name not in args]
+    if missing:
+        logger.info(f"Could not extract required arguments {missing} from query")
+        return None
+    return args
+
+
+def args_for_tool(tool_name: str, query: str) -> Optional[Dict[str, Any]]:
+    """Arguments for calling a registered tool directly, or None to let the LLM handle it."""
+    tool = registry.get(tool_name)
+    if tool is None:
+        return None
+    return extract_args(query, tool.spec.args_schema)
@@ -0,0 +1,631 @@
+"""Per-tool formatters that turn a successful tool result into the text the model sees.
+
+FORMATTERS maps a tool name to a function taking the result's ``data``
+dict; format_tool_result does a single lookup instead of walking a chain
+of conditions. Command tools with a parser render from ``data["records"]``
+and fall back to their raw stdout when parsing was not possible; tools
+that emit JSON say the output could not be read instead.
+"""
+
+import re
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
+
+Formatter = Callable[[Dict[str, Any]], str]
+
+_PSEUDO_FILESYSTEMS = {"tmpfs", "devtmpfs", "efivarfs", "squashfs", "ramfs"}
+_PRIORITIES = ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
+
+
+def _format_size(size_bytes: Any) -> str:
+    if not isinstance(size_bytes, (int, float)):
+        return 'N/A'
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f}{unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f}PB"
+
+
+def _stdout(data: Dict[str, Any]) -> str:
+    return (data.get("stdout") or "").strip()
+
+
+def _lines(data: Dict[str, Any]) -> List[str]:
+    return _stdout(data).split("\n")
+
+
+def _stdout_block(label: str, limit: int = 0) -> Formatter:
+    """Formatter for tools whose output is shown as-is under a label."""
+    def format_block(data: Dict[str, Any]) -> str:
+        text = _stdout(data)
+        return f"{label}:\n{text[:limit] if limit else text}"
+    return format_block
+
+
+def _stdout_line(label: str) -> Formatter:
+    def format_line(data: Dict[str, Any]) -> str:
+        return f"{label}: {_stdout(data)}"
+    return format_line
+
+
+def _stdout_head(label: str, limit: int) -> Formatter:
+    """Formatter showing an entry count and the first ``limit`` lines."""
+    def format_head(data: Dict[str, Any]) -> str:
+        lines = _lines(data)
+        return f"{label} ({len(lines)} entries):\n" + "\n".join(lines[:limit])
+    return format_head
+
+
+def _unparsed(label: str, data: Dict[str, Any]) -> str:
+    """Fallback for JSON-output tools: raw JSON is not worth pattern-matching."""
+    reason = "was truncated at the output limit" if data.get('truncated') else "could not be parsed"
+    return f"{label}: the command output {reason}, so no details are available."
+
+
+def _service_action(action: str) -> Formatter:
+    def format_action(data: Dict[str, Any]) -> str:
+        text = _stdout(data)
+        return f"Service {action} completed.\n{text}" if text else f"Service {action} completed."
+    return format_action
+
+
+def render_direct_answer(template: str, data: Any) -> Optional[str]:
+    """Fill a spec's direct_answer template from the result data.
+    
+    Returns None - so the LLM summarizes instead - when the data is not a
+    dict or a field the template needs is missing or empty.
+    """
+    if not isinstance(data, dict):
+        return None
+    values = {}
+    for key, value in data.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in ("", None):
+            values[key] = value
+    try:
+        return template.format_map(values)
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def format_generic(tool_name: str, data: Any) -> str:
+    """Fallback for tools without a formatter: always show the real data."""
+    if not isinstance(data, dict):
+        return f"Tool '{tool_name}' returned: {str(data)[:500]}"
+    
+    if 'stdout' in data:
+        stdout = data.get('stdout', '')
+        if stdout.strip():
+            truncated = stdout.strip()[:1000]
+            if len(stdout) > 1000 or data.get('truncated'):
+                truncated += "\n... (output truncated)"
+            return f"Command output:\n{truncated}"
+        return f"Command executed successfully (no output)."
+    
+    if 'total' in data and 'free' in data:
+        return f"Storage information: {data.get('free', 'N/A')} free out of {data.get('total', 'N/A')} total"
+    
+    if 'exit_code' in data:
+        # Show exit code and any other data present to prevent hallucination
+        exit_code = data.get('exit_code', 0)
+        other_data = {k: v for k, v in data.items() if k != 'exit_code'}
+        if other_data:
+            data_str = ", ".join([f"{k}: {v}" for k, v in list(other_data.items())[:5]])
+            return f"Operation completed (exit code {exit_code}). Data: {data_str}"
+        return f"Operation completed with exit code {exit_code}. No additional data returned."
+    
+    # IMPORTANT: Always show actual data to prevent model hallucination
+    data_preview = []
+    for key, value in list(data.items())[:10]:
+        if isinstance(value, (list, dict)):
+            data_preview.append(f"{key}: {type(value).__name__} with {len(value)} items")
+        else:
+            data_preview.append(f"{key}: {value}")
+    if data_preview:
+        return f"Tool '{tool_name}' returned:\n" + "\n".join(data_preview)
+    return f"Tool '{tool_name}' completed but returned no data."
+
+
+def format_ip_addr(data: Dict[str, Any]) -> str:
+    interfaces = data.get('records')
+    if interfaces is None:
+        return _unparsed("Network interfaces", data)
+    ips = [ip for interface in interfaces for ip in interface['ipv4']]
+    if not ips:
+        return "No IP addresses found on network interfaces."
+    # Show the first non-loopback address as primary
+    primary_ips = [ip for ip in ips if not ip.startswith('127.')]
+    primary = primary_ips[0].split('/')[0] if primary_ips else None
+    summary = f"Primary IP: {primary}. All interfaces: {', '.join(ips)}"
+    if interfaces:
+        states = ", ".join(f"{i['ifname']} {i['state']}" for i in interfaces if i['ifname'] != 'lo')
+        if states:
+            summary += f". Link state: {states}"
+    return summary
+
+
+def format_ip_route(data: Dict[str, Any]) -> str:
+    routes = data.get('records')
+    if routes is None:
+        return _unparsed("Routing table", data)
+    lines = []
+    for route in routes:
+        line = f"• {route.get('dst')}"
+        if route.get('gateway'):
+            line += f" via {route['gateway']}"
+        if route.get('dev'):
+            line += f" dev {route['dev']}"
+        if route.get('prefsrc'):
+            line += f" src {route['prefsrc']}"
+        if route.get('metric') is not None:
+            line += f" metric {route['metric']}"
+        lines.append(line)
+    return "Routing table:\n" + "\n".join(lines)
+
+
+def _describe_mount(mount: str) -> str:
+    if mount == '/':
+        return "main system (root)"
+    if mount.startswith('/mnt/'):
+        return f"storage at {mount}"
+    if mount.startswith('/boot'):
+        return "system boot partition"
+    return f"partition at {mount}"
+
+
+def format_df(data: Dict[str, Any]) -> str:
+    records = data.get('records')
+    if records is None:
+        return format_generic('df_command', data)
+    
+    # Focus on real storage partitions
+    storage = [r for r in records if r['fstype'] not in _PSEUDO_FILESYSTEMS and r['filesystem'] != 'udev']
+    storage_summary = [
+        f"• {_describe_mount(r['mount'])}: {_format_size(r['available_bytes'])} free out of {_format_size(r['size_bytes'])} total ({r['use_percent']}% used)"
+        for r in storage
+    ]
+    if not storage_summary:
+        return "No disk information found."
+    summary = "Disk space:\n" + "\n".join(storage_summary[:5])
+    if len(storage) > 1:
+        total = sum(r['size_bytes'] for r in storage)
+        available = sum(r['available_bytes'] for r in storage)
+        summary += f"\nTotal: {_format_size(available)} free out of {_format_size(total)} across {len(storage)} filesystems"
+    return summary
+
+
+def format_free(data: Dict[str, Any]) -> str:
+    if 'memory' in data and 'swap' in data:
+        # In-process free_command (procfs)
+        mem = data['memory']
+        swap = data['swap']
+        result = f"RAM: {mem.get('available')} available, {mem.get('used')} used, {mem.get('total')} total ({mem.get('percent_used')}% in use)"
+        if swap.get('total_bytes'):
+            result += f". Swap: {swap.get('used')} used of {swap.get('total')}"
+        return result
+    
+    mem = (data.get('records') or {}).get('memory')
+    if not mem:
+        return f"Memory info:\n{_stdout(data)[:500]}"
+    total = mem.get('total')
+    available = mem.get('available', mem.get('free'))
+    result = f"RAM: {_format_size(available)} available, {_format_size(mem.get('used'))} used, {_format_size(total)} total"
+    if isinstance(total, (int, float)) and total and isinstance(available, (int, float)):
+        result += f" ({(total - available) / total * 100:.1f}% in use)"
+    swap = data['records'].get('swap') or {}
+    if swap.get('total'):
+        result += f". Swap: {_format_size(swap.get('used'))} used of {_format_size(swap.get('total'))}"
+    return result
+
+
+def format_ps(data: Dict[str, Any]) -> str:
+    records = data.get('records')
+    if not records:
+        return f"Process list:\n{_stdout(data)[:500]}"
+    
+    top = sorted(records, key=lambda r: r['cpu_percent'] if isinstance(r['cpu_percent'], (int, float)) else 0, reverse=True)[:10]
+    lines = [
+        f"• {r['command'][:80]} (PID {r['pid']}, {r['user']}): {r['cpu_percent']}% CPU, {r['memory_percent']}% MEM"
+        for r in top
+    ]
+    return f"Processes ({len(records)} total), top {len(lines)} by CPU:\n" + "\n".join(lines)
+
+
+def format_lsblk(data: Dict[str, Any]) -> str:
+    records = data.get('records')
+    if records is None:
+        return _unparsed("Block devices", data)
+    if not records:
+        return "No block devices found."
+    
+    devices = []
+    for r in records[:15]:
+        details = [f"{r['type']} {_format_size(r['size_bytes'])}"]
+        details.extend(r[key] for key in ('fstype', 'label') if r.get(key))
+        if r.get('mountpoint'):
+            details.append(f"mounted at {r['mountpoint']}")
+        if r.get('fsavail_bytes') is not None:
+            details.append(f"{_format_size(r['fsavail_bytes'])} free")
+        if r.get('fsuse_percent') is not None:
+            details.append(f"{r['fsuse_percent']}% used")
+        devices.append(f"{'  ' * r['depth']}• {r['name']}: {', '.join(details)}")
+    return f"Block devices ({len(records)} total, {len(devices)} shown):\n" + "\n".join(devices)
+
+
+def format_ss(data: Dict[str, Any]) -> str:
+    records = data.get('records')
+    if records is None:
+        lines = _lines(data)
+        if len(lines) > 1:
+            return f"Network connections ({len(lines)-1} entries):\n" + "\n".join(lines[:15])
+        return "Network connection information retrieved."
+    
+    entries = []
+    for r in records[:15]:
+        owner = f" by {r['process']} (PID {r['pid']})" if r.get('process') else ""
+        entries.append(f"• {r['netid']} {r['state']} {r['local']}{owner}")
+    return f"Network connections ({len(records)} entries):\n" + "\n".join(entries)
+
+
+def format_findmnt(data: Dict[str, Any]) -> str:
+    records = data.get('records')
+    if records is None:
+        return _unparsed("Mount points", data)
+    if not records:
+        return "No mount points found."
+    mounts = [f"• {r['target']}: {r['source']} ({r['fstype']}, {r['options'][:60]})" for r in records[:20]]
+    return f"Mount points ({len(records)} total):\n" + "\n".join(mounts)
+
+
+def format_sensors(data: Dict[str, Any]) -> str:
+    chips = data.get('records')
+    if chips is None:
+        return "Could not read CPU temperature sensors."
+    
+    cpu_temps = []
+    core_details = []
+    for chip in chips:
+        temperatures = chip['temperatures']
+        # AMD CPU temps (k10temp)
+        if 'Tctl' in temperatures:
+            cpu_temps.append(temperatures['Tctl'])
+            core_details.append(f"Tctl: {temperatures['Tctl']}°C")
+        # Intel CPU temps (coretemp)
+        for label, temp in temperatures.items():
+            if re.match(r'Core \d+$', label):
+                cpu_temps.append(temp)
+                core_details.append(f"{label}: {temp}°C")
+    
+    if not cpu_temps:
+        # Generic tempN sensors, first 4
+        generic = [(label, temp) for chip in chips for label, temp in chip['temperatures'].items() if re.match(r'temp\d+$', label)]
+        for label, temp in generic[:4]:
+            cpu_temps.append(temp)
+            core_details.append(f"{label.capitalize()}: {temp}°C")
+    
+    if cpu_temps:
+        avg_temp = sum(cpu_temps) / len(cpu_temps)
+        detail_str = f" ({', '.join(core_details[:3])})" if core_details else ""
+        return f"CPU temperature: {avg_temp:.1f}°C{detail_str}"
+    return "Could not read CPU temperature sensors."
+
+
+def format_iostat(data: Dict[str, Any]) -> str:
+    records = data.get('records')
+    if not records or not (records.get('cpu') or records.get('devices')):
+        return f"I/O statistics:\n{_stdout(data)[:1500]}"
+    
+    lines = []
+    cpu = records.get('cpu') or {}
+    if cpu:
+        lines.append(f"CPU: {cpu.get('user')}% user, {cpu.get('system')}% system, {cpu.get('iowait')}% iowait, {cpu.get('idle')}% idle")
+    for device in records.get('devices', [])[:10]:
+        reads = device.get('r/s', 'N/A')
+        writes = device.get('w/s', 'N/A')
+        util = device.get('%util', 'N/A')
+        lines.append(f"• {device['device']}: {reads} reads/s, {writes} writes/s, {util}% utilized")
+    return "I/O statistics:\n" + "\n".join(lines)
+
+
+def format_vmstat(data: Dict[str, Any]) -> str:
+    if 'procs_running' in data and 'cpu_percent' in data:
+        # In-process vmstat_command (procfs)
+        cpu = data['cpu_percent']
+        mem = data.get('memory', {})
+        return (
+            f"Virtual memory statistics (averages since boot): {data.get('procs_running')} running, {data.get('procs_blocked')} blocked processes. "
+            f"Memory free {mem.get('free')}, buffers {mem.get('buffers')}, cache {mem.get('cache')}, swap used {mem.get('swap_used')}. "
+            f"Swap in/out {data.get('swap_in_kb_per_sec')}/{data.get('swap_out_kb_per_sec')} KB/s, blocks in/out {data.get('blocks_in_per_sec')}/{data.get('blocks_out_per_sec')}/s, "
+            f"{data.get('interrupts_per_sec')} interrupts/s, {data.get('context_switches_per_sec')} context switches/s. "
+            f"CPU: {cpu.get('user')}% user, {cpu.get('system')}% system, {cpu.get('idle')}% idle, {cpu.get('iowait')}% iowait, {cpu.get('steal')}% steal"
+        )
+    
+    v = data.get('records')
+    if not v:
+        return f"Virtual memory statistics:\n{_stdout(data)}"
+    return (
+        f"Virtual memory statistics: {v.get('r')} running, {v.get('b')} blocked processes. "
+        f"Memory (KB) free {v.get('free')}, buffers {v.get('buff')}, cache {v.get('cache')}, swap used {v.get('swpd')}. "
+        f"Swap in/out {v.get('si')}/{v.get('so')}, blocks in/out {v.get('bi')}/{v.get('bo')}, "
+        f"{v.get('in')} interrupts/s, {v.get('cs')} context switches/s. "
+        f"CPU: {v.get('us')}% user, {v.get('sy')}% system, {v.get('id')}% idle, {v.get('wa')}% iowait, {v.get('st')}% steal"
+    )
+
+
+def format_uptime(data: Dict[str, Any]) -> str:
+    if 'uptime_seconds' in data and 'load_average' in data:
+        load = data['load_average']
+        return f"Uptime: {data.get('uptime')} (up since {data.get('boot_time')}). Load average: {load.get('1m')}, {load.get('5m')}, {load.get('15m')} on {data.get('cpu_count')} CPUs"
+    return f"Uptime: {_stdout(data)}"
+
+
+def format_uname(data: Dict[str, Any]) -> str:
+    if 'sysname' in data and 'kernel_release' in data:
+        os_name = f"{data['os']}, " if data.get('os') else ""
+        return f"System information: {os_name}{data.get('sysname')} kernel {data.get('kernel_release')} ({data.get('machine')}), hostname {data.get('nodename')}"
+    return f"System information: {_stdout(data)}"
+
+
+def format_hostname(data: Dict[str, Any]) -> str:
+    return f"Hostname: {data['hostname'] if 'hostname' in data else _stdout(data)}"
+
+
+def format_whoami(data: Dict[str, Any]) -> str:
+    if 'user' in data and 'uid' in data:
+        return f"Current user: {data['user']} (uid {data['uid']})"
+    return f"Current user: {_stdout(data)}"
+
+
+def format_journal(data: Dict[str, Any]) -> str:
+    entries = data.get('records')
+    if entries is None:
+        return _unparsed("Journal", data)
+    if not entries:
+        return "No journal entries found."
+    lines = []
+    for entry in entries[-15:]:
+        priority = _PRIORITIES[entry['priority']] if entry.get('priority') is not None and entry['priority'] < len(_PRIORITIES) else None
+        level = f" [{priority}]" if priority else ""
+        lines.append(f"{entry['timestamp']} {entry['unit'] or '-'}{level}: {entry['message'][:300]}")
+    summary = f"Log entries retrieved ({len(entries)} entries, showing last {len(lines)})"
+    if data.get('truncated'):
+        # journalctl prints oldest first, so the cap cuts off the newest entries
+        summary += ". Output was truncated at the size limit; the most recent entries are missing"
+    return f"{summary}:\n" + "\n".join(lines)
+
+
+def format_top(data: Dict[str, Any]) -> str:
+    return "System load information:\n" + "\n".join(_lines(data)[:5])
+
+
+def format_du(data: Dict[str, Any]) -> str:
+    # Last 10 lines are usually the largest entries plus the total
+    return "Directory sizes:\n" + "\n".join(_lines(data)[-10:])
+
+
+def format_logs(data: Dict[str, Any]) -> str:
+    lines = _lines(data)
+    recent = lines[-15:]
+    return f"Log entries retrieved ({len(lines)} lines, showing last {len(recent)}):\n" + "\n".join(recent)
+
+
+def format_search(data: Dict[str, Any]) -> str:
+    lines = _lines(data)
+    count = len([l for l in lines if l.strip()])
+    return f"Search results ({count} matches):\n" + "\n".join(lines[:20])
+
+
+def format_env(data: Dict[str, Any]) -> str:
+    lines = _lines(data)
+    return f"Environment variables ({len(lines)} total):\n" + "\n".join(lines[:20])
+
+
+def format_lsof(data: Dict[str, Any]) -> str:
+    lines = _lines(data)
+    return f"Open files ({len(lines)} entries, showing first 20):\n" + "\n".join(lines[:20])
+
+
+def format_gpu(data: Dict[str, Any]) -> str:
+    gpus = data.get('gpus')
+    if not gpus:
+        return "No GPUs detected."
+    
+    gpu_info = []
+    for gpu in gpus:
+        # Fields the board does not report are None
+        gpu = {k: ('N/A' if v is None else v) for k, v in gpu.items()}
+        temp = gpu.get('temperature_c', 'N/A')
+        util = gpu.get('utilization_percent', 'N/A')
+        mem_used = gpu.get('memory_used_mb', 'N/A')
+        mem_total = gpu.get('memory_total_mb', 'N/A')
+        power = gpu.get('power_draw_w', 'N/A')
+        name = gpu.get('name', 'GPU')
+        
+        if mem_used != 'N/A' and mem_total != 'N/A':
+            try:
+                memory_info = f"{float(mem_used) / 1024:.1f}/{float(mem_total) / 1024:.1f}GB memory"
+            except (ValueError, TypeError):
+                memory_info = f"{mem_used}/{mem_total}MB memory"
+        else:
+            memory_info = "memory usage"
+        
+        details = []
+        if util != 'N/A':
+            details.append(f"{util}% utilization")
+        details.append(memory_info)
+        if power != 'N/A':
+            details.append(f"{power}W power draw")
+        
+        gpu_info.append(f"{name}: {temp}°C ({', '.join(details)})")
+    
+    return "GPU: " + " | ".join(gpu_info)
+
+
+def format_system_health(data: Dict[str, Any]) -> str:
+    memory_total = data.get('memory_total_gb', 'N/A')
+    memory_used = data.get('memory_used_gb', 'N/A')
+    memory_available = memory_total - memory_used if isinstance(memory_total, (int, float)) and isinstance(memory_used, (int, float)) else 'N/A'
+    cpu_percent = data.get('cpu_percent', 'N/A')
+    
+    result = f"CPU usage: {cpu_percent}%. RAM: {memory_available:.1f}GB available out of {memory_total:.1f}GB total."
+    
+    top_cpu = data.get('top_cpu_processes', [])
+    if top_cpu:
+        cpu_list = [f"  • {p['name']} (PID {p['pid']}): {p['cpu_percent']:.1f}% CPU" for p in top_cpu[:5]]
+        result += "\n\nTop CPU processes:\n" + "\n".join(cpu_list)
+    
+    top_mem = data.get('top_memory_processes', [])
+    if top_mem:
+        mem_list = []
+        for p in top_mem[:5]:
+            # Calculate MB from percentage
+            mem_mb = (p['memory_percent'] / 100) * memory_total * 1024 if isinstance(memory_total, (int, float)) else 0
+            mem_list.append(f"  • {p['name']} (PID {p['pid']}): {p['memory_percent']:.1f}% RAM ({mem_mb:.0f}MB)")
+        result += "\n\nTop memory processes:\n" + "\n".join(mem_list)
+    
+    return result
+
+
+def format_disk_free(data: Dict[str, Any]) -> str:
+    path = data.get('path', 'disk')
+    return f"Disk ({path}): {data['free_gb']:.1f}GB free out of {data['total_gb']:.1f}GB total ({data['percent_used']:.1f}% used)"
+
+
+def format_directory_size(data: Dict[str, Any]) -> str:
+    analyzed = data.get('analyzed_path', 'N/A')
+    top_dirs = data.get('top_directories', [])
+    if top_dirs:
+        dir_list = "\n".join([f"• {d['size']}\t{d['path']}" for d in top_dirs[:10]])
+        return f"Directory size analysis for {analyzed} (depth={data.get('depth', 1)}, {data.get('total_directories', 0)} dirs):\n{dir_list}"
+    return f"Directory size analysis completed for {analyzed}."
+
+
+def format_duplicates(data: Dict[str, Any]) -> str:
+    scanned = data.get('scanned_path', 'N/A')
+    dup_groups = data.get('duplicate_groups', 0)
+    if dup_groups == 0:
+        return f"No duplicate files found in {scanned} ({data.get('files_scanned', 0)} files scanned)."
+    
+    summary = f"Found {dup_groups} duplicate groups ({data.get('total_duplicate_files', 0)} duplicate files) in {scanned}.\nWasted space: {data.get('total_wasted_space', '0B')}\n"
+    top_dups = data.get('top_duplicates', [])
+    if top_dups:
+        dup_list = []
+        for d in top_dups[:10]:
+            files_preview = ", ".join([f.split('/')[-1] for f in d['files'][:2]])
+            dup_list.append(f"• {d['count']} copies of {d['size']} file ({d['wasted_space']} wasted): {files_preview}")
+        summary += "Top duplicates:\n" + "\n".join(dup_list)
+    return summary
+
+
+def format_similar_photos(data: Dict[str, Any]) -> str:
+    scanned = data.get('scanned_path', 'N/A')
+    groups = data.get('similar_groups', 0)
+    note = ""
+    if data.get('truncated'):
+        note = f" Only the first {data.get('photo_limit')} photos were checked; the rest of the directory was not scanned."
+    if groups == 0:
+        return f"No similar photos found in {scanned} ({data.get('photos_scanned', 0)} photos scanned).{note}"
+    
+    summary = f"Found {groups} groups of similar photos ({data.get('total_similar_files', 0)} photos) in {scanned}.{note}\nReclaimable by keeping the largest of each group: {data.get('total_reclaimable', '0B')}\n"
+    top_groups = data.get('top_groups', [])
+    if top_groups:
+        group_list = []
+        for g in top_groups[:10]:
+            files_preview = ", ".join([f.split('/')[-1] for f in g['files'][:3]])
+            group_list.append(f"• {g['count']} similar photos (distance ≤ {g['max_distance']}, {g['reclaimable']} reclaimable): {files_preview}")
+        summary += "Top groups:\n" + "\n".join(group_list)
+    return summary
+
+
+def format_metrics_history(data: Dict[str, Any]) -> str:
+    if 'available_metrics' in data:
+        metrics = data.get('available_metrics', [])
+        if not metrics:
+            return "No metrics history has been recorded yet."
+        return "Recorded metrics: " + ", ".join(metrics)
+    
+    window_min = (data.get('end', 0) - data.get('start', 0)) / 60
+    summary = f"{data.get('metric')} over {window_min:.0f} min ({data.get('samples', 0)} samples): min {data.get('min')}, avg {data.get('avg')}, max {data.get('max')}"
+    points = data.get('points', [])
+    if points:
+        trend = ", ".join([f"{datetime.fromtimestamp(p['timestamp']).strftime('%H:%M')} {p['avg']}" for p in points[:24]])
+        summary += f"\nTrend (avg per {data.get('step_sec', 0) // 60 or 1} min): {trend}"
+    return summary
+
+
+def format_organize_photos(data: Dict[str, Any]) -> str:
+    if data.get('total_photos', 0) == 0:
+        return "No photos found in the input directory."
+    message = data.get('message', '')
+    plan = data.get('plan', [])
+    if plan:
+        preview = "\n".join([f"• {p['source']} → {p['destination']}" for p in plan[:5]])
+        return f"{message}\nPreview:\n{preview}"
+    return message
+
+
+FORMATTERS: Dict[str, Formatter] = {
+    # Command tools with parsed or JSON records
+    'df_command': format_df,
+    'free_command': format_free,
+    'ps_command': format_ps,
+    'lsblk_command': format_lsblk,
+    'ss_command': format_ss,
+    'findmnt_command': format_findmnt,
+    'sensors_command': format_sensors,
+    'iostat_command': format_iostat,
+    'vmstat_command': format_vmstat,
+    'ip_addr_command': format_ip_addr,
+    'ip_route_command': format_ip_route,
+    'journalctl_command': format_journal,
+    # Command tools shown from stdout
+    'uptime_command': format_uptime,
+    'uname_command': format_uname,
+    'hostname_command': format_hostname,
+    'whoami_command': format_whoami,
+    'top_command': format_top,
+    'du_command': format_du,
+    'dmesg_command': format_logs,
+    'find_command': format_search,
+    'fd_command': format_search,
+    'rg_command': format_search,
+    'env_command': format_env,
+    'lsof_command': format_lsof,
+    'lspci_command': _stdout_head("PCI devices", 20),
+    'lsusb_command': _stdout_head("USB devices", 15),
+    'ping_command': _stdout_block("Ping results"),
+    'tree_command': _stdout_block("Directory tree", 1500),
+    'lscpu_command': _stdout_block("CPU information"),
+    'timedatectl_command': _stdout_block("Time and date info"),
+    'locale_command': _stdout_block("Locale settings"),
+    'pidstat_command': _stdout_block("Process statistics", 1500),
+    'iotop_command': _stdout_block("I/O by process", 1500),
+    'nmcli_command': _stdout_block("Network devices"),
+    'resolvectl_command': _stdout_block("DNS resolver status", 1500),
+    'ufw_status_command': _stdout_block("Firewall status"),
+    'aa_status_command': _stdout_block("AppArmor status", 1500),
+    'loginctl_command': _stdout_block("Login sessions"),
+    'fuser_command': _stdout_block("File/socket usage"),
+    'ldd_command': _stdout_block("Shared library dependencies"),
+    'last_command': _stdout_block("Recent logins"),
+    'systemctl_status': _stdout_block("Service status"),
+    'apt_install': _stdout_block("Package installation output", 1500),
+    'apt_update': _stdout_block("Package list update output", 1500),
+    'id_command': _stdout_line("User/Group IDs"),
+    'htop_command': _stdout_line("htop version info"),
+    'file_command': _stdout_line("File type"),
+    'systemctl_restart': _service_action("restart"),
+    'systemctl_start': _service_action("start"),
+    'systemctl_stop': _service_action("stop"),
+    # Structured tools
+    'gpu_temperature': format_gpu,
+    'system_health': format_system_health,
+    'disk_free': format_disk_free,
+    'directory_size': format_directory_size,
+    'find_duplicates': format_duplicates,
+    'find_similar_photos': format_similar_photos,
+    'metrics_history': format_metrics_history,
+    'organize_photos': format_organize_photos,
+}
@@ -0,0 +1,269 @@
+"""
+Embedding-based intent router for system questions the phrase classifier misses.
+
+Each candidate tool is represented by a few texts - its description, the
+classifier phrases that already point at it and some paraphrases - embedded
+once through Ollama and cached on disk. A query is embedded and compared by
+cosine similarity against all of them; if the best match clears the
+threshold, the tool is called directly instead of asking the LLM to pick it.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from .ollama_client import OllamaClient, ollama_client
+from .query_classifier import SYSTEM_QUERY_PATTERNS
+from ..config import settings
+from ..infra.logging import get_logger
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = get_logger(__name__)
+
+# Paraphrases the classifier phrases do not cover
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    "free_command": [
+        "is my machine running low on memory",
+        "am I out of RAM",
+        "how full is my memory",
+    ],
+    "ps_command": [
+        "which programs are eating my memory",
+        "what is hogging my RAM",
+    ],
+    "system_health": [
+        "is my computer under heavy load",
+        "how busy is the processor",
+    ],
+    "sensors_command": [
+        "is my computer overheating",
+        "how hot is the CPU running",
+    ],
+    "gpu_temperature": [
+        "how hot is my video card",
+        "is the graphics card busy",
+    ],
+    "df_command": [
+        "am I running out of disk",
+        "how full are my drives",
+        "is my hard drive almost full",
+    ],
+    "uptime_command": [
+        "when did this machine last reboot",
+        "how long since the last restart",
+    ],
+    "ip_addr_command": [
+        "what address does this computer have on the network",
+    ],
+    "journalctl_command": [
+        "did anything go wrong recently in the logs",
+    ],
+}
+
+
+class IntentMatch(NamedTuple):
+    tool: str
+    score: float
+    text: str  # the example the query was closest to
+
+
+class EmbeddingCache:
+    """Embedding vectors stored by (model, text) so the index is built only once."""
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(settings.embedding_cache_db_path)
+        self._init_db()
+    
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text)
+            ) WITHOUT ROWID
+        """)
+        
+        conn.commit()
+        conn.close()
+    
+    def get_many(self, model: str, texts: Iterable[str]) -> Dict[str, "np.ndarray"]:
+        """Return cached vectors for the given texts; misses are absent from the result."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        hits = {}
+        for text in texts:
+            cursor.execute("SELECT vector FROM embeddings WHERE model = ? AND text = ?", (model, text))
+            row = cursor.fetchone()
+            if row is not None:
+                hits[text] = np.frombuffer(row[0], dtype=np.float32)
+        
+        conn.close()
+        return hits
+    
+    def put_many(self, model: str, vectors: Dict[str, "np.ndarray"]) -> None:
+        if not vectors:
+            return
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, text, vector) VALUES (?, ?, ?)",
+            [(model, text, np.asarray(vector, dtype=np.float32).tobytes()) for text, vector in vectors.items()]
+        )
+        
+        conn.commit()
+        conn.close()
+
+
+def default_intents() -> Dict[str, List[str]]:
+    """Example texts for every registered tool the classifier can call directly."""
+    from ..tools.registry import registry
+    
+    intents: Dict[str, List[str]] = {}
+    for phrase, tool_name in SYSTEM_QUERY_PATTERNS.items():
+        intents.setdefault(tool_name, []).append(phrase)
+    for tool_name, examples in INTENT_EXAMPLES.items():
+        intents.setdefault(tool_name, []).extend(examples)
+    
+    available = {}
+    for tool_name, examples in intents.items():
+        tool = registry.get(tool_name)
+        if tool is not None:
+            available[tool_name] = [tool.spec.description] + examples
+    return available
+
+
+class IntentRouter:
+    """Picks a tool for a query by nearest example embedding.
+    
+    The index is built lazily (or by prepare() at startup) and kept in
+    memory as a normalized matrix, so routing a query costs one embedding
+    call plus a matrix-vector product. If Ollama or the embedding model is
+    unavailable, route() returns None and the chat falls back to the LLM;
+    further attempts are skipped for `retry_after` seconds.
+    """
+    
+    def __init__(
+        self,
+        client: Optional[OllamaClient] = None,
+        model: Optional[str] = None,
+        threshold: Optional[float] = None,
+        intents: Optional[Dict[str, List[str]]] = None,
+        cache: Optional[EmbeddingCache] = None,
+        top_k: int = 5,
+        retry_after: float = 60.0,
+    ):
+        self.client = client or ollama_client
+        self.model = model or settings.embedding_model
+        self.threshold = settings.intent_router_threshold if threshold is None else threshold
+        self.intents = intents
+        self.cache = cache
+        self.top_k = top_k
+        self.retry_after = retry_after
+        self._matrix = None
+        self._labels: List[str] = []
+        self._texts: List[str] = []
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+    
+    @property
+    def ready(self) -> bool:
+        return self._matrix is not None
+    
+    def _embed(self, texts: List[str]) -> "np.ndarray":
+        vectors = np.asarray(self.client.embed(texts, model=self.model), dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings from {self.model}, got {len(vectors)}")
+        return vectors
+    
+    def _build(self) -> None:
+        intents = self.intents if self.intents is not None else default_intents()
+        if self.cache is None:
+            self.cache = EmbeddingCache()
+        
+        labels, texts = [], []
+        for tool_name, examples in intents.items():
+            for text in dict.fromkeys(examples):
+                labels.append(tool_name)
+                texts.append(text)
+        if not texts:
+            raise ValueError("No intents to index")
+        
+        vectors = self.cache.get_many(self.model, texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing:
+            fresh = dict(zip(missing, self._embed(missing)))
+            self.cache.put_many(self.model, fresh)
+            vectors.update(fresh)
+        
+        matrix = np.stack([vectors[text] for text in texts])
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        self._matrix, self._labels, self._texts = matrix, labels, texts
+        logger.info(
+            f"Built intent index: {len(texts)} examples for {len(intents)} tools "
+            f"({len(missing)} newly embedded with {self.model})"
+        )
+    
+    def prepare(self) -> bool:
+        """Build the index if needed; returns False while the router is unavailable."""
+        if self._matrix is not None:
+            return True
+        if np is None:
+            logger.warning("Intent router requires numpy (pip install numpy)")
+            return False
+        with self._lock:
+            if self._matrix is not None:
+                return True
+            if time.monotonic() < self._unavailable_until:
+                return False
+            try:
+                self._build()
+                return True
+            except Exception as e:
+                self._unavailable_until = time.monotonic() + self.retry_after
+                logger.warning(f"Intent router unavailable, retrying in {self.retry_after:.0f}s: {e}")
+                return False
+    
+    def search(self, query: str, k: Optional[int] = None) -> List[IntentMatch]:
+        """The k examples closest to the query, best first (empty if unavailable)."""
+        if not self.prepare():
+            return []
+        try:
+            vector = self._embed([query])[0]
+        except Exception as e:
+            logger.warning(f"Could not embed query for intent routing: {e}")
+            return []
+        
+        scores = self._matrix @ (vector / max(float(np.linalg.norm(vector)), 1e-12))
+        k = min(k or self.top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [IntentMatch(self._labels[i], float(scores[i]), self._texts[i]) for i in top]
+    
+    def route(self, query: str) -> Optional[IntentMatch]:
+        """The tool to call directly for this query, or None to let the LLM decide."""
+        matches = self.search(query)
+        if not matches:
+            return None
+        
+        best = matches[0]
+        candidates = ", ".join(f"{m.tool}={m.score:.3f}" for m in matches)
+        logger.info(f"Intent candidates for query: {candidates}")
+        if best.score < self.threshold:
+            return None
+        logger.info(f"Query routed by embedding: '{best.text}' -> tool='{best.tool}' (score={best.score:.3f})")
+        return best
+
+
+intent_router = IntentRouter()
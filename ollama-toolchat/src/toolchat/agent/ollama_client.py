@@ -52,6 +52,23 @@ class OllamaClient:
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama generate failed: {e}", exc_info=True)
             raise
+    
+    def embed(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """Embed a batch of texts with /api/embed; one vector per text, in order."""
+        url = f"{self.base_url}/api/embed"
+        
+        payload = {
+            "model": model or self.model,
+            "input": texts,
+        }
+        
+        try:
+            response = requests.post(url, json=payload, timeout=60)
+            response.raise_for_status()
+            return response.json().get("embeddings", [])
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Ollama embed failed: {e}")
+            raise
 
 
 ollama_client = OllamaClient()
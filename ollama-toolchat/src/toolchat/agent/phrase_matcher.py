@@ -0,0 +1,123 @@
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+WORD_RE = re.compile(r"[\w']+")
+
+
+class PhraseMatch(NamedTuple):
+    phrase: str
+    value: Any
+    start: int  # index of the first matched word
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over words rather than characters.
+    
+    Phrases and text are split into words, so a phrase only matches whole
+    words ("mounted" does not match "unmounted") and a query is scanned
+    once however many phrases there are. A text word that is not part of
+    any phrase is retried without a trailing "'s" or "s", so "cpu temps"
+    matches "cpu temp". When several phrases match, the one with the most
+    words wins, then the longest, then the earliest in the text, then the
+    one added first.
+    """
+    
+    def __init__(self, phrases: List[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # (rank, phrase, value, word count) for every phrase ending at a state
+        self._out: List[List[Tuple[Tuple[int, int, int], str, Any, int]]] = [[]]
+        self._vocabulary = set()
+        
+        for order, (phrase, value) in enumerate(phrases):
+            words = self.words(phrase)
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                self._vocabulary.add(word)
+                if word not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][word] = len(self._goto) - 1
+                state = self._goto[state][word]
+            self._out[state].append(((-len(words), -len(phrase), order), phrase, value, len(words)))
+        
+        # Breadth-first so every failure target is finished before it is used
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+    
+    @staticmethod
+    def words(text: str) -> List[str]:
+        return WORD_RE.findall(text.lower().replace("’", "'"))
+    
+    def _normalize(self, word: str) -> str:
+        if word in self._vocabulary:
+            return word
+        if word.endswith("'s") and word[:-2] in self._vocabulary:
+            return word[:-2]
+        if word.endswith("s") and word[:-1] in self._vocabulary:
+            return word[:-1]
+        return word
+    
+    def find_all(self, text: str) -> List[PhraseMatch]:
+        """Every phrase occurring in the text, in order of where it ends."""
+        matches = []
+        for end, rank, phrase, value, count in self._scan(text):
+            matches.append(PhraseMatch(phrase, value, end - count + 1))
+        return matches
+    
+    def ranked(self, text: str) -> List[PhraseMatch]:
+        """Every phrase occurring in the text, most specific first (best() is the head)."""
+        keyed = []
+        for end, rank, phrase, value, count in self._scan(text):
+            start = end - count + 1
+            keyed.append(((rank[0], rank[1], start, rank[2]), PhraseMatch(phrase, value, start)))
+        keyed.sort(key=lambda item: item[0])
+        return [match for _, match in keyed]
+    
+    def best(self, text: str) -> Optional[PhraseMatch]:
+        """The most specific phrase occurring in the text, or None."""
+        # Same walk as _scan(), inlined: this runs for every chat message
+        goto, fail, out, vocabulary = self._goto, self._fail, self._out, self._vocabulary
+        best_key, best = None, None
+        state = 0
+        for index, word in enumerate(self.words(text)):
+            if word not in vocabulary:
+                word = self._normalize(word)
+                if word not in vocabulary:
+                    # No phrase contains this word, so every partial match ends here
+                    state = 0
+                    continue
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for rank, phrase, value, count in out[state]:
+                start = index - count + 1
+                key = (rank[0], rank[1], start, rank[2])
+                if best_key is None or key < best_key:
+                    best_key, best = key, (phrase, value, start)
+        return PhraseMatch(*best) if best else None
+    
+    def _scan(self, text: str):
+        goto, fail, out, vocabulary = self._goto, self._fail, self._out, self._vocabulary
+        state = 0
+        for index, word in enumerate(self.words(text)):
+            word = self._normalize(word)
+            if word not in vocabulary:
+                state = 0
+                continue
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for rank, phrase, value, count in out[state]:
+                yield index, rank, phrase, value, count
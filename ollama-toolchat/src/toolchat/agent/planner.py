@@ -1,39 +1,97 @@
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+import threading
 import uuid
+from ..tools.base import PlanOperations
+from ..config import settings
 
 
 class ConfirmationPlan:
-    def __init__(self, plan_id: str, session_id: str, tool_name: str, args: Dict[str, Any], summary: str):
+    def __init__(
+        self,
+        plan_id: str,
+        session_id: str,
+        tool_name: str,
+        args: Dict[str, Any],
+        summary: str,
+        operations: Optional[PlanOperations] = None,
+    ):
         self.plan_id = plan_id
         self.session_id = session_id
         self.tool_name = tool_name
         self.args = args
         self.summary = summary
+        self.operations = operations
         self.created_at = datetime.utcnow()
         self.executed = False
 
 
 class PlanStore:
-    def __init__(self):
+    """Plans awaiting confirmation, oldest first.
+    
+    Plans expire ``ttl_sec`` after they were created, and the oldest plan is
+    evicted once there are more than ``max_plans``. Either way their
+    operations are discarded, so a spilled plan's temp file goes with it.
+    """
+    
+    def __init__(self, ttl_sec: Optional[float] = None, max_plans: Optional[int] = None):
+        self.ttl_sec = ttl_sec if ttl_sec is not None else settings.plan_ttl_sec
+        self.max_plans = max_plans if max_plans is not None else settings.plan_store_max_plans
         self._plans: Dict[str, ConfirmationPlan] = {}
+        self._lock = threading.Lock()
+    
+    def _drop_expired(self) -> List[ConfirmationPlan]:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_sec)
+        expired = [plan for plan in self._plans.values() if plan.created_at <= cutoff]
+        for plan in expired:
+            del self._plans[plan.plan_id]
+        return expired
     
-    def create_plan(self, session_id: str, tool_name: str, args: Dict[str, Any], summary: str) -> str:
+    @staticmethod
+    def _discard(plans: List[ConfirmationPlan]) -> None:
+        for plan in plans:
+            if plan.operations is not None:
+                plan.operations.discard()
+                plan.operations = None
+    
+    def create_plan(
+        self,
+        session_id: str,
+        tool_name: str,
+        args: Dict[str, Any],
+        summary: str,
+        operations: Optional[PlanOperations] = None,
+    ) -> str:
         plan_id = f"pln_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
-        plan = ConfirmationPlan(plan_id, session_id, tool_name, args, summary)
-        self._plans[plan_id] = plan
+        plan = ConfirmationPlan(plan_id, session_id, tool_name, args, summary, operations)
+        with self._lock:
+            dropped = self._drop_expired()
+            self._plans[plan_id] = plan
+            while len(self._plans) > max(self.max_plans, 1):
+                dropped.append(self._plans.pop(next(iter(self._plans))))
+        self._discard(dropped)
         return plan_id
     
     def get_plan(self, plan_id: str) -> Optional[ConfirmationPlan]:
-        return self._plans.get(plan_id)
+        with self._lock:
+            expired = self._drop_expired()
+            plan = self._plans.get(plan_id)
+        self._discard(expired)
+        return plan
     
     def mark_executed(self, plan_id: str) -> None:
         if plan_id in self._plans:
-            self._plans[plan_id].executed = True
+            plan = self._plans[plan_id]
+            plan.executed = True
+            if plan.operations is not None:
+                plan.operations.discard()
+                plan.operations = None
     
     def delete_plan(self, plan_id: str) -> None:
-        if plan_id in self._plans:
-            del self._plans[plan_id]
+        with self._lock:
+            plan = self._plans.pop(plan_id, None)
+        if plan is not None:
+            self._discard([plan])
 
 
 plan_store = PlanStore()
@@ -1,3 +1,38 @@
+from typing import Dict, List
+from .formatters import FORMATTERS, format_generic
+from ..tools.registry import TOOL_ALIASES
+
+# System prompt for the turn after a tool has run. The model only explains
+# the result here, so none of the tool list or tool-calling rules are sent.
+SUMMARY_PROMPT = """You are a friendly local PC assistant. A tool has already run on the user's computer; explain its result to the user.
+
+- Answer the user's question in a few natural, conversational sentences.
+- Use the EXACT values from the tool result; never round, estimate or add values that are not there.
+- Match the wording to the numbers: under 20% is low, 20-50% normal, 50-80% heavy, over 80% high.
+- Add brief helpful context (e.g. "that's a healthy temperature", "might be worth freeing some space").
+- Do NOT output JSON and do NOT try to call a tool."""
+
+
+def build_summary_messages(
+    question: str,
+    tool_result: str,
+    history: List[Dict[str, str]],
+    depth: int,
+) -> List[Dict[str, str]]:
+    """Messages for the post-tool turn.
+    
+    Only the compact SUMMARY_PROMPT, the last ``depth`` user/assistant
+    messages before the question (earlier tool results are left out), and
+    the question together with the formatted tool result.
+    """
+    recent = [m for m in history if m["role"] in ("user", "assistant")][-depth:] if depth > 0 else []
+    return (
+        [{"role": "system", "content": SUMMARY_PROMPT}]
+        + recent
+        + [{"role": "user", "content": f"{question}\n\nTool result:\n{tool_result}"}]
+    )
+
+
 def get_system_prompt() -> str:
     from ..tools.registry import registry
     
@@ -202,378 +237,11 @@ IMPORTANT DISTINCTIONS:
 
 
 def format_tool_result(tool_name: str, result: dict) -> str:
-    if result.get("ok"):
-        data = result.get('data')
-        
-        # For any tool that returns stdout (command execution), show clean success message with relevant data
-        if isinstance(data, dict) and 'stdout' in data:
-            stdout = data.get('stdout', '')
-            
-            # Extract key information for specific tools
-            if tool_name == 'ip_addr_command':
-                # Extract IP addresses from stdout for the model to use
-                import re
-                ip_pattern = r'inet (\d+\.\d+\.\d+\.\d+/\d+)'
-                ips = re.findall(ip_pattern, stdout)
-                if ips:
-                    # Filter out loopback and show primary IP first
-                    primary_ips = [ip for ip in ips if not ip.startswith('127.')]
-                    primary = primary_ips[0].split('/')[0] if primary_ips else None
-                    return f"Primary IP: {primary}. All interfaces: {', '.join(ips)}"
-                else:
-                    return f"No IP addresses found on network interfaces."
-            elif tool_name in ['df_command']:
-                # Parse df output into user-friendly format
-                lines = stdout.split('\n')
-                storage_summary = []
-                
-                # Focus on main storage partitions (skip tmpfs, efivarfs, etc.)
-                for line in lines[1:]:  # Skip header
-                    if line and not line.startswith('tmpfs') and 'udev' not in line and 'efivarfs' not in line:
-                        parts = line.split()
-                        if len(parts) >= 6:
-                            filesystem = parts[0]
-                            size = parts[1]
-                            used = parts[2]
-                            avail = parts[3]
-                            use_percent = parts[4]
-                            mount = parts[5]
-                            
-                            # Convert to user-friendly descriptions
-                            if mount == '/':
-                                location = "main system (root)"
-                            elif mount.startswith('/mnt/'):
-                                location = f"storage at {mount}"
-                            elif mount.startswith('/boot'):
-                                location = "system boot partition"
-                            else:
-                                location = f"partition at {mount}"
-                            
-                            storage_summary.append(f"• {location}: {avail} free out of {size} total ({use_percent} used)")
-                
-                if storage_summary:
-                    return "Disk space:\n" + "\n".join(storage_summary[:5])
-                else:
-                    return "No disk information found."
-            elif tool_name == 'gpu_temperature':
-                # GPU tool uses structured data, not stdout - this path shouldn't be hit
-                # but handle it gracefully just in case
-                return f"GPU information retrieved. Check structured data for details."
-            elif tool_name == 'sensors_command':
-                # Extract CPU temperature from sensors
-                import re
-                # Look for various CPU temperature patterns
-                cpu_temps = []
-                core_details = []
-                
-                # AMD CPU temps (k10temp)
-                k10temp_temps = re.findall(r'Tctl:\s*\+(\d+(?:\.\d+)?)\s*°?C', stdout)
-                if k10temp_temps:
-                    cpu_temps.extend([float(t) for t in k10temp_temps])
-                    core_details.extend([f"Tctl: {t}°C" for t in k10temp_temps])
-                
-                # Intel CPU temps (coretemp)
-                core_temps = re.findall(r'(Core \d+):\s*\+(\d+(?:\.\d+)?)\s*°?C', stdout)
-                if core_temps:
-                    for core, temp in core_temps:
-                        cpu_temps.append(float(temp))
-                        core_details.append(f"{core}: {temp}°C")
-                
-                # Generic temp patterns
-                generic_temps = re.findall(r'temp(\d+):\s*\+(\d+(?:\.\d+)?)\s*°?C', stdout)
-                if generic_temps:
-                    for temp_num, temp in generic_temps[:4]:  # Take first 4 temps
-                        cpu_temps.append(float(temp))
-                        core_details.append(f"Temp{temp_num}: {temp}°C")
-                
-                if cpu_temps:
-                    avg_temp = sum(cpu_temps) / len(cpu_temps)
-                    detail_str = f" ({', '.join(core_details[:3])})" if core_details else ""
-                    return f"CPU temperature: {avg_temp:.1f}°C{detail_str}"
-                else:
-                    return "Could not read CPU temperature sensors."
-            elif tool_name == 'free_command':
-                # Parse free -h output for memory info
-                lines = stdout.strip().split('\n')
-                for line in lines:
-                    if line.startswith('Mem:'):
-                        parts = line.split()
-                        if len(parts) >= 4:
-                            total, used, free = parts[1], parts[2], parts[3]
-                            available = parts[6] if len(parts) >= 7 else free
-                            return f"RAM: {available} available, {used} used, {total} total"
-                return f"Memory info:\n{stdout[:500]}"
-            elif tool_name == 'lsblk_command':
-                # Show block device summary
-                lines = stdout.strip().split('\n')
-                if len(lines) > 1:
-                    devices = [l for l in lines[1:] if l.strip()][:10]
-                    return f"Block devices retrieved ({len(devices)} shown):\n" + "\n".join(devices)
-                return f"Block device information retrieved.\n{stdout[:500]}"
-            elif tool_name == 'uptime_command':
-                return f"Uptime: {stdout.strip()}"
-            elif tool_name == 'uname_command':
-                return f"System information: {stdout.strip()}"
-            elif tool_name == 'hostname_command':
-                return f"Hostname: {stdout.strip()}"
-            elif tool_name == 'whoami_command':
-                return f"Current user: {stdout.strip()}"
-            elif tool_name == 'ps_command':
-                # Show top processes summary
-                lines = stdout.strip().split('\n')
-                if len(lines) > 1:
-                    header = lines[0]
-                    procs = lines[1:11]  # Top 10 processes
-                    return f"Processes ({len(lines)-1} total):\n{header}\n" + "\n".join(procs)
-                return f"Process list:\n{stdout[:500]}"
-            elif tool_name == 'top_command':
-                # Show summary from top output
-                lines = stdout.strip().split('\n')
-                summary_lines = lines[:5] if len(lines) > 5 else lines
-                return f"System load information:\n" + "\n".join(summary_lines)
-            elif tool_name == 'du_command':
-                # Show directory sizes
-                lines = stdout.strip().split('\n')
-                if lines:
-                    entries = lines[-10:]  # Show last 10 (usually largest + total)
-                    return f"Directory sizes:\n" + "\n".join(entries)
-                return f"Directory size information retrieved."
-            elif tool_name in ['journalctl_command', 'dmesg_command']:
-                # Show recent log entries
-                lines = stdout.strip().split('\n')
-                recent = lines[-15:] if len(lines) > 15 else lines
-                return f"Log entries retrieved ({len(lines)} lines, showing last {len(recent)}):\n" + "\n".join(recent)
-            elif tool_name == 'ss_command':
-                # Show socket/port info
-                lines = stdout.strip().split('\n')
-                if len(lines) > 1:
-                    return f"Network connections ({len(lines)-1} entries):\n" + "\n".join(lines[:15])
-                return f"Network connection information retrieved."
-            elif tool_name in ['ping_command']:
-                return f"Ping results:\n{stdout.strip()}"
-            elif tool_name == 'findmnt_command':
-                return f"Mount points:\n{stdout.strip()[:1000]}"
-            elif tool_name in ['find_command', 'fd_command', 'rg_command']:
-                lines = stdout.strip().split('\n')
-                count = len([l for l in lines if l.strip()])
-                preview = lines[:20]
-                return f"Search results ({count} matches):\n" + "\n".join(preview)
-            elif tool_name == 'tree_command':
-                return f"Directory tree:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'vmstat_command':
-                return f"Virtual memory statistics:\n{stdout.strip()}"
-            elif tool_name == 'iostat_command':
-                return f"I/O statistics:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'lspci_command':
-                lines = stdout.strip().split('\n')
-                return f"PCI devices ({len(lines)} entries):\n" + "\n".join(lines[:20])
-            elif tool_name == 'lsusb_command':
-                lines = stdout.strip().split('\n')
-                return f"USB devices ({len(lines)} entries):\n" + "\n".join(lines[:15])
-            elif tool_name == 'lscpu_command':
-                return f"CPU information:\n{stdout.strip()}"
-            elif tool_name == 'id_command':
-                return f"User/Group IDs: {stdout.strip()}"
-            elif tool_name == 'env_command':
-                lines = stdout.strip().split('\n')
-                return f"Environment variables ({len(lines)} total):\n" + "\n".join(lines[:20])
-            elif tool_name == 'timedatectl_command':
-                return f"Time and date info:\n{stdout.strip()}"
-            elif tool_name == 'locale_command':
-                return f"Locale settings:\n{stdout.strip()}"
-            elif tool_name == 'htop_command':
-                return f"htop version info: {stdout.strip()}"
-            elif tool_name == 'pidstat_command':
-                return f"Process statistics:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'iotop_command':
-                return f"I/O by process:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'ip_route_command':
-                return f"Routing table:\n{stdout.strip()}"
-            elif tool_name == 'nmcli_command':
-                return f"Network devices:\n{stdout.strip()}"
-            elif tool_name == 'resolvectl_command':
-                return f"DNS resolver status:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'ufw_status_command':
-                return f"Firewall status:\n{stdout.strip()}"
-            elif tool_name == 'aa_status_command':
-                return f"AppArmor status:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'loginctl_command':
-                return f"Login sessions:\n{stdout.strip()}"
-            elif tool_name == 'lsof_command':
-                lines = stdout.strip().split('\n')
-                return f"Open files ({len(lines)} entries, showing first 20):\n" + "\n".join(lines[:20])
-            elif tool_name == 'fuser_command':
-                return f"File/socket usage:\n{stdout.strip()}"
-            elif tool_name == 'file_command':
-                return f"File type: {stdout.strip()}"
-            elif tool_name == 'ldd_command':
-                return f"Shared library dependencies:\n{stdout.strip()}"
-            elif tool_name == 'last_command':
-                return f"Recent logins:\n{stdout.strip()}"
-            elif tool_name == 'systemctl_status':
-                return f"Service status:\n{stdout.strip()}"
-            elif tool_name == 'apt_install':
-                return f"Package installation output:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'apt_update':
-                return f"Package list update output:\n{stdout.strip()[:1500]}"
-            elif tool_name == 'systemctl_restart':
-                return f"Service restart completed.\n{stdout.strip()}" if stdout.strip() else "Service restart completed."
-            elif tool_name == 'systemctl_start':
-                return f"Service start completed.\n{stdout.strip()}" if stdout.strip() else "Service start completed."
-            elif tool_name == 'systemctl_stop':
-                return f"Service stop completed.\n{stdout.strip()}" if stdout.strip() else "Service stop completed."
-            else:
-                # Generic fallback: show truncated stdout instead of hiding it
-                if stdout.strip():
-                    truncated = stdout.strip()[:1000]
-                    if len(stdout) > 1000:
-                        truncated += "\n... (output truncated)"
-                    return f"Command output:\n{truncated}"
-                return f"Command executed successfully (no output)."
-        elif isinstance(data, dict):
-            # For structured data without stdout, show relevant summary
-            if 'gpu_count' in data and 'gpus' in data:
-                # Handle GPU temperature structured data
-                gpus = data['gpus']
-                if gpus:
-                    gpu_info = []
-                    for gpu in gpus:
-                        temp = gpu.get('temperature_c', 'N/A')
-                        util = gpu.get('utilization_percent', 'N/A')
-                        mem_used = gpu.get('memory_used_mb', 'N/A')
-                        mem_total = gpu.get('memory_total_mb', 'N/A')
-                        power = gpu.get('power_draw_w', 'N/A')
-                        name = gpu.get('name', 'GPU')
-                        
-                        # Format memory as GB if it's in MB
-                        if mem_used != 'N/A' and mem_total != 'N/A':
-                            try:
-                                mem_used_gb = float(mem_used) / 1024
-                                mem_total_gb = float(mem_total) / 1024
-                                memory_info = f"{mem_used_gb:.1f}/{mem_total_gb:.1f}GB memory"
-                            except (ValueError, TypeError):
-                                memory_info = f"{mem_used}/{mem_total}MB memory"
-                        else:
-                            memory_info = "memory usage"
-                        
-                        details = []
-                        if util != 'N/A':
-                            details.append(f"{util}% utilization")
-                        if memory_info:
-                            details.append(memory_info)
-                        if power != 'N/A':
-                            details.append(f"{power}W power draw")
-                        
-                        detail_str = f" ({', '.join(details)})" if details else ""
-                        gpu_info.append(f"{name}: {temp}°C{detail_str}")
-                    
-                    return "GPU: " + " | ".join(gpu_info)
-                else:
-                    return "No GPUs detected."
-            elif 'memory_total_gb' in data and 'memory_used_gb' in data:
-                # Handle system_health structured data
-                memory_total = data.get('memory_total_gb', 'N/A')
-                memory_used = data.get('memory_used_gb', 'N/A')
-                memory_available = memory_total - memory_used if isinstance(memory_total, (int, float)) and isinstance(memory_used, (int, float)) else 'N/A'
-                cpu_percent = data.get('cpu_percent', 'N/A')
-                
-                result = f"CPU usage: {cpu_percent}%. RAM: {memory_available:.1f}GB available out of {memory_total:.1f}GB total."
-                
-                # Include top processes by CPU
-                top_cpu = data.get('top_cpu_processes', [])
-                if top_cpu:
-                    cpu_list = []
-                    for p in top_cpu[:5]:
-                        cpu_list.append(f"  • {p['name']} (PID {p['pid']}): {p['cpu_percent']:.1f}% CPU")
-                    result += "\n\nTop CPU processes:\n" + "\n".join(cpu_list)
-                
-                # Include top processes by memory
-                top_mem = data.get('top_memory_processes', [])
-                if top_mem:
-                    mem_list = []
-                    for p in top_mem[:5]:
-                        # Calculate MB from percentage
-                        mem_mb = (p['memory_percent'] / 100) * memory_total * 1024 if isinstance(memory_total, (int, float)) else 0
-                        mem_list.append(f"  • {p['name']} (PID {p['pid']}): {p['memory_percent']:.1f}% RAM ({mem_mb:.0f}MB)")
-                    result += "\n\nTop memory processes:\n" + "\n".join(mem_list)
-                
-                return result
-            elif 'total_gb' in data and 'free_gb' in data:
-                # Handle disk_free structured data
-                path = data.get('path', 'disk')
-                total = data.get('total_gb', 'N/A')
-                free = data.get('free_gb', 'N/A')
-                percent = data.get('percent_used', 'N/A')
-                return f"Disk ({path}): {free:.1f}GB free out of {total:.1f}GB total ({percent:.1f}% used)"
-            elif 'analyzed_path' in data and 'top_directories' in data:
-                # Handle directory_size structured data
-                analyzed = data.get('analyzed_path', 'N/A')
-                depth = data.get('depth', 1)
-                total = data.get('total_directories', 0)
-                top_dirs = data.get('top_directories', [])
-                
-                if top_dirs:
-                    dir_list = "\n".join([f"• {d['size']}\t{d['path']}" for d in top_dirs[:10]])
-                    return f"Directory size analysis for {analyzed} (depth={depth}, {total} dirs):\n{dir_list}"
-                return f"Directory size analysis completed for {analyzed}."
-            elif 'scanned_path' in data and 'duplicate_groups' in data:
-                # Handle find_duplicates structured data
-                scanned = data.get('scanned_path', 'N/A')
-                files_scanned = data.get('files_scanned', 0)
-                dup_groups = data.get('duplicate_groups', 0)
-                total_dups = data.get('total_duplicate_files', 0)
-                wasted = data.get('total_wasted_space', '0B')
-                top_dups = data.get('top_duplicates', [])
-                
-                if dup_groups == 0:
-                    return f"No duplicate files found in {scanned} ({files_scanned} files scanned)."
-                
-                summary = f"Found {dup_groups} duplicate groups ({total_dups} duplicate files) in {scanned}.\nWasted space: {wasted}\n"
-                if top_dups:
-                    dup_list = []
-                    for d in top_dups[:10]:
-                        files_preview = ", ".join([f.split('/')[-1] for f in d['files'][:2]])
-                        dup_list.append(f"• {d['count']} copies of {d['size']} file ({d['wasted_space']} wasted): {files_preview}")
-                    summary += "Top duplicates:\n" + "\n".join(dup_list)
-                return summary
-            elif 'dry_run' in data and 'total_photos' in data:
-                # Handle organize_photos structured data
-                dry_run = data.get('dry_run', True)
-                total = data.get('total_photos', 0)
-                message = data.get('message', '')
-                
-                if total == 0:
-                    return "No photos found in the input directory."
-                
-                plan = data.get('plan', [])
-                if plan:
-                    preview = "\n".join([f"• {p['source']} → {p['destination']}" for p in plan[:5]])
-                    return f"{message}\nPreview:\n{preview}"
-                return message
-            elif 'total' in data and 'free' in data:
-                return f"Storage information: {data.get('free', 'N/A')} free out of {data.get('total', 'N/A')} total"
-            elif 'exit_code' in data:
-                # Show exit code and any other data present to prevent hallucination
-                exit_code = data.get('exit_code', 0)
-                other_data = {k: v for k, v in data.items() if k != 'exit_code'}
-                if other_data:
-                    data_str = ", ".join([f"{k}: {v}" for k, v in list(other_data.items())[:5]])
-                    return f"Operation completed (exit code {exit_code}). Data: {data_str}"
-                return f"Operation completed with exit code {exit_code}. No additional data returned."
-            else:
-                # IMPORTANT: Always show actual data to prevent model hallucination
-                # Convert dict to readable format so model has real data
-                data_preview = []
-                for key, value in list(data.items())[:10]:
-                    if isinstance(value, (list, dict)):
-                        data_preview.append(f"{key}: {type(value).__name__} with {len(value)} items")
-                    else:
-                        data_preview.append(f"{key}: {value}")
-                if data_preview:
-                    return f"Tool '{tool_name}' returned:\n" + "\n".join(data_preview)
-                return f"Tool '{tool_name}' completed but returned no data."
-        else:
-            # Non-dict data - show it directly
-            return f"Tool '{tool_name}' returned: {str(data)[:500]}"
-    else:
+    if not result.get("ok"):
         return f"Tool '{tool_name}' failed. Error: {result.get('message')}"
+    
+    data = result.get('data')
+    formatter = FORMATTERS.get(TOOL_ALIASES.get(tool_name, tool_name))
+    if formatter is not None and isinstance(data, dict):
+        return formatter(data)
+    return format_generic(tool_name, data)
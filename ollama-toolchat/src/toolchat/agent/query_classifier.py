@@ -1,10 +1,18 @@
 """
 Query classifier to detect system-related questions that MUST use tools.
 This prevents the LLM from hallucinating system information.
+
+Patterns are matched as whole words in one pass over the query; when several
+match, the most specific (longest) one decides. Patterns for tools that need
+a target (a path, host or service) only count when the query names one, so
+"status of dns" still goes to the DNS tool rather than to a service status
+call with nothing to check.
 """
 
 import re
 from typing import Optional, Tuple
+from .arg_extractor import extract_host, extract_path, extract_service
+from .phrase_matcher import PhraseMatcher
 from ..infra.logging import get_logger
 
 logger = get_logger(__name__)
@@ -28,6 +36,8 @@ SYSTEM_QUERY_PATTERNS = {
     "utilizing memory": "ps_command",
     "memory usage by process": "ps_command",
     "ram usage by process": "ps_command",
+    "memory usage by processes": "ps_command",
+    "ram usage by processes": "ps_command",
     "processes using": "ps_command",
     "services using": "ps_command",
     
@@ -43,7 +53,9 @@ SYSTEM_QUERY_PATTERNS = {
     "gpu temperature": "gpu_temperature",
     "gpu temp": "gpu_temperature",
     "graphics card temp": "gpu_temperature",
+    "graphics card temperature": "gpu_temperature",
     "nvidia temp": "gpu_temperature",
+    "nvidia temperature": "gpu_temperature",
     "gpu usage": "gpu_temperature",
     "gpu utilization": "gpu_temperature",
     
@@ -59,6 +71,13 @@ SYSTEM_QUERY_PATTERNS = {
     "mounted": "findmnt_command",
     "mount points": "findmnt_command",
     "block devices": "lsblk_command",
+    # These need a path; it is taken from the query (see TARGET_EXTRACTORS)
+    "how big is": "directory_size",
+    "size of": "directory_size",
+    "folder size": "directory_size",
+    "directory size": "directory_size",
+    "duplicates": "find_duplicates",
+    "duplicate files": "find_duplicates",
     
     # Network patterns
     "ip address": "ip_addr_command",
@@ -71,6 +90,8 @@ SYSTEM_QUERY_PATTERNS = {
     "listening ports": "ss_command",
     "open ports": "ss_command",
     "dns": "resolvectl_command",
+    "ping": "ping_command",
+    "reachable": "ping_command",
     
     # System info patterns
     "uptime": "uptime_command",
@@ -84,6 +105,12 @@ SYSTEM_QUERY_PATTERNS = {
     "current user": "whoami_command",
     "username": "whoami_command",
     
+    # Service patterns (the service name is taken from the query)
+    "service status": "systemctl_status",
+    "status of": "systemctl_status",
+    "service running": "systemctl_status",
+    "systemctl status": "systemctl_status",
+    
     # Process patterns
     "running processes": "ps_command",
     "process list": "ps_command",
@@ -100,6 +127,7 @@ SYSTEM_QUERY_PATTERNS = {
     # Log patterns
     "system logs": "journalctl_command",
     "journal": "journalctl_command",
+    "journalctl": "journalctl_command",
     "dmesg": "dmesg_command",
     "kernel messages": "dmesg_command",
 }
@@ -162,31 +190,10 @@ Just ask me naturally like "How much disk space do I have?" or "What's using my
 }
 
 
-def classify_query(query: str) -> Tuple[bool, Optional[str]]:
-    """
-    Classify a user query to determine if it requires a tool call.
-    
-    Returns:
-        Tuple of (requires_tool, suggested_tool_name)
-        - requires_tool: True if this query MUST use a tool
-        - suggested_tool_name: The tool that should be used, or None
-    """
-    query_lower = query.lower().strip()
-    
-    # Check auto-response patterns first
-    for pattern, response_type in AUTO_RESPONSE_PATTERNS.items():
-        if pattern in query_lower:
-            logger.info(f"Query classified as auto-response: pattern='{pattern}' -> response='{response_type}'")
-            return True, f"auto_response:{response_type}"
-    
-    # Check each pattern
-    for pattern, tool_name in SYSTEM_QUERY_PATTERNS.items():
-        if pattern in query_lower:
-            logger.info(f"Query classified as system query: pattern='{pattern}' -> tool='{tool_name}'")
-            return True, tool_name
-    
-    # Additional regex patterns for more complex matching
-    regex_patterns = [
+# Fallbacks for phrasings the fixed patterns do not cover; tried in order
+REGEX_PATTERNS = [
+    (re.compile(pattern), tool_name)
+    for pattern, tool_name in [
         # "how much X do I have" patterns
         (r"how much (ram|memory|disk|space|storage)", "free_command"),
         (r"what('s| is) my (ram|memory)", "free_command"),
@@ -198,13 +205,72 @@ def classify_query(query: str) -> Tuple[bool, Optional[str]]:
         (r"what('s| is) (the )?(cpu|processor) (temp|temperature)", "sensors_command"),
         (r"what('s| is) (the )?(gpu|graphics) (temp|temperature)", "gpu_temperature"),
     ]
+]
+
+# Tools whose patterns only count when the query also names their target
+TARGET_EXTRACTORS = {
+    "directory_size": extract_path,
+    "find_duplicates": extract_path,
+    "ping_command": extract_host,
+    "systemctl_status": extract_service,
+}
+
+# Auto-response patterns go first so they win ties, as they did when checked first
+_MATCHER = PhraseMatcher(
+    [(pattern, ("auto_response", response_type)) for pattern, response_type in AUTO_RESPONSE_PATTERNS.items()]
+    + [(pattern, ("tool", tool_name)) for pattern, tool_name in SYSTEM_QUERY_PATTERNS.items()]
+)
+
+
+def _usable(value: Tuple[str, str], query: str) -> bool:
+    kind, target = value
+    extractor = TARGET_EXTRACTORS.get(target) if kind == "tool" else None
+    return extractor is None or extractor(query) is not None
+
+
+def _match(query: str) -> Optional[Tuple[str, str, str]]:
+    """Return (kind, target, pattern) for the most specific usable pattern in the query, or None."""
+    match = _MATCHER.best(query)
+    if match is not None and _usable(match.value, query):
+        kind, target = match.value
+        return kind, target, match.phrase
+    if match is not None:
+        # Rare: the best pattern needs a target the query does not name
+        for match in _MATCHER.ranked(query)[1:]:
+            if _usable(match.value, query):
+                kind, target = match.value
+                return kind, target, match.phrase
+    
+    query_lower = query.lower().strip()
+    for regex, tool_name in REGEX_PATTERNS:
+        if regex.search(query_lower):
+            return "regex", tool_name, regex.pattern
     
-    for pattern, tool_name in regex_patterns:
-        if re.search(pattern, query_lower):
-            logger.info(f"Query classified as system query (regex): pattern='{pattern}' -> tool='{tool_name}'")
-            return True, tool_name
+    return None
+
+
+def classify_query(query: str) -> Tuple[bool, Optional[str]]:
+    """
+    Classify a user query to determine if it requires a tool call.
     
-    return False, None
+    Returns:
+        Tuple of (requires_tool, suggested_tool_name)
+        - requires_tool: True if this query MUST use a tool
+        - suggested_tool_name: The tool that should be used, or None
+    """
+    match = _match(query)
+    if match is None:
+        return False, None
+    
+    kind, target, pattern = match
+    if kind == "auto_response":
+        logger.info(f"Query classified as auto-response: pattern='{pattern}' -> response='{target}'")
+        return True, f"auto_response:{target}"
+    if kind == "regex":
+        logger.info(f"Query classified as system query (regex): pattern='{pattern}' -> tool='{target}'")
+    else:
+        logger.info(f"Query classified as system query: pattern='{pattern}' -> tool='{target}'")
+    return True, target
 
 
 def requires_tool_call(query: str) -> bool:
@@ -221,32 +287,18 @@ def get_suggested_tool(query: str) -> Optional[str]:
 
 def is_auto_response(query: str) -> bool:
     """Check if a query should trigger an auto-response."""
-    query_lower = query.lower().strip()
-    
-    for pattern in AUTO_RESPONSE_PATTERNS.keys():
-        if pattern in query_lower:
-            return True
-    
-    return False
+    return get_auto_response_type(query) is not None
 
 
 def get_auto_response(query: str) -> Optional[str]:
     """Get the auto-response for a query, or None if no auto-response is defined."""
-    query_lower = query.lower().strip()
-    
-    for pattern, response_type in AUTO_RESPONSE_PATTERNS.items():
-        if pattern in query_lower:
-            return AUTO_RESPONSES.get(response_type)
-    
-    return None
+    response_type = get_auto_response_type(query)
+    return AUTO_RESPONSES.get(response_type) if response_type else None
 
 
 def get_auto_response_type(query: str) -> Optional[str]:
     """Get the auto-response type for a query, or None if no auto-response is defined."""
-    query_lower = query.lower().strip()
-    
-    for pattern, response_type in AUTO_RESPONSE_PATTERNS.items():
-        if pattern in query_lower:
-            return response_type
-    
+    match = _MATCHER.best(query)
+    if match is not None and match.value[0] == "auto_response":
+        return match.value[1]
     return None
@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from ..tools.base import ToolResult
+from ..config import settings
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def cache_key(tool_name: str, args: Dict[str, Any]) -> Tuple[str, str]:
+    """Key on the tool and its arguments, independent of key order and unset values."""
+    normalized = {k: v for k, v in args.items() if v is not None}
+    return tool_name, json.dumps(normalized, sort_keys=True, default=str)
+
+
+class ResultCache:
+    """Size-bounded LRU of tool results that expire after a per-entry TTL.
+    
+    Only successful results are stored. Expired entries are dropped when
+    they are looked up; the least recently used entry is evicted once
+    ``max_entries`` is exceeded.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else settings.tool_cache_max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, ToolResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Optional[ToolResult]:
+        key = cache_key(tool_name, args)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may mutate the result they get back
+        return entry[1].model_copy(deep=True)
+    
+    def put(self, tool_name: str, args: Dict[str, Any], result: ToolResult, ttl: float) -> None:
+        if ttl <= 0 or not result.ok or self.max_entries <= 0:
+            return
+        key = cache_key(tool_name, args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                logger.info(f"Cleared {len(self._entries)} cached tool results")
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+result_cache = ResultCache()
@@ -0,0 +1,217 @@
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+from ..tools.base import ToolSpec, ToolTier
+from ..config import settings
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Lower runs first in pools shared by several resource classes
+PRIORITY = {"quick": 0, "cpu": 1, "disk_scan": 2}
+
+
+class _Waiter:
+    def __init__(self, priority: int, session_id: str, seq: int, wake: Callable[[], None]):
+        self.priority = priority
+        self.session_id = session_id
+        self.seq = seq
+        self.wake = wake
+        self.enqueued = time.monotonic()
+        self.granted = False
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Pool:
+    """Counting slot pool whose waiters are served by priority, then round-robin by session.
+    
+    Among waiters of the best priority, the session granted a slot least
+    recently goes first, so one session queueing many scans cannot starve
+    the others. ``reserved`` slots are only handed to priority-0 callers,
+    so those never wait behind work that fills the rest of the pool. Both
+    threads and coroutines can wait on the same pool.
+    """
+    
+    def __init__(self, name: str, capacity: int, reserved: int = 0):
+        self.name = name
+        self.capacity = capacity
+        self.reserved = min(reserved, capacity - 1) if capacity > 0 else 0
+        self.running = 0
+        self.granted = 0
+        self.peak_queued = 0
+        self.wait_seconds = 0.0
+        self._waiters: List[_Waiter] = []
+        self._last_served: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+    
+    def _has_room(self, priority: int) -> bool:
+        limit = self.capacity if priority == 0 else self.capacity - self.reserved
+        return self.running < limit
+    
+    def _enqueue(self, priority: int, session_id: str, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """Take a free slot, or queue and return the waiter (lock held)."""
+        if self._has_room(priority) and not any(w.priority <= priority for w in self._waiters):
+            self._grant(session_id, 0.0)
+            return None
+        waiter = _Waiter(priority, session_id, next(self._seq), wake)
+        self._waiters.append(waiter)
+        logger.debug(f"Pool '{self.name}' is full; {len(self._waiters)} waiting")
+        self.peak_queued = max(self.peak_queued, len(self._waiters))
+        return waiter
+    
+    def _grant(self, session_id: str, waited: float) -> None:
+        self.running += 1
+        self.granted += 1
+        self.wait_seconds += waited
+        self._last_served[session_id] = self.granted
+    
+    def _dispatch(self) -> None:
+        while self._waiters:
+            eligible = [w for w in self._waiters if self._has_room(w.priority)]
+            if not eligible:
+                break
+            waiter = min(eligible, key=lambda w: (
+                w.priority, self._last_served.get(w.session_id, 0), w.seq
+            ))
+            self._waiters.remove(waiter)
+            waiter.granted = True
+            self._grant(waiter.session_id, time.monotonic() - waiter.enqueued)
+            waiter.wake()
+        if not self.running and not self._waiters:
+            self._last_served.clear()
+    
+    def acquire(self, priority: int, session_id: str) -> None:
+        granted = threading.Event()
+        with self._lock:
+            waiter = self._enqueue(priority, session_id, granted.set)
+        if waiter is not None:
+            granted.wait()
+    
+    async def acquire_async(self, priority: int, session_id: str) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            waiter = self._enqueue(
+                priority, session_id, lambda: loop.call_soon_threadsafe(_resolve, future)
+            )
+        if waiter is None:
+            return
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+            if waiter.granted:
+                self.release()
+            raise
+    
+    def release(self) -> None:
+        with self._lock:
+            self.running -= 1
+            self._dispatch()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "reserved": self.reserved,
+                "running": self.running,
+                "queued": len(self._waiters),
+                "peak_queued": self.peak_queued,
+                "granted": self.granted,
+                "avg_wait_ms": round(self.wait_seconds / self.granted * 1000, 1) if self.granted else 0.0,
+            }
+
+
+class ToolScheduler:
+    """Bounds how many tools run at once.
+    
+    Every execution takes a slot in the pool of its spec's resource class,
+    for write tiers in that tier's pool, and last in the shared pool that
+    all classes draw from. The shared pool is where quick reads take
+    precedence: queued quick calls go before queued scans, and its reserved
+    slots are only given to quick calls. Pools are always taken in that
+    order, so holding one while waiting for the next cannot deadlock. A
+    capacity of 0 leaves that pool unbounded.
+    """
+    
+    def __init__(
+        self,
+        class_slots: Optional[Dict[str, int]] = None,
+        tier_slots: Optional[Dict[ToolTier, int]] = None,
+        shared_slots: Optional[int] = None,
+        quick_reserved_slots: Optional[int] = None,
+    ):
+        if class_slots is None:
+            class_slots = {
+                "quick": settings.scheduler_quick_slots,
+                "cpu": settings.scheduler_cpu_slots,
+                "disk_scan": settings.scheduler_disk_scan_slots,
+            }
+        if tier_slots is None:
+            tier_slots = {
+                ToolTier.WRITE_SAFE: settings.scheduler_write_slots,
+                ToolTier.SYSTEM_CHANGE: settings.scheduler_system_change_slots,
+            }
+        if shared_slots is None:
+            shared_slots = settings.scheduler_shared_slots
+        if quick_reserved_slots is None:
+            quick_reserved_slots = settings.scheduler_quick_reserved_slots
+        self.class_pools = {name: Pool(name, n) for name, n in class_slots.items() if n > 0}
+        self.tier_pools = {tier: Pool(tier.name.lower(), n) for tier, n in tier_slots.items() if n > 0}
+        self.shared_pool = Pool("shared", shared_slots, reserved=quick_reserved_slots) if shared_slots > 0 else None
+    
+    def _pools_for(self, spec: ToolSpec) -> List[Pool]:
+        pools = []
+        if spec.resource_class in self.class_pools:
+            pools.append(self.class_pools[spec.resource_class])
+        if spec.tier in self.tier_pools:
+            pools.append(self.tier_pools[spec.tier])
+        if self.shared_pool is not None:
+            pools.append(self.shared_pool)
+        return pools
+    
+    @contextmanager
+    def slot(self, spec: ToolSpec, session_id: str) -> Iterator[None]:
+        priority = PRIORITY[spec.resource_class]
+        acquired: List[Pool] = []
+        try:
+            for pool in self._pools_for(spec):
+                pool.acquire(priority, session_id)
+                acquired.append(pool)
+            yield
+        finally:
+            for pool in reversed(acquired):
+                pool.release()
+    
+    @asynccontextmanager
+    async def slot_async(self, spec: ToolSpec, session_id: str) -> AsyncIterator[None]:
+        priority = PRIORITY[spec.resource_class]
+        acquired: List[Pool] = []
+        try:
+            for pool in self._pools_for(spec):
+                await pool.acquire_async(priority, session_id)
+                acquired.append(pool)
+            yield
+        finally:
+            for pool in reversed(acquired):
+                pool.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "classes": {name: pool.stats() for name, pool in self.class_pools.items()},
+            "tiers": {pool.name: pool.stats() for pool in self.tier_pools.values()},
+            "shared": self.shared_pool.stats() if self.shared_pool is not None else None,
+        }
+
+
+tool_scheduler = ToolScheduler()
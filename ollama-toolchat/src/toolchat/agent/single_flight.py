@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Flight:
+    def __init__(self):
+        self.task: Optional[asyncio.Future] = None
+        self.listeners: List[Callable[[str], None]] = []
+        self.waiters = 0
+    
+    def emit(self, text: str) -> None:
+        for listener in list(self.listeners):
+            listener(text)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+    
+    The first caller for a key runs the work; callers arriving while it is
+    in flight wait for and share its result (or exception). Nothing is
+    remembered once the call completes - that is the result cache's job.
+    Threaded callers use do(), async callers do_async(); the two do not
+    coalesce with each other.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.shared = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn() once per concurrent key; returns (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+    
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[Callable[[str], None]], Awaitable[Any]],
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Any, bool]:
+        """Await fn(emit) once per concurrent key; returns (result, shared).
+        
+        Output passed to ``emit`` reaches the ``on_output`` of every caller
+        waiting at that moment. The shared execution is cancelled only
+        when its last waiter is.
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if shared:
+            self.shared += 1
+        else:
+            flight = self._flights[key] = _Flight()
+            flight.task = asyncio.ensure_future(fn(flight.emit))
+            
+            def forget(_):
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            
+            flight.task.add_done_callback(forget)
+        
+        if on_output is not None:
+            flight.listeners.append(on_output)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+            if on_output is not None:
+                flight.listeners.remove(on_output)
+
+
+single_flight = SingleFlight()
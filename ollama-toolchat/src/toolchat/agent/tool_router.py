@@ -1,9 +1,13 @@
 import json
 import uuid
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, Optional, Tuple
 from ..tools.registry import registry
-from ..tools.base import ToolResult
+from ..tools.base import BaseTool, ToolResult, ToolTier
+from .formatters import render_direct_answer
 from .planner import plan_store
+from .result_cache import cache_key, result_cache
+from .single_flight import single_flight
+from .scheduler import tool_scheduler
 from ..infra.logging import get_logger
 from ..infra.audit import audit_logger
 
@@ -70,6 +74,136 @@ class ToolRouter:
             logger.error(f"Failed to parse tool call: {e}")
             return None
     
+    def _start(self, tool_name: str, session_id: str) -> Tuple[Optional[BaseTool], str]:
+        request_id = str(uuid.uuid4())
+        tool = registry.get(tool_name)
+        
+        if tool:
+            logger.info(f"Executing tool: {tool_name}", extra={
+                "tool_name": tool_name,
+                "tier": tool.spec.tier,
+                "session_id": session_id,
+                "request_id": request_id,
+            })
+        
+        return tool, request_id
+    
+    def _not_found(self, tool_name: str) -> Tuple[ToolResult, Optional[str]]:
+        return ToolResult(
+            ok=False,
+            error_code="tool_not_found",
+            message=f"Tool '{tool_name}' not found"
+        ), None
+    
+    def _create_plan(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        session_id: str,
+        request_id: str,
+        result: ToolResult,
+    ) -> Tuple[ToolResult, Optional[str]]:
+        if not result.ok:
+            return result, None
+        
+        tool_name = tool.spec.name
+        summary = f"Tool '{tool_name}' will perform: {result.data}"
+        plan_id = plan_store.create_plan(
+            session_id, tool_name, args, summary, operations=result.operations
+        )
+        
+        audit_logger.log_tool_execution(
+            session_id=session_id,
+            request_id=request_id,
+            tool_name=tool_name,
+            tier=int(tool.spec.tier),
+            action="dry_run",
+            details=args,
+            result=result.dict(),
+            user_confirmed=False
+        )
+        
+        return result, plan_id
+    
+    def _cache_ttl(self, tool: BaseTool, dry_run: bool) -> float:
+        """Seconds the result of this call may be cached; 0 when it must not be."""
+        if dry_run or tool.spec.tier != ToolTier.READ_ONLY:
+            return 0
+        return tool.spec.cache_ttl_sec
+    
+    def _cached(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        session_id: str,
+        request_id: str,
+        ttl: float,
+    ) -> Optional[ToolResult]:
+        if ttl <= 0:
+            return None
+        cached = result_cache.get(tool.spec.name, args)
+        if cached is not None:
+            logger.info(f"Serving cached result for {tool.spec.name}", extra={"request_id": request_id})
+            # Every caller is audited, whichever session ran the tool
+            self._audit_execution(tool, args, session_id, request_id, cached, action="execute_cached")
+        return cached
+    
+    def _coalesces(self, tool: BaseTool, dry_run: bool) -> bool:
+        """Concurrent identical read-only calls share one execution."""
+        return not dry_run and tool.spec.tier == ToolTier.READ_ONLY
+    
+    def _shared_result(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        session_id: str,
+        request_id: str,
+        result: ToolResult,
+        shared: bool,
+    ) -> ToolResult:
+        if not shared:
+            return result
+        logger.info(f"Joined in-flight execution of {tool.spec.name}", extra={"request_id": request_id})
+        # The execution was audited for the caller that started it
+        self._audit_execution(tool, args, session_id, request_id, result, action="execute_coalesced")
+        return result.model_copy(deep=True)
+    
+    def _after_execution(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        session_id: str,
+        request_id: str,
+        result: ToolResult,
+        ttl: float,
+    ) -> None:
+        self._audit_execution(tool, args, session_id, request_id, result)
+        if ttl > 0:
+            result_cache.put(tool.spec.name, args, result, ttl)
+        elif tool.spec.tier != ToolTier.READ_ONLY:
+            # The system may have changed under any cached reading
+            result_cache.clear()
+    
+    def _audit_execution(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        session_id: str,
+        request_id: str,
+        result: ToolResult,
+        action: str = "execute",
+    ) -> None:
+        audit_logger.log_tool_execution(
+            session_id=session_id,
+            request_id=request_id,
+            tool_name=tool.spec.name,
+            tier=int(tool.spec.tier),
+            action=action,
+            details=args,
+            result=result.dict(),
+            user_confirmed=False
+        )
+    
     def execute_tool(
         self,
         tool_name: str,
@@ -77,60 +211,74 @@ class ToolRouter:
         session_id: str,
         dry_run: bool = False
     ) -> Tuple[ToolResult, Optional[str]]:
-        request_id = str(uuid.uuid4())
-        tool = registry.get(tool_name)
-        
+        tool, request_id = self._start(tool_name, session_id)
         if not tool:
-            return ToolResult(
-                ok=False,
-                error_code="tool_not_found",
-                message=f"Tool '{tool_name}' not found"
-            ), None
+            return self._not_found(tool_name)
         
-        logger.info(f"Executing tool: {tool_name}", extra={
-            "tool_name": tool_name,
-            "tier": tool.spec.tier,
-            "session_id": session_id,
-            "request_id": request_id,
-        })
+        if tool.spec.requires_confirmation and not dry_run:
+            with tool_scheduler.slot(tool.spec, session_id):
+                result = tool.execute(args, dry_run=True)
+            return self._create_plan(tool, args, session_id, request_id, result)
+        
+        ttl = self._cache_ttl(tool, dry_run)
+        cached = self._cached(tool, args, session_id, request_id, ttl)
+        if cached is not None:
+            return cached, None
+        
+        def run() -> ToolResult:
+            with tool_scheduler.slot(tool.spec, session_id):
+                result = tool.execute(args, dry_run=dry_run)
+            if not dry_run:
+                self._after_execution(tool, args, session_id, request_id, result, ttl)
+            return result
+        
+        if not self._coalesces(tool, dry_run):
+            return run(), None
+        
+        result, shared = single_flight.do(cache_key(tool.spec.name, args), run)
+        return self._shared_result(tool, args, session_id, request_id, result, shared), None
+    
+    async def execute_tool_async(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        session_id: str,
+        dry_run: bool = False,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[ToolResult, Optional[str]]:
+        """execute_tool for async routes: the tool runs without blocking the event loop.
+        
+        ``on_output`` receives command output as it is produced (not for
+        dry runs of tools that need confirmation).
+        """
+        tool, request_id = self._start(tool_name, session_id)
+        if not tool:
+            return self._not_found(tool_name)
         
         if tool.spec.requires_confirmation and not dry_run:
-            result = tool.execute(args, dry_run=True)
-            
-            if result.ok:
-                summary = f"Tool '{tool_name}' will perform: {result.data}"
-                plan_id = plan_store.create_plan(session_id, tool_name, args, summary)
-                
-                audit_logger.log_tool_execution(
-                    session_id=session_id,
-                    request_id=request_id,
-                    tool_name=tool_name,
-                    tier=int(tool.spec.tier),
-                    action="dry_run",
-                    details=args,
-                    result=result.dict(),
-                    user_confirmed=False
-                )
-                
-                return result, plan_id
-            else:
-                return result, None
-        
-        result = tool.execute(args, dry_run=dry_run)
-        
-        if not dry_run:
-            audit_logger.log_tool_execution(
-                session_id=session_id,
-                request_id=request_id,
-                tool_name=tool_name,
-                tier=int(tool.spec.tier),
-                action="execute",
-                details=args,
-                result=result.dict(),
-                user_confirmed=False
-            )
+            async with tool_scheduler.slot_async(tool.spec, session_id):
+                result = await tool.execute_async(args, dry_run=True)
+            return self._create_plan(tool, args, session_id, request_id, result)
+        
+        ttl = self._cache_ttl(tool, dry_run)
+        cached = self._cached(tool, args, session_id, request_id, ttl)
+        if cached is not None:
+            return cached, None
+        
+        async def run(emit: Optional[Callable[[str], None]]) -> ToolResult:
+            async with tool_scheduler.slot_async(tool.spec, session_id):
+                result = await tool.execute_async(args, dry_run=dry_run, on_output=emit)
+            if not dry_run:
+                self._after_execution(tool, args, session_id, request_id, result, ttl)
+            return result
         
-        return result, None
+        if not self._coalesces(tool, dry_run):
+            return await run(on_output), None
+        
+        result, shared = await single_flight.do_async(
+            cache_key(tool.spec.name, args), run, on_output=on_output
+        )
+        return self._shared_result(tool, args, session_id, request_id, result, shared), None
     
     def execute_confirmed_plan(self, plan_id: str) -> ToolResult:
         request_id = str(uuid.uuid4())
@@ -165,8 +313,14 @@ class ToolRouter:
             "request_id": request_id,
         })
         
-        result = tool.execute(plan.args, dry_run=False)
+        # Replay the operations computed by the dry run instead of re-planning
+        with tool_scheduler.slot(tool.spec, plan.session_id):
+            if plan.operations is not None:
+                result = tool.execute_plan(plan.args, plan.operations)
+            else:
+                result = tool.execute(plan.args, dry_run=False)
         plan_store.mark_executed(plan_id)
+        result_cache.clear()
         
         audit_logger.log_tool_execution(
             session_id=plan.session_id,
@@ -180,6 +334,13 @@ class ToolRouter:
         )
         
         return result
+    
+    def direct_answer(self, tool_name: str, result: ToolResult) -> Optional[str]:
+        """The tool's own answer for a successful result, if its spec declares one."""
+        tool = registry.get(tool_name)
+        if tool is None or not result.ok or not tool.spec.direct_answer:
+            return None
+        return render_direct_answer(tool.spec.direct_answer, result.data)
 
 
 tool_router = ToolRouter()
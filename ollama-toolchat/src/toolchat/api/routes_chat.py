@@ -2,14 +2,17 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, AsyncGenerator
+import asyncio
 import threading
 import requests
 import json
 from ..agent.ollama_client import ollama_client
 from ..agent.memory_store import memory_store
 from ..agent.tool_router import tool_router
-from ..agent.prompt import get_system_prompt, format_tool_result
-from ..agent.query_classifier import classify_query, is_auto_response, get_auto_response
+from ..agent.prompt import build_summary_messages, get_system_prompt, format_tool_result
+from ..agent.query_classifier import AUTO_RESPONSES, classify_query
+from ..agent.intent_router import intent_router
+from ..agent.arg_extractor import args_for_tool
 from ..config import settings
 from ..infra.logging import get_logger
 
@@ -66,15 +69,17 @@ class ModelsListResponse(BaseModel):
 
 @router.post("/v1/chat/confirm", response_model=ChatConfirmResponse)
 async def chat_confirm(request: ChatConfirmRequest):
+    from ..agent.planner import plan_store
+    
     if not request.confirm:
+        plan_store.delete_plan(request.plan_id)
         return ChatConfirmResponse(reply="Action cancelled.")
     
     try:
-        from ..agent.planner import plan_store
         plan = plan_store.get_plan(request.plan_id)
         tool_name = plan.tool_name if plan else "unknown"
         
-        result = tool_router.execute_confirmed_plan(request.plan_id)
+        result = await asyncio.to_thread(tool_router.execute_confirmed_plan, request.plan_id)
         
         if result.ok:
             reply = format_tool_result(tool_name, result.dict())
@@ -169,9 +174,12 @@ async def chat_send_stream(request: ChatSendRequest):
             history = memory_store.get_history(session_id)
             messages = [{"role": "system", "content": get_system_prompt()}] + history
             
+            # Classify once: auto-response, direct tool call, or LLM
+            requires_tool, suggested_tool = classify_query(request.message)
+            
             # FIRST: Check if this is an auto-response query
-            if is_auto_response(request.message):
-                auto_response = get_auto_response(request.message)
+            if suggested_tool and suggested_tool.startswith("auto_response:"):
+                auto_response = AUTO_RESPONSES[suggested_tool.split(":", 1)[1]]
                 logger.info(
                     f"Auto-response triggered for query: {request.message}",
                     extra={"session_id": session_id}
@@ -183,20 +191,27 @@ async def chat_send_stream(request: ChatSendRequest):
                 yield f"data: {json.dumps({'type': 'done'})}\n\n"
                 return
             
-            # SECOND: Classify the query to check if it requires a tool call
-            requires_tool, suggested_tool = classify_query(request.message)
+            # Paraphrased system questions the phrases missed
+            if not requires_tool and settings.intent_router_enabled:
+                intent = await asyncio.to_thread(intent_router.route, request.message)
+                if intent:
+                    requires_tool, suggested_tool = True, intent.tool
+            
+            # Arguments (paths, services, ...) must come from the message itself
+            tool_args = args_for_tool(suggested_tool, request.message) if requires_tool and suggested_tool else None
             
-            if requires_tool and suggested_tool and not suggested_tool.startswith("auto_response:"):
+            # SECOND: System queries call their tool directly
+            if tool_args is not None:
                 # System query detected - call tool FIRST, skip initial LLM call
                 logger.info(
-                    f"System query detected, calling tool directly: {suggested_tool}",
+                    f"System query detected, calling tool directly: {suggested_tool} {tool_args}",
                     extra={"session_id": session_id, "tool": suggested_tool}
                 )
                 yield f"data: {json.dumps({'type': 'status', 'message': 'Querying system data...'})}\n\n"
                 
                 tool_call = {
                     "tool": suggested_tool,
-                    "args": {},
+                    "args": tool_args,
                     "explain": f"Retrieving system information"
                 }
                 assistant_message = ""  # No initial LLM response needed
@@ -217,7 +232,26 @@ async def chat_send_stream(request: ChatSendRequest):
                 
                 yield f"data: {json.dumps({'type': 'tool_call', 'tool': tool_name, 'explain': explain})}\n\n"
                 
-                result, plan_id = tool_router.execute_tool(tool_name, args, session_id)
+                # Forward command output to the client while the tool runs
+                output_queue: asyncio.Queue = asyncio.Queue()
+                on_output = output_queue.put_nowait if settings.stream_tool_output else None
+                execution = asyncio.ensure_future(
+                    tool_router.execute_tool_async(tool_name, args, session_id, on_output=on_output)
+                )
+                try:
+                    while not execution.done() or not output_queue.empty():
+                        next_chunk = asyncio.ensure_future(output_queue.get())
+                        await asyncio.wait({execution, next_chunk}, return_when=asyncio.FIRST_COMPLETED)
+                        if next_chunk.done():
+                            yield f"data: {json.dumps({'type': 'tool_output', 'tool': tool_name, 'chunk': next_chunk.result()})}\n\n"
+                        else:
+                            next_chunk.cancel()
+                finally:
+                    # Client disconnected: cancelling kills the running command
+                    if not execution.done():
+                        execution.cancel()
+                
+                result, plan_id = execution.result()
                 
                 tool_result_msg = format_tool_result(tool_name, result.dict())
                 memory_store.add_message(session_id, "system", tool_result_msg)
@@ -235,32 +269,31 @@ async def chat_send_stream(request: ChatSendRequest):
                 else:
                     yield f"data: {json.dumps({'type': 'tool_result', 'result': result.dict()})}\n\n"
                     
-                    # Build messages for final response
-                    # Add explicit instruction to respond conversationally
-                    conversation_instruction = (
-                        "IMPORTANT: The tool has already been executed and returned real data above. "
-                        "Your job now is to explain these results to the user in a friendly, conversational way. "
-                        "DO NOT output JSON. DO NOT try to call another tool. DO NOT output {\"tool\": \"...\"}. "
-                        "Just craft a natural response using the exact numbers from the tool results."
-                    )
+                    # Simple results answer themselves; skip the summarization turn
+                    direct_answer = tool_router.direct_answer(tool_name, result) if settings.direct_answers else None
+                    if direct_answer:
+                        logger.info(f"Answered directly from {tool_name} result", extra={"session_id": session_id})
+                        memory_store.add_message(session_id, "assistant", direct_answer)
+                        yield f"data: {json.dumps({'type': 'message', 'role': 'assistant', 'content': direct_answer})}\n\n"
+                        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+                        return
                     
-                    # If assistant_message is empty (classifier called tool directly), don't add it
-                    if assistant_message.strip():
-                        messages_with_result = messages + [
-                            {"role": "assistant", "content": assistant_message},
-                            {"role": "system", "content": f"{tool_result_msg}\n\n{conversation_instruction}"}
-                        ]
-                    else:
-                        # Classifier called tool directly - just add the system result with instruction
-                        messages_with_result = messages + [
-                            {"role": "system", "content": f"{tool_result_msg}\n\n{conversation_instruction}"}
-                        ]
+                    # The model only explains the result now: send a compact prompt,
+                    # a few recent turns and the result instead of the full tool prompt
+                    messages_with_result = build_summary_messages(
+                        request.message, tool_result_msg, history[:-1], settings.summary_history_messages
+                    )
                     
                     logger.info(f"Tool result message: {tool_result_msg}", extra={"session_id": session_id})
                     yield f"data: {json.dumps({'type': 'status', 'message': 'Generating response...'})}\n\n"
                     
                     ollama_client.model = get_current_model()
-                    logger.info(f"Calling Ollama for final response with model: {get_current_model()}", extra={"session_id": session_id})
+                    prompt_chars = sum(len(m["content"]) for m in messages_with_result)
+                    logger.info(
+                        f"Calling Ollama for final response with model: {get_current_model()} "
+                        f"({len(messages_with_result)} messages, {prompt_chars} chars)",
+                        extra={"session_id": session_id}
+                    )
                     final_response = ollama_client.chat(messages=messages_with_result)
                     logger.info(f"Final response from Ollama: {final_response}", extra={"session_id": session_id})
                     final_message = final_response.get("message", {}).get("content", "").strip()
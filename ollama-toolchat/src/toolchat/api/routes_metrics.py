@@ -0,0 +1,70 @@
+import time
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+from ..agent.result_cache import result_cache
+from ..agent.single_flight import single_flight
+from ..agent.scheduler import tool_scheduler
+from ..infra.sandbox import sandbox_runner
+from ..infra.metrics_store import metrics_store, parse_duration
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/v1/metrics")
+async def list_metrics():
+    """List metric names that have recorded history."""
+    return {"metrics": metrics_store.list_metrics()}
+
+
+@router.get("/v1/metrics/history")
+async def metrics_history(
+    metric: str,
+    window: str = "1h",
+    end_ago: str = "0",
+    points: int = 60,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+):
+    """Min/avg/max of a metric over a window.
+    
+    The window is either relative (``window`` ending ``end_ago`` before now)
+    or absolute when ``start`` (and optionally ``end``) are unix timestamps.
+    """
+    now = time.time()
+    try:
+        if start is not None:
+            end = end if end is not None else now
+        else:
+            end = now - parse_duration(end_ago)
+            start = end - parse_duration(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    
+    return metrics_store.query(metric, start, end, max_points=max(1, min(points, 2000)), now=now)
+
+
+@router.get("/v1/metrics/tool-cache")
+async def tool_cache_stats():
+    """Hit/miss counters of the read-only tool result cache.
+    
+    ``coalesced`` counts calls that joined an identical in-flight execution.
+    """
+    return {**result_cache.stats(), "coalesced": single_flight.shared}
+
+
+@router.get("/v1/metrics/scheduler")
+async def scheduler_stats():
+    """Running, queued and wait-time figures for each tool execution pool."""
+    return tool_scheduler.stats()
+
+
+@router.get("/v1/metrics/sandbox")
+async def sandbox_stats():
+    """Setup and total latency of recent commands for each sandbox mode."""
+    return {"mode": sandbox_runner.mode, "timings": sandbox_runner.stats.snapshot()}
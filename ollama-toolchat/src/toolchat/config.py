@@ -20,10 +20,39 @@ class Settings(BaseSettings):
     read_roots: str = f"{_HOME},/mnt/local,/mnt/server"
     write_roots: str = f"{_HOME}/Pictures/Inbox,{_HOME}/Pictures/Organized"
     sandbox_mode: str = "none"
+    bwrap_warm: bool = False
+    sandbox_helper_python: str = "/usr/bin/python3"
+    systemd_pool_size: int = 0
     allow_network: bool = False
     log_level: str = "INFO"
     audit_db_path: str = "ollama-toolchat-audit.db"
     chat_db_path: str = "ollama-toolchat-chat.db"
+    exif_cache_db_path: str = "ollama-toolchat-exif.db"
+    photo_workers: int = 0
+    photo_move_workers: int = 4
+    photo_hash_db_path: str = "ollama-toolchat-phash.db"
+    health_sample_interval: float = 2.0
+    health_sample_history: int = 300
+    metrics_db_path: str = "ollama-toolchat-metrics.db"
+    metrics_enabled: bool = True
+    nvml_library: str = ""
+    stream_tool_output: bool = True
+    tool_cache_max_entries: int = 256
+    plan_ttl_sec: float = 3600
+    plan_store_max_plans: int = 64
+    scheduler_quick_slots: int = 8
+    scheduler_cpu_slots: int = 2
+    scheduler_disk_scan_slots: int = 2
+    scheduler_write_slots: int = 2
+    scheduler_system_change_slots: int = 1
+    scheduler_shared_slots: int = 8
+    scheduler_quick_reserved_slots: int = 2
+    direct_answers: bool = True
+    summary_history_messages: int = 4
+    intent_router_enabled: bool = False
+    embedding_model: str = "nomic-embed-text"
+    intent_router_threshold: float = 0.8
+    embedding_cache_db_path: str = "ollama-toolchat-embeddings.db"
     
     @property
     def read_roots_list(self) -> List[str]:
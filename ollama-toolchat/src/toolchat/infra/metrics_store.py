@@ -0,0 +1,214 @@
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from ..config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# (bucket width in seconds, retention in seconds), finest first
+TIERS: List[Tuple[int, int]] = [
+    (10, 6 * 3600),
+    (60, 2 * 86400),
+    (3600, 90 * 86400),
+]
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+# Rows older than their tier's retention are pruned once per this many writes
+_PRUNE_EVERY = 300
+
+
+def parse_duration(text: str) -> int:
+    """Parse '90s', '30m', '2h', '7d' or '1w' (a bare number means seconds)."""
+    text = str(text).strip().lower()
+    unit = text[-1:] if text[-1:] in _DURATION_UNITS else "s"
+    number = text[:-1] if text[-1:] in _DURATION_UNITS else text
+    try:
+        value = float(number)
+    except ValueError:
+        raise ValueError(f"Invalid duration '{text}'. Use e.g. 30m, 2h or 7d")
+    if value < 0:
+        raise ValueError(f"Duration must not be negative: '{text}'")
+    return int(value * _DURATION_UNITS[unit])
+
+
+class MetricsStore:
+    """Downsampled time series of numeric host metrics.
+    
+    Every point is folded into one bucket per tier as (min, max, sum, count)
+    with an upsert, so the coarse tiers are maintained incrementally on
+    write and never need a separate rollup pass. Queries read the finest
+    tier that still covers the requested window.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(settings.metrics_db_path)
+        self._writes = 0
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._init_db()
+    
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # WAL lets API reads proceed while the sampler thread writes
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS metric_points (
+                resolution INTEGER NOT NULL,
+                metric TEXT NOT NULL,
+                bucket INTEGER NOT NULL,
+                min REAL NOT NULL,
+                max REAL NOT NULL,
+                sum REAL NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (resolution, metric, bucket)
+            ) WITHOUT ROWID
+        """)
+        
+        conn.commit()
+        conn.close()
+        logger.info(f"Initialized metrics store at {self.db_path}")
+    
+    def record(self, metrics: Dict[str, float], timestamp: Optional[float] = None) -> None:
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        rows = []
+        for resolution, _ in TIERS:
+            bucket = timestamp - timestamp % resolution
+            for metric, value in metrics.items():
+                if value is None or not math.isfinite(value):
+                    continue
+                rows.append((resolution, metric, bucket, value, value, value))
+        if not rows:
+            return
+        
+        with self._write_lock:
+            if self._writer is None:
+                # The sampler writes every few seconds, so keep one connection
+                # open: closing the last connection checkpoints and fsyncs the
+                # WAL, which would otherwise happen on every sample. Losing the
+                # last few samples on power loss is fine for telemetry.
+                self._writer = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._writer.execute("PRAGMA synchronous=NORMAL")
+            self._write(self._writer, rows, timestamp)
+    
+    def _write(self, conn: sqlite3.Connection, rows: List[tuple], timestamp: int) -> None:
+        cursor = conn.cursor()
+        
+        cursor.executemany(
+            """
+            INSERT INTO metric_points (resolution, metric, bucket, min, max, sum, count)
+            VALUES (?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT (resolution, metric, bucket) DO UPDATE SET
+                min = MIN(min, excluded.min),
+                max = MAX(max, excluded.max),
+                sum = sum + excluded.sum,
+                count = count + 1
+            """,
+            rows
+        )
+        
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 0:
+            self._prune(cursor, timestamp)
+        
+        conn.commit()
+    
+    def close(self) -> None:
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+    
+    def record_sample(self, sample: Dict[str, Any]) -> None:
+        """HealthSampler listener."""
+        self.record(sample.get("metrics", {}), sample.get("timestamp"))
+    
+    def _prune(self, cursor, now: int) -> None:
+        for resolution, retention in TIERS:
+            cursor.execute(
+                "DELETE FROM metric_points WHERE resolution = ? AND bucket < ?",
+                (resolution, now - retention)
+            )
+    
+    def list_metrics(self) -> List[str]:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "SELECT DISTINCT metric FROM metric_points WHERE resolution = ? ORDER BY metric",
+            (TIERS[-1][0],)
+        )
+        metrics = [row[0] for row in cursor.fetchall()]
+        
+        conn.close()
+        return metrics
+    
+    def _pick_resolution(self, start: float, now: float) -> int:
+        for resolution, retention in TIERS:
+            if start >= now - retention:
+                return resolution
+        return TIERS[-1][0]
+    
+    def query(
+        self,
+        metric: str,
+        start: float,
+        end: float,
+        max_points: int = 60,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Return min/avg/max over [start, end) plus a series of at most max_points buckets."""
+        now = now if now is not None else time.time()
+        resolution = self._pick_resolution(start, now)
+        # Widen buckets to a multiple of the tier resolution to honour max_points
+        step = resolution * max(1, math.ceil((end - start) / max(max_points, 1) / resolution))
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            """
+            SELECT (bucket / ?) * ? AS step_bucket, MIN(min), MAX(max), SUM(sum), SUM(count)
+            FROM metric_points
+            WHERE resolution = ? AND metric = ? AND bucket >= ? AND bucket < ?
+            GROUP BY step_bucket
+            ORDER BY step_bucket
+            """,
+            (step, step, resolution, metric, int(start) - int(start) % resolution, int(end))
+        )
+        rows = cursor.fetchall()
+        
+        conn.close()
+        
+        points = [
+            {
+                "timestamp": bucket,
+                "min": round(low, 3),
+                "avg": round(total / count, 3),
+                "max": round(high, 3),
+            }
+            for bucket, low, high, total, count in rows
+        ]
+        samples = sum(row[4] for row in rows)
+        
+        return {
+            "metric": metric,
+            "start": int(start),
+            "end": int(end),
+            "resolution_sec": resolution,
+            "step_sec": step,
+            "samples": samples,
+            "min": round(min(row[1] for row in rows), 3) if rows else None,
+            "avg": round(sum(row[3] for row in rows) / samples, 3) if samples else None,
+            "max": round(max(row[2] for row in rows), 3) if rows else None,
+            "points": points,
+        }
+
+
+metrics_store = MetricsStore()
@@ -0,0 +1,230 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import psutil
+from ..config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Processes kept per sample, ranked separately by CPU and by memory
+_TOP_PROCESSES = 25
+
+ProcessKey = Tuple[int, float]
+Collector = Callable[[], Dict[str, float]]
+Listener = Callable[[Dict[str, Any]], None]
+
+
+def _cpu_busy_total(times) -> Tuple[float, float]:
+    """Return (busy, total) seconds from a psutil.cpu_times() result."""
+    total = sum(times)
+    # On Linux guest time is already counted in user/nice
+    total -= getattr(times, "guest", 0.0) + getattr(times, "guest_nice", 0.0)
+    idle = times.idle + getattr(times, "iowait", 0.0)
+    return total - idle, total
+
+
+def _temperature_metrics() -> Dict[str, float]:
+    """Hottest current reading per sensor chip, e.g. {"temp.coretemp": 54.0}."""
+    if not hasattr(psutil, "sensors_temperatures"):
+        return {}
+    metrics = {}
+    for chip, readings in psutil.sensors_temperatures().items():
+        values = [r.current for r in readings if r.current is not None]
+        if values:
+            metrics[f"temp.{chip}"] = max(values)
+    return metrics
+
+
+class HealthSampler:
+    """Background thread sampling system and per-process CPU/memory usage.
+    
+    CPU figures are deltas between consecutive samples, so the first
+    sample after start() only establishes a baseline. Samples are kept in a
+    fixed-size ring buffer; readers get the latest one without blocking on
+    a measurement interval.
+    
+    Each sample also carries a flat ``metrics`` dict of numeric gauges.
+    Collectors add extra gauges (e.g. GPU) and listeners receive every
+    finished sample (e.g. the metrics store), both on the sampler thread.
+    """
+    
+    def __init__(self, interval: Optional[float] = None, history: Optional[int] = None):
+        self.interval = interval if interval is not None else settings.health_sample_interval
+        self._samples: deque = deque(maxlen=history or settings.health_sample_history)
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._prev_cpu: Optional[Tuple[float, float]] = None
+        self._prev_procs: Dict[ProcessKey, float] = {}
+        self._prev_time: Optional[float] = None
+        self._prev_wall: Optional[float] = None
+        self._prev_io: Dict[str, float] = {}
+        self._collectors: List[Collector] = []
+        self._listeners: List[Listener] = []
+    
+    def add_collector(self, collector: Collector) -> None:
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+    
+    def add_listener(self, listener: Listener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        with self._condition:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="health-sampler", daemon=True)
+            self._thread.start()
+        logger.info(f"Health sampler started (interval={self.interval}s)")
+    
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 5)
+        self._thread = None
+    
+    def _run(self) -> None:
+        self.sample()
+        # The first delta comes quickly so a cold start answers within a fraction of a second
+        wait = min(self.interval, 0.5)
+        while not self._stop.wait(wait):
+            try:
+                self.sample()
+            except Exception:
+                logger.error("Health sample failed", exc_info=True)
+            wait = self.interval
+    
+    def sample(self) -> Optional[Dict[str, Any]]:
+        """Take one sample; returns it, or None when it only set the baseline."""
+        now = time.monotonic()
+        wall = time.time()
+        busy, total = _cpu_busy_total(psutil.cpu_times())
+        memory = psutil.virtual_memory()
+        io = self._io_counters()
+        
+        proc_times: Dict[ProcessKey, float] = {}
+        processes = []
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_times', 'memory_info', 'create_time']):
+            pinfo = proc.info
+            if pinfo['cpu_times'] is None or pinfo['create_time'] is None:
+                continue
+            # create_time distinguishes a reused pid from the process seen last time
+            key = (pinfo['pid'], pinfo['create_time'])
+            proc_times[key] = pinfo['cpu_times'].user + pinfo['cpu_times'].system
+            processes.append((key, pinfo['name'], pinfo['memory_info'].rss if pinfo['memory_info'] else 0))
+        
+        prev_cpu, prev_procs, prev_time, prev_io = self._prev_cpu, self._prev_procs, self._prev_time, self._prev_io
+        prev_wall = self._prev_wall
+        self._prev_cpu, self._prev_procs, self._prev_time, self._prev_io = (busy, total), proc_times, now, io
+        self._prev_wall = wall
+        if prev_cpu is None:
+            return None
+        
+        elapsed = now - prev_time
+        total_delta = total - prev_cpu[1]
+        cpu_percent = (busy - prev_cpu[0]) / total_delta * 100 if total_delta > 0 else 0.0
+        
+        records = []
+        measured = []
+        for key, name, rss in processes:
+            record = {
+                'pid': key[0],
+                'name': name,
+                'cpu_percent': None,
+                'memory_percent': round(rss / memory.total * 100, 1),
+            }
+            records.append(record)
+            prev = prev_procs.get(key)
+            if prev is None:
+                # Only processes born since the last sample can be measured from zero;
+                # one that was missed last time would report its whole lifetime
+                if key[1] < prev_wall:
+                    continue
+                prev = 0.0
+            delta = proc_times[key] - prev
+            record['cpu_percent'] = round(max(delta, 0.0) / elapsed * 100, 1) if elapsed > 0 else 0.0
+            measured.append(record)
+        
+        top_cpu = sorted(measured, key=lambda x: x['cpu_percent'], reverse=True)[:_TOP_PROCESSES]
+        top_memory = sorted(records, key=lambda x: x['memory_percent'], reverse=True)[:_TOP_PROCESSES]
+        
+        cpu_percent = round(max(0.0, min(cpu_percent, 100.0)), 1)
+        metrics = {
+            "cpu.percent": cpu_percent,
+            "memory.percent": memory.percent,
+            "memory.used_gb": round(memory.used / (1024**3), 3),
+            "swap.percent": psutil.swap_memory().percent,
+            "load.1m": psutil.getloadavg()[0],
+        }
+        for name, value in io.items():
+            if name in prev_io and elapsed > 0:
+                # Counters can wrap or reset (e.g. an interface going away)
+                metrics[f"{name}_per_sec"] = round(max(value - prev_io[name], 0) / elapsed, 1)
+        for collector in [_temperature_metrics, *self._collectors]:
+            try:
+                metrics.update(collector())
+            except Exception as e:
+                logger.debug(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        
+        sample = {
+            "timestamp": time.time(),
+            "interval_sec": round(elapsed, 3),
+            "cpu_percent": cpu_percent,
+            "memory_percent": round(memory.percent, 1),
+            "memory_used_gb": round(memory.used / (1024**3), 2),
+            "memory_total_gb": round(memory.total / (1024**3), 2),
+            "process_count": len(records),
+            "top_cpu_processes": top_cpu,
+            "top_memory_processes": top_memory,
+            "metrics": metrics,
+        }
+        with self._condition:
+            self._samples.append(sample)
+            self._condition.notify_all()
+        
+        for listener in self._listeners:
+            try:
+                listener(sample)
+            except Exception:
+                logger.error("Health sample listener failed", exc_info=True)
+        return sample
+    
+    def _io_counters(self) -> Dict[str, float]:
+        counters = {}
+        disk = psutil.disk_io_counters()
+        if disk is not None:
+            counters["disk.read_bytes"] = disk.read_bytes
+            counters["disk.write_bytes"] = disk.write_bytes
+        net = psutil.net_io_counters()
+        if net is not None:
+            counters["net.recv_bytes"] = net.bytes_recv
+            counters["net.sent_bytes"] = net.bytes_sent
+        return counters
+    
+    def latest(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """Return the newest sample, starting the sampler and waiting for one if needed."""
+        with self._condition:
+            if self._samples:
+                return self._samples[-1]
+        if not self.running:
+            self.start()
+        with self._condition:
+            self._condition.wait_for(lambda: bool(self._samples), timeout=timeout)
+            return self._samples[-1] if self._samples else None
+    
+    def history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._condition:
+            samples = list(self._samples)
+        return samples[-limit:] if limit else samples
+
+
+health_sampler = HealthSampler()
@@ -1,18 +1,159 @@
+import asyncio
+import codecs
+import itertools
+import os
+import selectors
+import signal
 import subprocess
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Dict, Any, Tuple
 from ..config import settings
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
+CHUNK_SIZE = 65536
+
 
 class SandboxError(Exception):
     pass
 
 
+def _failure(message: str) -> Dict[str, Any]:
+    return {
+        "ok": False,
+        "exit_code": -1,
+        "stdout": "",
+        "stderr": message,
+    }
+
+
+def _kill_process_group(pid: int) -> None:
+    """Kill a child started with start_new_session=True and everything it spawned."""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class _CappedOutput:
+    """Collects a stream up to ``limit`` bytes, decoding at UTF-8 character boundaries."""
+    
+    def __init__(self, limit: int, on_text: Optional[Callable[[str], None]] = None):
+        self.limit = limit
+        self.on_text = on_text
+        self.data = bytearray()
+        self.truncated = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    
+    def feed(self, chunk: bytes) -> bool:
+        """Append a chunk; returns True when this chunk reached the cap."""
+        if self.truncated:
+            return False
+        room = self.limit - len(self.data)
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            self.truncated = True
+        self.data += chunk
+        if self.on_text is not None and chunk:
+            # The incremental decoder holds back a split multi-byte character
+            text = self._decoder.decode(chunk)
+            if text:
+                self.on_text(text)
+        return self.truncated
+    
+    def text(self) -> str:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        # A cut-off trailing character is dropped rather than replaced
+        return decoder.decode(bytes(self.data), final=not self.truncated)
+
+
+def _result(
+    command: List[str],
+    returncode: int,
+    stdout: _CappedOutput,
+    stderr: _CappedOutput,
+    spawned_at: Optional[float] = None,
+) -> Dict[str, Any]:
+    if stdout.truncated:
+        # Killed on purpose once the cap was reached; what was read is valid
+        logger.info(f"Output of {command[0]} truncated at {stdout.limit} bytes")
+    result = {
+        "ok": returncode == 0 or stdout.truncated,
+        "exit_code": returncode,
+        "stdout": stdout.text(),
+        "stderr": stderr.text(),
+        "truncated": stdout.truncated,
+    }
+    if spawned_at is not None:
+        # Consumed by SandboxRunner to time the setup of each mode
+        result["spawned_at"] = spawned_at
+    return result
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
+
+
+class SandboxStats:
+    """Rolling timings of recent commands per sandbox mode.
+    
+    ``setup`` runs from the call until the command (or the wrapper that
+    builds its sandbox) has been started; ``total`` until its result is in.
+    Cold bwrap and systemd build the namespace or unit inside the wrapper,
+    so that part of their cost appears in ``total`` only.
+    """
+    
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._setup: Dict[str, Deque[float]] = {}
+        self._total: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, mode: str, setup_ms: Optional[float], total_ms: float) -> None:
+        with self._lock:
+            self._counts[mode] = self._counts.get(mode, 0) + 1
+            self._total.setdefault(mode, deque(maxlen=self.window)).append(total_ms)
+            if setup_ms is not None:
+                self._setup.setdefault(mode, deque(maxlen=self.window)).append(setup_ms)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            report = {}
+            for mode, count in self._counts.items():
+                total = sorted(self._total[mode])
+                setup = sorted(self._setup.get(mode, ()))
+                report[mode] = {
+                    "commands": count,
+                    "total_p50_ms": _percentile(total, 0.5),
+                    "total_p95_ms": _percentile(total, 0.95),
+                    "setup_p50_ms": _percentile(setup, 0.5) if setup else None,
+                    "setup_p95_ms": _percentile(setup, 0.95) if setup else None,
+                }
+            return report
+
+
 class SandboxRunner:
-    def __init__(self, mode: str = "none"):
+    def __init__(self, mode: str = "none", warm: bool = False, systemd_pool_size: int = 0):
         self.mode = mode
+        # bwrap only: reuse one helper per namespace layout instead of a new sandbox per command
+        self.warm = warm and mode == "bwrap"
+        # systemd only: share this many long-lived scopes instead of one scope per command
+        self.systemd_pool_size = systemd_pool_size if mode == "systemd" else 0
+        self.stats = SandboxStats()
+        self._helpers: Dict[Tuple[Any, ...], Any] = {}
+        self._helpers_lock = threading.Lock()
+        self._next_slot = itertools.count()
+    
+    def _record(self, mode: str, begun: float, result: Dict[str, Any]) -> Dict[str, Any]:
+        finished = time.monotonic()
+        spawned_at = result.pop("spawned_at", None)
+        setup_ms = (spawned_at - begun) * 1000 if spawned_at is not None else None
+        self.stats.record(mode, setup_ms, (finished - begun) * 1000)
+        return result
     
     def run(
         self,
@@ -24,13 +165,112 @@ class SandboxRunner:
         read_paths: Optional[List[str]] = None,
         write_paths: Optional[List[str]] = None,
         max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
+        begun = time.monotonic()
+        helper = self._helper(allow_network, read_paths, write_paths)
+        if helper is not None:
+            try:
+                result = helper.run(command, cwd, timeout, env, max_output_bytes, on_output)
+                return self._record(self._pooled_mode, begun, result)
+            except (OSError, SandboxError) as e:
+                logger.warning(f"Warm sandbox unavailable, using a fresh one: {e}")
+        
+        command, cwd = self._wrap(command, cwd, timeout, allow_network, read_paths, write_paths)
+        result = self._run_direct(command, cwd, timeout, env, max_output_bytes, on_output)
+        return self._record(self.mode, begun, result)
+    
+    async def run_async(
+        self,
+        command: List[str],
+        cwd: Optional[str] = None,
+        timeout: int = 30,
+        env: Optional[Dict[str, str]] = None,
+        allow_network: bool = False,
+        read_paths: Optional[List[str]] = None,
+        write_paths: Optional[List[str]] = None,
+        max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Like run(), but awaits the child on the event loop instead of blocking it."""
+        begun = time.monotonic()
+        helper = self._helper(allow_network, read_paths, write_paths)
+        if helper is not None:
+            try:
+                if not helper.alive:
+                    await asyncio.to_thread(helper.start)
+                result = await helper.run_async(command, cwd, timeout, env, max_output_bytes, on_output)
+                return self._record(self._pooled_mode, begun, result)
+            except (OSError, SandboxError) as e:
+                logger.warning(f"Warm sandbox unavailable, using a fresh one: {e}")
+        
+        command, cwd = self._wrap(command, cwd, timeout, allow_network, read_paths, write_paths)
+        result = await self._run_direct_async(command, cwd, timeout, env, max_output_bytes, on_output)
+        return self._record(self.mode, begun, result)
+    
+    def _helper(
+        self,
+        allow_network: bool,
+        read_paths: Optional[List[str]],
+        write_paths: Optional[List[str]],
+    ):
+        """The long-lived helper to run this command in, created on first use.
+        
+        Warm bwrap keeps one helper per namespace layout. The systemd pool
+        keeps ``systemd_pool_size`` helpers per layout, each in its own
+        scope, and hands commands to them in turn; commands sharing a scope
+        share its memory and CPU limits.
+        """
+        if self.warm:
+            slot = 0
+        elif self.systemd_pool_size > 0:
+            slot = next(self._next_slot) % self.systemd_pool_size
+        else:
+            return None
+        from .warm_sandbox import WarmSandbox
+        
+        key = (allow_network, tuple(read_paths or ()), tuple(write_paths or ()), slot)
+        with self._helpers_lock:
+            helper = self._helpers.get(key)
+            if helper is None:
+                def wrap(helper_argv: List[str], runtime_dir: str) -> List[str]:
+                    writable = list(write_paths or []) + [runtime_dir]
+                    if self.mode == "systemd":
+                        return self._systemd_command(helper_argv, 5, allow_network, writable)
+                    command = self._bwrap_command(helper_argv, None, allow_network, read_paths, writable)
+                    # Tie the helper's lifetime to ours
+                    command.insert(1, "--die-with-parent")
+                    return command
+                
+                helper = self._helpers[key] = WarmSandbox(wrap, python=settings.sandbox_helper_python)
+        return helper
+    
+    @property
+    def _pooled_mode(self) -> str:
+        return "bwrap_warm" if self.warm else "systemd_pool"
+    
+    def close(self) -> None:
+        with self._helpers_lock:
+            helpers = list(self._helpers.values())
+            self._helpers.clear()
+        for helper in helpers:
+            helper.close()
+    
+    def _wrap(
+        self,
+        command: List[str],
+        cwd: Optional[str],
+        timeout: int,
+        allow_network: bool,
+        read_paths: Optional[List[str]],
+        write_paths: Optional[List[str]],
+    ) -> Tuple[List[str], Optional[str]]:
         if self.mode == "systemd":
-            return self._run_systemd(command, cwd, timeout, env, allow_network, read_paths, write_paths, max_output_bytes)
+            return self._systemd_command(command, timeout, allow_network, write_paths), cwd
         elif self.mode == "bwrap":
-            return self._run_bwrap(command, cwd, timeout, env, allow_network, read_paths, write_paths, max_output_bytes)
-        else:
-            return self._run_direct(command, cwd, timeout, env, max_output_bytes)
+            # bwrap changes directory inside the sandbox itself
+            return self._bwrap_command(command, cwd, allow_network, read_paths, write_paths), None
+        return command, cwd
     
     def _run_direct(
         self,
@@ -39,51 +279,118 @@ class SandboxRunner:
         timeout: int,
         env: Optional[Dict[str, str]],
         max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         try:
-            result = subprocess.run(
+            process = subprocess.Popen(
                 command,
                 cwd=cwd,
-                timeout=timeout,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 env=env,
+                start_new_session=True,
             )
-            
-            return {
-                "ok": result.returncode == 0,
-                "exit_code": result.returncode,
-                "stdout": result.stdout[:max_output_bytes],
-                "stderr": result.stderr[:max_output_bytes],
-            }
+        except Exception as e:
+            logger.error(f"Command failed: {command}", exc_info=True)
+            return _failure(str(e))
+        spawned_at = time.monotonic()
+        
+        stdout = _CappedOutput(max_output_bytes, on_output)
+        stderr = _CappedOutput(max_output_bytes)
+        deadline = time.monotonic() + timeout
+        
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(process.stdout, selectors.EVENT_READ, stdout)
+                selector.register(process.stderr, selectors.EVENT_READ, stderr)
+                while selector.get_map():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise subprocess.TimeoutExpired(command, timeout)
+                    for key, _ in selector.select(remaining):
+                        chunk = os.read(key.fd, CHUNK_SIZE)
+                        if not chunk:
+                            selector.unregister(key.fileobj)
+                        elif key.data.feed(chunk) and key.data is stdout:
+                            # Enough output: stop the command instead of buffering the rest
+                            _kill_process_group(process.pid)
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
         except subprocess.TimeoutExpired:
+            _kill_process_group(process.pid)
+            process.wait()
             logger.error(f"Command timed out: {command}")
-            return {
-                "ok": False,
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": f"Command timed out after {timeout}s",
-            }
+            return _failure(f"Command timed out after {timeout}s")
         except Exception as e:
+            _kill_process_group(process.pid)
+            process.wait()
             logger.error(f"Command failed: {command}", exc_info=True)
-            return {
-                "ok": False,
-                "exit_code": -1,
-                "stdout": "",
-                "stderr": str(e),
-            }
-    
-    def _run_systemd(
+            return _failure(str(e))
+        finally:
+            process.stdout.close()
+            process.stderr.close()
+        
+        return _result(command, process.returncode, stdout, stderr, spawned_at)
+    
+    async def _run_direct_async(
         self,
         command: List[str],
         cwd: Optional[str],
         timeout: int,
         env: Optional[Dict[str, str]],
-        allow_network: bool,
-        read_paths: Optional[List[str]],
-        write_paths: Optional[List[str]],
         max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                cwd=cwd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                start_new_session=True,
+            )
+        except Exception as e:
+            logger.error(f"Command failed: {command}", exc_info=True)
+            return _failure(str(e))
+        spawned_at = time.monotonic()
+        
+        stdout = _CappedOutput(max_output_bytes, on_output)
+        stderr = _CappedOutput(max_output_bytes)
+        
+        async def pump(stream: asyncio.StreamReader, output: _CappedOutput) -> None:
+            while True:
+                chunk = await stream.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                if output.feed(chunk) and output is stdout:
+                    # Enough output: stop the command instead of buffering the rest
+                    _kill_process_group(process.pid)
+        
+        async def collect() -> None:
+            await asyncio.gather(pump(process.stdout, stdout), pump(process.stderr, stderr))
+            await process.wait()
+        
+        try:
+            await asyncio.wait_for(collect(), timeout)
+        except asyncio.TimeoutError:
+            _kill_process_group(process.pid)
+            await process.wait()
+            logger.error(f"Command timed out: {command}")
+            return _failure(f"Command timed out after {timeout}s")
+        except asyncio.CancelledError:
+            # Client went away; do not leave the command running
+            _kill_process_group(process.pid)
+            raise
+        
+        return _result(command, process.returncode, stdout, stderr, spawned_at)
+    
+    def _systemd_command(
+        self,
+        command: List[str],
+        timeout: int,
+        allow_network: bool,
+        write_paths: Optional[List[str]],
+    ) -> List[str]:
         systemd_cmd = [
             "systemd-run",
             "--user",
@@ -108,19 +415,16 @@ class SandboxRunner:
         
         systemd_cmd.extend(command)
         
-        return self._run_direct(systemd_cmd, cwd, timeout, env, max_output_bytes)
+        return systemd_cmd
     
-    def _run_bwrap(
+    def _bwrap_command(
         self,
         command: List[str],
         cwd: Optional[str],
-        timeout: int,
-        env: Optional[Dict[str, str]],
         allow_network: bool,
         read_paths: Optional[List[str]],
         write_paths: Optional[List[str]],
-        max_output_bytes: int = 10000,
-    ) -> Dict[str, Any]:
+    ) -> List[str]:
         bwrap_cmd = [
             "bwrap",
             "--ro-bind", "/usr", "/usr",
@@ -151,7 +455,11 @@ class SandboxRunner:
         bwrap_cmd.append("--")
         bwrap_cmd.extend(command)
         
-        return self._run_direct(bwrap_cmd, None, timeout, env, max_output_bytes)
+        return bwrap_cmd
 
 
-sandbox_runner = SandboxRunner(mode=settings.sandbox_mode)
+sandbox_runner = SandboxRunner(
+    mode=settings.sandbox_mode,
+    warm=settings.bwrap_warm,
+    systemd_pool_size=settings.systemd_pool_size,
+)
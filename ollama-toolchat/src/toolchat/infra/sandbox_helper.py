@@ -0,0 +1,232 @@
+"""Command server that runs inside a long-lived sandbox.
+
+Started by WarmSandbox as ``python3 -c <this source> <socket path>``, so it
+must only use the standard library. Each connection carries one request:
+a JSON line {"argv", "cwd", "env"} sent together with the write ends of the
+caller's stdout and stderr pipes (SCM_RIGHTS). The helper replies with
+{"pid": ...} or {"error": ...}, then {"exit_code": ...} once the command
+exits. Half-closing the connection before then kills the command's process
+group. The helper exits when its stdin closes.
+
+Commands share the helper's namespace, so each run is cleaned up as a cold
+sandbox would be on exit: the helper is a child subreaper, every command
+gets a private TMPDIR, and when a command ends its process group, any
+process still carrying its run marker and (once no command is running) any
+orphan left with the helper are killed. Being a subreaper, the helper has
+every leftover among its descendants, so only that tree is searched, never
+the whole host /proc.
+"""
+
+import ctypes
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import uuid
+
+PR_SET_CHILD_SUBREAPER = 36
+RUN_MARKER = "TOOLCHAT_SANDBOX_RUN"
+
+# pids of commands still running; guarded with their start so a sweep never sees a half-started run
+_active = set()
+_lock = threading.Lock()
+# /proc/<pid>/task/<tid>/children needs CONFIG_PROC_CHILDREN; without it descendants come from a /proc scan
+_HAS_CHILDREN = os.path.exists("/proc/thread-self/children")
+
+
+def _send(conn, message):
+    conn.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _kill(pid, group=False):
+    try:
+        (os.killpg if group else os.kill)(pid, signal.SIGKILL)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def _kill_when_released(conn, process):
+    try:
+        conn.recv(1)
+    except OSError:
+        pass
+    if process.poll() is None:
+        _kill(process.pid, group=True)
+
+
+def _stat(pid):
+    """(ppid, session) of a process, or None once it is gone."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses; fields resume after the last ")"
+    fields = stat[stat.rfind(b")") + 2:].split()
+    return int(fields[1]), int(fields[3])
+
+
+def _children(pid):
+    children = []
+    try:
+        tids = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return children
+    # Children belong to the thread that forked them
+    for tid in tids:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children", "rb") as f:
+                children.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return children
+
+
+def _processes():
+    """Yield (pid, ppid, session) for every process visible in /proc."""
+    for name in os.listdir("/proc"):
+        if name.isdigit():
+            info = _stat(name)
+            if info is not None:
+                yield (int(name),) + info
+
+
+def _descendants(root):
+    """Return (pid, ppid, session) for every process below root."""
+    if _HAS_CHILDREN:
+        found, stack = [], [root]
+        while stack:
+            for child in _children(stack.pop()):
+                info = _stat(child)
+                if info is not None:
+                    found.append((child,) + info)
+                    stack.append(child)
+        return found
+    
+    by_parent = {}
+    for pid, ppid, session in _processes():
+        by_parent.setdefault(ppid, []).append((pid, ppid, session))
+    found, stack = [], [root]
+    while stack:
+        for entry in by_parent.get(stack.pop(), ()):
+            found.append(entry)
+            stack.append(entry[0])
+    return found
+
+
+def _has_marker(pid, marker):
+    try:
+        with open(f"/proc/{pid}/environ", "rb") as f:
+            return marker in f.read().split(b"\0")
+    except OSError:
+        return False
+
+
+def _clean_up_run(process, marker, tmpdir):
+    """Kill what the finished command left behind and remove its TMPDIR."""
+    # Background children that stayed in the command's process group
+    _kill(process.pid, group=True)
+    me = os.getpid()
+    with _lock:
+        _active.discard(process.pid)
+        for pid, ppid, session in _descendants(me):
+            # Each command leads its own session, so the run's leftovers are
+            # either still in its session or left it with setsid(), which
+            # keeps the inherited environment. Only those read environ.
+            # Orphans that were re-parented to us are swept once we are idle.
+            if (
+                session == process.pid
+                or (ppid == me and not _active)
+                or (session not in _active and _has_marker(pid, marker))
+            ):
+                if _kill(pid) and ppid == me:
+                    try:
+                        os.waitpid(pid, 0)
+                    except ChildProcessError:
+                        pass
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def _handle(conn):
+    fds = []
+    try:
+        data, fds, _, _ = socket.recv_fds(conn, 65536, 2)
+        while not data.endswith(b"\n"):
+            more = conn.recv(65536)
+            if not more:
+                return
+            data += more
+        request = json.loads(data)
+        marker = uuid.uuid4().hex
+        tmpdir = tempfile.mkdtemp(prefix="run-")
+        env = dict(request.get("env") or os.environ)
+        env.update({RUN_MARKER: marker, "TMPDIR": tmpdir})
+        try:
+            with _lock:
+                process = subprocess.Popen(
+                    request["argv"],
+                    cwd=request.get("cwd"),
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=fds[0],
+                    stderr=fds[1],
+                    start_new_session=True,
+                )
+                _active.add(process.pid)
+        except Exception as e:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            _send(conn, {"error": str(e)})
+            return
+        finally:
+            for fd in fds:
+                os.close(fd)
+            fds = []
+        
+        _send(conn, {"pid": process.pid})
+        threading.Thread(target=_kill_when_released, args=(conn, process), daemon=True).start()
+        exit_code = process.wait()
+        _clean_up_run(process, f"{RUN_MARKER}={marker}".encode(), tmpdir)
+        _send(conn, {"exit_code": exit_code})
+    except Exception:
+        pass
+    finally:
+        for fd in fds:
+            os.close(fd)
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        conn.close()
+
+
+def _exit_with_parent():
+    sys.stdin.buffer.read()
+    os._exit(0)
+
+
+def main(socket_path):
+    try:
+        # Orphans of commands are re-parented to us rather than escaping
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+    except (OSError, AttributeError):
+        pass
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen(64)
+    threading.Thread(target=_exit_with_parent, daemon=True).start()
+    sys.stdout.write("ready\n")
+    sys.stdout.flush()
+    while True:
+        conn, _ = server.accept()
+        threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
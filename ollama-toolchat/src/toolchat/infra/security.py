@@ -1,5 +1,7 @@
+import threading
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from ..config import settings
 from .logging import get_logger
 
@@ -10,8 +12,45 @@ class PathSecurityError(Exception):
     pass
 
 
+class PathTrie:
+    """Set of directory prefixes stored as a trie over path components.
+    
+    covers() answers "is this path inside any of the prefixes" with one walk
+    down the path's components, the same test as trying relative_to()
+    against every prefix.
+    """
+    
+    _END = object()
+    
+    def __init__(self, prefixes: List[Path]):
+        self._root: Dict[Any, Any] = {}
+        for prefix in prefixes:
+            node = self._root
+            for part in prefix.parts:
+                node = node.setdefault(part, {})
+            node[self._END] = True
+    
+    def covers(self, path: Path) -> bool:
+        node = self._root
+        if self._END in node:
+            return True
+        for part in path.parts:
+            node = node.get(part)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+
 class PathValidator:
-    def __init__(self, read_roots: List[str], write_roots: List[str]):
+    def __init__(
+        self,
+        read_roots: List[str],
+        write_roots: List[str],
+        resolve_ttl: float = 2.0,
+        resolve_cache_size: int = 1024,
+    ):
         self.read_roots = [Path(r).resolve() for r in read_roots]
         self.write_roots = [Path(w).resolve() for w in write_roots]
         
@@ -23,76 +62,75 @@ class PathValidator:
             Path("/usr"),
             Path.home() / ".ssh",
         ]
+        
+        self._read_trie = PathTrie(self.read_roots)
+        self._write_trie = PathTrie(self.write_roots)
+        self._denied_trie = PathTrie(self.denied_paths)
+        
+        # Resolving walks every component with lstat/readlink; the same few
+        # paths are checked over and over, so keep results briefly
+        self.resolve_ttl = resolve_ttl
+        self.resolve_cache_size = resolve_cache_size
+        self._resolved: Dict[str, Tuple[float, Path]] = {}
+        self._resolved_lock = threading.Lock()
     
     def normalize_path(self, path: str) -> Path:
+        now = time.monotonic()
+        with self._resolved_lock:
+            cached = self._resolved.get(path)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        
         try:
-            p = Path(path).expanduser()
-            if p.exists():
-                p = p.resolve()
-            else:
-                p = p.resolve(strict=False)
-            return p
+            p = Path(path).expanduser().resolve()
         except Exception as e:
             raise PathSecurityError(f"Invalid path: {path}") from e
+        
+        with self._resolved_lock:
+            if len(self._resolved) >= self.resolve_cache_size:
+                self._resolved = {k: v for k, v in self._resolved.items() if v[0] > now}
+                if len(self._resolved) >= self.resolve_cache_size:
+                    self._resolved.clear()
+            self._resolved[path] = (now + self.resolve_ttl, p)
+        return p
     
     def is_denied(self, path: Path) -> bool:
-        for denied in self.denied_paths:
-            try:
-                path.relative_to(denied)
-                return True
-            except ValueError:
-                continue
-        return False
+        return self._denied_trie.covers(path)
     
-    def can_read(self, path: str) -> bool:
+    def _allowed(self, path: str, roots: PathTrie, access: str) -> Optional[Path]:
+        """The normalized path if ``access`` to it is allowed, else None."""
         try:
             normalized = self.normalize_path(path)
-            
-            if self.is_denied(normalized):
-                logger.warning(f"Denied read access to: {normalized}")
-                return False
-            
-            for root in self.read_roots:
-                try:
-                    normalized.relative_to(root)
-                    return True
-                except ValueError:
-                    continue
-            
-            logger.warning(f"Path not in read roots: {normalized}")
-            return False
         except PathSecurityError:
-            return False
+            return None
+        
+        if self.is_denied(normalized):
+            logger.warning(f"Denied {access} access to: {normalized}")
+            return None
+        
+        if not roots.covers(normalized):
+            logger.warning(f"Path not in {access} roots: {normalized}")
+            return None
+        
+        return normalized
+    
+    def can_read(self, path: str) -> bool:
+        return self._allowed(path, self._read_trie, "read") is not None
     
     def can_write(self, path: str) -> bool:
-        try:
-            normalized = self.normalize_path(path)
-            
-            if self.is_denied(normalized):
-                logger.warning(f"Denied write access to: {normalized}")
-                return False
-            
-            for root in self.write_roots:
-                try:
-                    normalized.relative_to(root)
-                    return True
-                except ValueError:
-                    continue
-            
-            logger.warning(f"Path not in write roots: {normalized}")
-            return False
-        except PathSecurityError:
-            return False
+        return self._allowed(path, self._write_trie, "write") is not None
     
     def validate_read(self, path: str) -> Path:
-        if not self.can_read(path):
+        normalized = self._allowed(path, self._read_trie, "read")
+        if normalized is None:
             raise PathSecurityError(f"Read access denied: {path}")
-        return self.normalize_path(path)
+        return normalized
     
     def validate_write(self, path: str) -> Path:
-        if not self.can_write(path):
+        normalized = self._allowed(path, self._write_trie, "write")
+        if normalized is None:
             raise PathSecurityError(f"Write access denied: {path}")
-        return self.normalize_path(path)
+        return normalized
 
 
 path_validator = PathValidator(
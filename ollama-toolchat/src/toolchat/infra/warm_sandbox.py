@@ -0,0 +1,280 @@
+import asyncio
+import json
+import os
+import selectors
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .sandbox import CHUNK_SIZE, SandboxError, _CappedOutput, _failure, _kill_process_group, _result
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+HELPER_SOURCE = Path(__file__).with_name("sandbox_helper.py").read_text(encoding="utf-8")
+
+
+def _exit_code(control: bytes) -> Tuple[Optional[int], Optional[str]]:
+    """Pull (exit_code, error) out of the helper's reply lines."""
+    exit_code, error = None, None
+    for line in control.splitlines():
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if "exit_code" in message:
+            exit_code = message["exit_code"]
+        elif "error" in message:
+            error = message["error"]
+    return exit_code, error
+
+
+class WarmSandbox:
+    """A helper process kept running inside one prepared sandbox.
+    
+    Building a bwrap namespace with its bind mounts costs more than most of
+    the commands run in it. The helper is started once, through ``wrap``,
+    and then forks each command inside the existing namespace on request
+    over a Unix socket in a private runtime directory. Output goes straight
+    to pipes owned by the caller, so capping and streaming work as for a
+    direct child.
+    """
+    
+    def __init__(
+        self,
+        wrap: Callable[[List[str], str], List[str]],
+        python: str = "/usr/bin/python3",
+        start_timeout: float = 5.0,
+    ):
+        # wrap(helper_argv, runtime_dir) returns the full command that starts
+        # the helper; runtime_dir must be writable inside the sandbox
+        self.wrap = wrap
+        self.python = python
+        self.start_timeout = start_timeout
+        self.process: Optional[subprocess.Popen] = None
+        self.runtime_dir: Optional[str] = None
+        self.socket_path: Optional[str] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+    
+    def start(self) -> None:
+        with self._lock:
+            if self.alive:
+                return
+            self._cleanup()
+            self.runtime_dir = tempfile.mkdtemp(prefix="toolchat-sandbox-")
+            self.socket_path = os.path.join(self.runtime_dir, "helper.sock")
+            command = self.wrap([self.python, "-c", HELPER_SOURCE, self.socket_path], self.runtime_dir)
+            started = time.monotonic()
+            try:
+                self.process = subprocess.Popen(
+                    command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    start_new_session=True,
+                )
+            except OSError:
+                self._cleanup()
+                raise
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.process.stdout, selectors.EVENT_READ)
+                ready = selector.select(self.start_timeout) and self.process.stdout.readline() == b"ready\n"
+            if not ready:
+                self._cleanup()
+                raise SandboxError("Sandbox helper did not start")
+            logger.info(f"Started warm sandbox helper in {(time.monotonic() - started) * 1000:.1f}ms")
+    
+    def close(self) -> None:
+        with self._lock:
+            self._cleanup()
+    
+    def _cleanup(self) -> None:
+        if self.process is not None:
+            # Closing stdin tells the helper to exit
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                _kill_process_group(self.process.pid)
+                self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+        if self.runtime_dir:
+            shutil.rmtree(self.runtime_dir, ignore_errors=True)
+            self.runtime_dir = None
+    
+    def _submit(
+        self,
+        command: List[str],
+        cwd: Optional[str],
+        env: Optional[Dict[str, str]],
+    ) -> Tuple[socket.socket, int, int]:
+        """Hand a command to the helper; returns the control socket and the read ends of stdout/stderr."""
+        if not self.alive:
+            self.start()
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.connect(self.socket_path)
+            request = json.dumps({"argv": command, "cwd": cwd, "env": env}).encode() + b"\n"
+            socket.send_fds(conn, [request], [out_w, err_w])
+        except OSError:
+            conn.close()
+            os.close(out_r)
+            os.close(err_r)
+            raise
+        finally:
+            os.close(out_w)
+            os.close(err_w)
+        return conn, out_r, err_r
+    
+    def _finish(
+        self,
+        command: List[str],
+        control: bytes,
+        stdout: _CappedOutput,
+        stderr: _CappedOutput,
+        spawned_at: Optional[float],
+    ) -> Dict[str, Any]:
+        exit_code, error = _exit_code(control)
+        if error is not None:
+            logger.error(f"Command failed: {command}: {error}")
+            return _failure(error)
+        if exit_code is None:
+            logger.error(f"Sandbox helper lost command: {command}")
+            return _failure("Sandbox helper exited unexpectedly")
+        return _result(command, exit_code, stdout, stderr, spawned_at)
+    
+    def run(
+        self,
+        command: List[str],
+        cwd: Optional[str] = None,
+        timeout: int = 30,
+        env: Optional[Dict[str, str]] = None,
+        max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Run a command in the sandbox; raises OSError/SandboxError only if it could not be submitted."""
+        conn, out_r, err_r = self._submit(command, cwd, env)
+        stdout = _CappedOutput(max_output_bytes, on_output)
+        stderr = _CappedOutput(max_output_bytes)
+        control = bytearray()
+        spawned_at = None
+        deadline = time.monotonic() + timeout
+        
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(out_r, selectors.EVENT_READ, stdout)
+                selector.register(err_r, selectors.EVENT_READ, stderr)
+                selector.register(conn, selectors.EVENT_READ, control)
+                while selector.get_map():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        conn.shutdown(socket.SHUT_WR)
+                        logger.error(f"Command timed out: {command}")
+                        return _failure(f"Command timed out after {timeout}s")
+                    for key, _ in selector.select(remaining):
+                        if key.data is control:
+                            chunk = conn.recv(CHUNK_SIZE)
+                            control += chunk
+                            if spawned_at is None and b"\n" in control:
+                                # First reply: the helper has started the command
+                                spawned_at = time.monotonic()
+                        else:
+                            chunk = os.read(key.fd, CHUNK_SIZE)
+                            if chunk and key.data.feed(chunk) and key.data is stdout:
+                                # Half-closing asks the helper to kill the command
+                                conn.shutdown(socket.SHUT_WR)
+                        if not chunk:
+                            selector.unregister(key.fileobj)
+        except OSError as e:
+            logger.error(f"Command failed: {command}", exc_info=True)
+            return _failure(str(e))
+        finally:
+            conn.close()
+            os.close(out_r)
+            os.close(err_r)
+        
+        return self._finish(command, bytes(control), stdout, stderr, spawned_at)
+    
+    async def run_async(
+        self,
+        command: List[str],
+        cwd: Optional[str] = None,
+        timeout: int = 30,
+        env: Optional[Dict[str, str]] = None,
+        max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Like run(), but awaits the command on the event loop."""
+        conn, out_r, err_r = self._submit(command, cwd, env)
+        loop = asyncio.get_running_loop()
+        stdout = _CappedOutput(max_output_bytes, on_output)
+        stderr = _CappedOutput(max_output_bytes)
+        transports = []
+        spawned_at = None
+        
+        async def open_pipe(fd: int) -> asyncio.StreamReader:
+            reader = asyncio.StreamReader()
+            transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, "rb", buffering=0)
+            )
+            transports.append(transport)
+            return reader
+        
+        try:
+            out_reader = await open_pipe(out_r)
+            err_reader = await open_pipe(err_r)
+        except BaseException:
+            conn.close()
+            for fd in (out_r, err_r)[len(transports):]:
+                os.close(fd)
+            for transport in transports:
+                transport.close()
+            raise
+        conn.setblocking(False)
+        control_reader, control_writer = await asyncio.open_unix_connection(sock=conn)
+        
+        async def pump(stream: asyncio.StreamReader, output: _CappedOutput) -> None:
+            while True:
+                chunk = await stream.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                if output.feed(chunk) and output is stdout:
+                    control_writer.write_eof()
+        
+        async def read_control() -> bytes:
+            nonlocal spawned_at
+            first = await control_reader.readline()
+            spawned_at = time.monotonic()
+            return first + await control_reader.read()
+        
+        async def collect() -> bytes:
+            _, _, control = await asyncio.gather(
+                pump(out_reader, stdout), pump(err_reader, stderr), read_control()
+            )
+            return control
+        
+        try:
+            control = await asyncio.wait_for(collect(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Command timed out: {command}")
+            return _failure(f"Command timed out after {timeout}s")
+        except OSError as e:
+            logger.error(f"Command failed: {command}", exc_info=True)
+            return _failure(str(e))
+        finally:
+            # Closing the control connection kills a command still running
+            control_writer.close()
+            for transport in transports:
+                transport.close()
+        
+        return self._finish(command, control, stdout, stderr, spawned_at)
@@ -2,14 +2,23 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+import threading
 from .config import settings
 from .infra.logging import setup_logging, get_logger
-from .api import routes_chat, routes_health, routes_settings
+from .infra.sampler import health_sampler
+from .agent.intent_router import intent_router
+from .infra.metrics_store import metrics_store
+from .infra.sandbox import sandbox_runner
+from .api import routes_chat, routes_health, routes_metrics, routes_settings
 from .tools.registry import registry
+from .tools.base import PlanOperations
 from .tools.disk import DiskFreeTool
 from .tools.health import SystemHealthTool
 from .tools.photos import OrganizePhotosTool
-from .tools.gpu import GPUTemperatureTool
+from .tools.similar_photos import SimilarPhotosTool
+from .tools.gpu import GPUTemperatureTool, gpu_metrics
+from .tools.metrics_history import MetricsHistoryTool
+from .tools.procfs import PROCFS_TOOLS, procfs_available
 from .tools.directory_size import DirectorySizeTool
 from .tools.duplicates import DuplicateFinderTool
 from .tools.cmd.specs_storage import (
@@ -69,6 +78,7 @@ app.add_middleware(
 app.include_router(routes_health.router)
 app.include_router(routes_chat.router)
 app.include_router(routes_settings.router)
+app.include_router(routes_metrics.router)
 
 web_dir = Path(__file__).parent.parent.parent / "web"
 if web_dir.exists():
@@ -82,6 +92,11 @@ async def startup_event():
     logger.info(f"Model: {settings.ollama_model}")
     logger.info(f"Sandbox mode: {settings.sandbox_mode}")
     
+    # Spilled plan operations from a run that exited before the plans were confirmed or expired
+    removed = PlanOperations.remove_stale_files(settings.plan_ttl_sec)
+    if removed:
+        logger.info(f"Removed {removed} stale plan files")
+    
     # Register MVP Python tools
     registry.register(DiskFreeTool())
     registry.register(SystemHealthTool())
@@ -89,6 +104,15 @@ async def startup_event():
     registry.register(GPUTemperatureTool())
     registry.register(DirectorySizeTool())
     registry.register(DuplicateFinderTool())
+    registry.register(SimilarPhotosTool())
+    registry.register(MetricsHistoryTool())
+    
+    # Memory, uptime, vmstat, hostname, uname and whoami are answered
+    # in-process from /proc and syscalls; the command tools of the same
+    # names are only registered where /proc is unavailable.
+    if procfs_available():
+        for tool_class in PROCFS_TOOLS:
+            registry.register(tool_class())
     
     # Register storage command tools
     try:
@@ -103,9 +127,10 @@ async def startup_event():
     # Register performance command tools
     try:
         registry.register(create_ps_tool())
-        registry.register(create_free_tool())
-        registry.register(create_vmstat_tool())
-        registry.register(create_uptime_tool())
+        if not procfs_available():
+            registry.register(create_free_tool())
+            registry.register(create_vmstat_tool())
+            registry.register(create_uptime_tool())
         logger.info("Registered performance command tools")
     except Exception as e:
         logger.warning(f"Some performance tools unavailable: {e}")
@@ -135,9 +160,10 @@ async def startup_event():
     
     # Register system information tools
     try:
-        registry.register(create_uname_tool())
-        registry.register(create_hostname_tool())
-        registry.register(create_whoami_tool())
+        if not procfs_available():
+            registry.register(create_uname_tool())
+            registry.register(create_hostname_tool())
+            registry.register(create_whoami_tool())
         registry.register(create_id_tool())
         registry.register(create_env_tool())
         registry.register(create_timedatectl_tool())
@@ -229,11 +255,24 @@ async def startup_event():
         logger.info("Tier 2 system tools disabled (enable sandbox_mode to use)")
     
     logger.info(f"Registered {len(registry.list_tools())} tools total")
+    
+    # Feed host telemetry history from the background sampler
+    if settings.metrics_enabled:
+        health_sampler.add_collector(gpu_metrics)
+        health_sampler.add_listener(metrics_store.record_sample)
+    health_sampler.start()
+    
+    # Embed the intent examples now so the first chat message does not wait
+    if settings.intent_router_enabled:
+        threading.Thread(target=intent_router.prepare, daemon=True).start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Ollama ToolChat")
+    health_sampler.stop()
+    metrics_store.close()
+    sandbox_runner.close()
 
 
 if __name__ == "__main__":
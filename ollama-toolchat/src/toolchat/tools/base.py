@@ -1,5 +1,11 @@
+import asyncio
+import glob
+import json
+import os
+import tempfile
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional
 from pydantic import BaseModel, Field
 from enum import IntEnum
 
@@ -10,12 +16,95 @@ class ToolTier(IntEnum):
     SYSTEM_CHANGE = 2
 
 
+_SPILL_PREFIX = "toolchat-plan-"
+
+
+class PlanOperations:
+    """Append-only list of operations computed by a dry run.
+    
+    Operations are small JSON arrays. Up to ``spill_threshold`` of them are
+    kept in memory; beyond that they are streamed to a private temp file as
+    JSON lines so very large plans do not stay resident between the dry run
+    and the user's confirmation.
+    """
+    
+    def __init__(self, spill_threshold: int = 1000):
+        self.spill_threshold = spill_threshold
+        self._buffer: List[List[Any]] = []
+        self._path: Optional[str] = None
+        self._file = None
+        self._count = 0
+    
+    def append(self, operation: List[Any]) -> None:
+        self._buffer.append(operation)
+        self._count += 1
+        if len(self._buffer) >= self.spill_threshold:
+            self._spill()
+    
+    def _spill(self) -> None:
+        if self._file is None:
+            fd, self._path = tempfile.mkstemp(prefix=_SPILL_PREFIX, suffix=".jsonl")
+            self._file = os.fdopen(fd, "w", encoding="utf-8")
+        for operation in self._buffer:
+            self._file.write(json.dumps(operation, separators=(",", ":")) + "\n")
+        self._buffer.clear()
+    
+    def close(self) -> None:
+        """Finish writing; call once the dry run has produced every operation."""
+        if self._file is not None:
+            self._spill()
+            self._file.close()
+            self._file = None
+    
+    def discard(self) -> None:
+        self.close()
+        self._buffer.clear()
+        if self._path:
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+            self._path = None
+    
+    @staticmethod
+    def remove_stale_files(max_age_sec: float) -> int:
+        """Delete spill files older than ``max_age_sec`` left by a previous process; returns how many."""
+        removed = 0
+        cutoff = time.time() - max_age_sec
+        for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{_SPILL_PREFIX}*.jsonl")):
+            try:
+                # Younger files may belong to a plan another running instance still holds
+                if os.stat(path).st_mtime < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+    
+    @property
+    def spilled(self) -> bool:
+        return self._path is not None
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __iter__(self) -> Iterator[List[Any]]:
+        self.close()
+        if self._path:
+            with open(self._path, encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        yield from self._buffer
+
+
 class ToolResult(BaseModel):
     ok: bool
     data: Optional[Any] = None
     error_code: Optional[str] = None
     message: Optional[str] = None
     details: Optional[Dict[str, Any]] = None
+    # Full operation list from a dry run; kept server-side, never serialized
+    operations: Optional[Any] = Field(default=None, exclude=True)
 
 
 class ToolSpec(BaseModel):
@@ -28,6 +117,14 @@ class ToolSpec(BaseModel):
     allows_network: bool = False
     timeout_sec: int = 30
     max_output_bytes: int = 10000
+    # Seconds a successful READ_ONLY result may be reused; 0 disables caching
+    cache_ttl_sec: float = 0
+    # Scheduler pool: interactive "quick" reads, "cpu"-bound work or "disk_scan" walks
+    resource_class: Literal["quick", "cpu", "disk_scan"] = "quick"
+    # str.format template over the result data, e.g. "Hostname: {hostname}".
+    # When set and every field is present, the chat shows it as the answer
+    # instead of asking the LLM to summarize the result.
+    direct_answer: Optional[str] = None
 
 
 class BaseTool(ABC):
@@ -38,5 +135,27 @@ class BaseTool(ABC):
     def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
         pass
     
+    async def execute_async(
+        self,
+        args: Dict[str, Any],
+        dry_run: bool = False,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> ToolResult:
+        """Run the tool from async code without blocking the event loop.
+        
+        The default runs execute() in a worker thread; tools that spawn
+        processes override this to await them on the loop directly and
+        pass their output to ``on_output`` as it arrives.
+        """
+        return await asyncio.to_thread(self.execute, args, dry_run)
+    
+    def execute_plan(self, args: Dict[str, Any], operations: PlanOperations) -> ToolResult:
+        """Apply the operations recorded by a confirmed dry run.
+        
+        Tools that attach ``operations`` to their dry-run result override this
+        to replay them; the default simply executes again.
+        """
+        return self.execute(args, dry_run=False)
+    
     def validate_args(self, args: Dict[str, Any]) -> bool:
         return True
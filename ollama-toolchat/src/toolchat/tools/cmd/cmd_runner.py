@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from ...infra.sandbox import sandbox_runner
 from ...infra.security import path_validator
 from ...infra.logging import get_logger
@@ -7,16 +7,12 @@ logger = get_logger(__name__)
 
 
 class CommandRunner:
-    def run_command(
+    def _check_access(
         self,
-        command: List[str],
-        cwd: Optional[str] = None,
-        timeout: int = 30,
-        allow_network: bool = False,
-        read_paths: Optional[List[str]] = None,
-        write_paths: Optional[List[str]] = None,
-        max_output_bytes: int = 10000,
-    ) -> Dict[str, Any]:
+        cwd: Optional[str],
+        read_paths: Optional[List[str]],
+        write_paths: Optional[List[str]],
+    ) -> Optional[Dict[str, Any]]:
         if cwd and not path_validator.can_read(cwd):
             return {
                 "ok": False,
@@ -45,6 +41,23 @@ class CommandRunner:
                         "stderr": f"Write access denied: {wp}",
                     }
         
+        return None
+    
+    def run_command(
+        self,
+        command: List[str],
+        cwd: Optional[str] = None,
+        timeout: int = 30,
+        allow_network: bool = False,
+        read_paths: Optional[List[str]] = None,
+        write_paths: Optional[List[str]] = None,
+        max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        denied = self._check_access(cwd, read_paths, write_paths)
+        if denied:
+            return denied
+        
         logger.info(f"Running command: {' '.join(command)}", extra={
             "tool_name": "cmd_runner",
             "cwd": cwd,
@@ -58,9 +71,41 @@ class CommandRunner:
             read_paths=read_paths,
             write_paths=write_paths,
             max_output_bytes=max_output_bytes,
+            on_output=on_output,
         )
         
         return result
+    
+    async def run_command_async(
+        self,
+        command: List[str],
+        cwd: Optional[str] = None,
+        timeout: int = 30,
+        allow_network: bool = False,
+        read_paths: Optional[List[str]] = None,
+        write_paths: Optional[List[str]] = None,
+        max_output_bytes: int = 10000,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        denied = self._check_access(cwd, read_paths, write_paths)
+        if denied:
+            return denied
+        
+        logger.info(f"Running command: {' '.join(command)}", extra={
+            "tool_name": "cmd_runner",
+            "cwd": cwd,
+        })
+        
+        return await sandbox_runner.run_async(
+            command=command,
+            cwd=cwd,
+            timeout=timeout,
+            allow_network=allow_network,
+            read_paths=read_paths,
+            write_paths=write_paths,
+            max_output_bytes=max_output_bytes,
+            on_output=on_output,
+        )
 
 
 command_runner = CommandRunner()
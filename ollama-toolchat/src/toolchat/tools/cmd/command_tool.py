@@ -1,4 +1,5 @@
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import json
 import jsonschema
 from pydantic import ConfigDict, Field
 from ..base import BaseTool, ToolSpec, ToolResult, ToolTier
@@ -14,6 +15,10 @@ class CommandToolSpec(ToolSpec):
     binary: str
     argv_template: List[str]
     default_args: Dict[str, Any] = Field(default_factory=dict)
+    # "text", "json" (one document) or "json_lines" (one document per line)
+    output_format: str = "text"
+    # Turns the output into typed records, stored once as data["records"]
+    parser: Optional[Callable[[Any], Any]] = Field(default=None, exclude=True)
 
 
 class CommandTool(BaseTool):
@@ -43,39 +48,98 @@ class CommandTool(BaseTool):
         
         return command
     
-    def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
+    def _parse_output(self, stdout: str) -> Any:
+        output_format = self.command_spec.output_format
+        if output_format == "json":
+            document = json.loads(stdout)
+        elif output_format == "json_lines":
+            document = []
+            for line in stdout.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    document.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Only the last line can be cut short by the output cap
+                    logger.warning(f"Skipping undecodable output line from {self.spec.name}")
+        else:
+            document = stdout
+        
+        parser = self.command_spec.parser
+        return parser(document) if parser is not None else document
+    
+    def _prepare(self, args: Dict[str, Any], dry_run: bool) -> Tuple[Optional[ToolResult], List[str]]:
+        """Validate and build the command; returns an early result for invalid or dry runs."""
         if not self.validate_args(args):
             return ToolResult(
                 ok=False,
                 error_code="invalid_arguments",
                 message=f"Invalid arguments for tool '{self.spec.name}'. Check the schema."
-            )
+            ), []
         
         if dry_run and not self.spec.supports_dry_run:
             return ToolResult(
                 ok=False,
                 error_code="dry_run_not_supported",
                 message=f"Tool '{self.spec.name}' does not support dry-run"
+            ), []
+        
+        # Merge default args with provided args (provided args take precedence)
+        merged_args = {**self.command_spec.default_args, **args}
+        command = self._build_command(merged_args)
+        
+        logger.info(f"Executing command tool: {self.spec.name}", extra={
+            "tool_name": self.spec.name,
+            "command": " ".join(command),
+        })
+        
+        if dry_run:
+            return ToolResult(
+                ok=True,
+                data={
+                    "command": " ".join(command),
+                    "message": f"Would execute: {' '.join(command)}"
+                }
+            ), command
+        
+        return None, command
+    
+    def _to_result(self, result: Dict[str, Any]) -> ToolResult:
+        if not result["ok"]:
+            return ToolResult(
+                ok=False,
+                error_code="command_failed",
+                message=f"Command failed: {result['stderr']}",
+                details=result
             )
         
+        data = {
+            "stdout": result["stdout"],
+            "exit_code": result["exit_code"],
+        }
+        if result.get("truncated"):
+            data["truncated"] = True
+        if self.command_spec.parser is not None or self.command_spec.output_format != "text":
+            try:
+                data["records"] = self._parse_output(result["stdout"])
+            except Exception as e:
+                # Formatting falls back to the raw stdout
+                logger.warning(f"Parser for {self.spec.name} failed: {e}")
+        return ToolResult(ok=True, data=data)
+    
+    def _error(self, e: Exception) -> ToolResult:
+        logger.error(f"Command tool {self.spec.name} failed", exc_info=True)
+        return ToolResult(
+            ok=False,
+            error_code="command_tool_error",
+            message=f"Failed to execute command: {str(e)}"
+        )
+    
+    def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
         try:
-            # Merge default args with provided args (provided args take precedence)
-            merged_args = {**self.command_spec.default_args, **args}
-            command = self._build_command(merged_args)
-            
-            logger.info(f"Executing command tool: {self.spec.name}", extra={
-                "tool_name": self.spec.name,
-                "command": " ".join(command),
-            })
-            
-            if dry_run:
-                return ToolResult(
-                    ok=True,
-                    data={
-                        "command": " ".join(command),
-                        "message": f"Would execute: {' '.join(command)}"
-                    }
-                )
+            early, command = self._prepare(args, dry_run)
+            if early is not None:
+                return early
             
             result = command_runner.run_command(
                 command=command,
@@ -83,27 +147,28 @@ class CommandTool(BaseTool):
                 allow_network=self.spec.allows_network,
                 max_output_bytes=self.spec.max_output_bytes,
             )
-            
-            if result["ok"]:
-                return ToolResult(
-                    ok=True,
-                    data={
-                        "stdout": result["stdout"],
-                        "exit_code": result["exit_code"],
-                    }
-                )
-            else:
-                return ToolResult(
-                    ok=False,
-                    error_code="command_failed",
-                    message=f"Command failed: {result['stderr']}",
-                    details=result
-                )
-        
+            return self._to_result(result)
         except Exception as e:
-            logger.error(f"Command tool {self.spec.name} failed", exc_info=True)
-            return ToolResult(
-                ok=False,
-                error_code="command_tool_error",
-                message=f"Failed to execute command: {str(e)}"
+            return self._error(e)
+    
+    async def execute_async(
+        self,
+        args: Dict[str, Any],
+        dry_run: bool = False,
+        on_output: Optional[Callable[[str], None]] = None,
+    ) -> ToolResult:
+        try:
+            early, command = self._prepare(args, dry_run)
+            if early is not None:
+                return early
+            
+            result = await command_runner.run_command_async(
+                command=command,
+                timeout=self.spec.timeout_sec,
+                allow_network=self.spec.allows_network,
+                max_output_bytes=self.spec.max_output_bytes,
+                on_output=on_output,
             )
+            return self._to_result(result)
+        except Exception as e:
+            return self._error(e)
@@ -0,0 +1,235 @@
+"""Parsers that turn command tool output into typed records.
+
+A parser is declared on a CommandToolSpec and runs once when the command
+succeeds; its result is stored as ``data["records"]`` on the ToolResult,
+so formatting and the model work from compact structured data instead of
+re-splitting the raw table. Specs request machine-readable output where
+the binary supports it; for ``output_format="json"``/``"json_lines"`` the
+parser receives the decoded document rather than the stdout text.
+"""
+
+import re
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
+
+Number = Union[int, float]
+
+_TEMPERATURE = re.compile(r"^\s*([^:]+):\s*([+-]?\d+(?:\.\d+)?)\s*°?C")
+_FAN = re.compile(r"^\s*([^:]+):\s*(\d+)\s*RPM")
+
+
+def to_number(value: str) -> Union[Number, str]:
+    """Convert '42', '3.5', '3,5' or '19%' to a number; leave anything else as is."""
+    text = value.strip().rstrip("%").replace(",", ".")
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return value
+
+
+def _flatten(nodes: List[Dict[str, Any]], depth: int = 0) -> List[Dict[str, Any]]:
+    """Flatten the nested 'children' trees of lsblk/findmnt --json output."""
+    flat = []
+    for node in nodes:
+        node = dict(node)
+        children = node.pop("children", [])
+        node["depth"] = depth
+        flat.append(node)
+        flat.extend(_flatten(children, depth + 1))
+    return flat
+
+
+def parse_df(stdout: str) -> List[Dict[str, Any]]:
+    """Parse ``df -B1 --output=source,fstype,size,used,avail,pcent,target``."""
+    records = []
+    for line in stdout.splitlines()[1:]:
+        parts = line.split(None, 6)
+        if len(parts) < 7:
+            continue
+        records.append({
+            "filesystem": parts[0],
+            "fstype": parts[1],
+            "size_bytes": to_number(parts[2]),
+            "used_bytes": to_number(parts[3]),
+            "available_bytes": to_number(parts[4]),
+            "use_percent": to_number(parts[5]) if parts[5] != "-" else None,
+            "mount": parts[6],
+        })
+    return records
+
+
+def parse_free(stdout: str) -> Dict[str, Dict[str, Any]]:
+    """Parse ``free -b``; values are in bytes."""
+    lines = [line for line in stdout.splitlines() if line.strip()]
+    if not lines:
+        return {}
+    columns = [c.replace("/", "_") for c in lines[0].split()]
+    result = {}
+    for line in lines[1:]:
+        label, _, values = line.partition(":")
+        key = {"Mem": "memory", "Swap": "swap"}.get(label.strip(), label.strip().lower())
+        result[key] = {column: to_number(value) for column, value in zip(columns, values.split())}
+    return result
+
+
+def parse_ps(stdout: str) -> List[Dict[str, Any]]:
+    """Parse ``ps -eo user,pid,pcpu,pmem,rss,stat,args --no-headers``."""
+    records = []
+    for line in stdout.splitlines():
+        parts = line.split(None, 6)
+        if len(parts) < 7:
+            continue
+        records.append({
+            "user": parts[0],
+            "pid": to_number(parts[1]),
+            "cpu_percent": to_number(parts[2]),
+            "memory_percent": to_number(parts[3]),
+            "rss_kb": to_number(parts[4]),
+            "stat": parts[5],
+            "command": parts[6],
+        })
+    return records
+
+
+def parse_lsblk(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten ``lsblk --json -b`` output; sizes are in bytes."""
+    records = []
+    for device in _flatten(document.get("blockdevices", [])):
+        fsuse = device.get("fsuse%")
+        records.append({
+            "name": device.get("name"),
+            "type": device.get("type"),
+            "fstype": device.get("fstype"),
+            "label": device.get("label"),
+            "size_bytes": device.get("size"),
+            "fsavail_bytes": device.get("fsavail"),
+            "fsuse_percent": to_number(fsuse) if fsuse else None,
+            "mountpoint": device.get("mountpoint"),
+            "depth": device["depth"],
+        })
+    return records
+
+
+def parse_findmnt(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten ``findmnt --json`` output."""
+    return _flatten(document.get("filesystems", []))
+
+
+def parse_ip_addr(document: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reduce ``ip -j addr show`` to one record per interface."""
+    interfaces = []
+    for link in document:
+        addresses = link.get("addr_info", [])
+        interfaces.append({
+            "ifname": link.get("ifname"),
+            "state": link.get("operstate"),
+            "mac": link.get("address"),
+            "mtu": link.get("mtu"),
+            "ipv4": [f"{a['local']}/{a['prefixlen']}" for a in addresses if a.get("family") == "inet"],
+            "ipv6": [f"{a['local']}/{a['prefixlen']}" for a in addresses if a.get("family") == "inet6"],
+        })
+    return interfaces
+
+
+def parse_ss(stdout: str) -> List[Dict[str, Any]]:
+    """Parse ``ss -H`` output (a header line, if present, is skipped)."""
+    records = []
+    for line in stdout.splitlines():
+        if line.startswith("Netid"):
+            continue
+        parts = line.split(None, 6)
+        if len(parts) < 6:
+            continue
+        process = parts[6].strip() if len(parts) > 6 else ""
+        match = re.search(r'\("([^"]+)",pid=(\d+)', process)
+        records.append({
+            "netid": parts[0],
+            "state": parts[1],
+            "recv_q": to_number(parts[2]),
+            "send_q": to_number(parts[3]),
+            "local": parts[4],
+            "peer": parts[5],
+            "process": match.group(1) if match else None,
+            "pid": int(match.group(2)) if match else None,
+        })
+    return records
+
+
+def parse_vmstat(stdout: str) -> Dict[str, Number]:
+    lines = [line for line in stdout.splitlines() if line.strip()]
+    if len(lines) < 3:
+        return {}
+    columns = lines[1].split()
+    values = lines[-1].split()
+    return {column: to_number(value) for column, value in zip(columns, values)}
+
+
+def parse_iostat(stdout: str) -> Dict[str, Any]:
+    lines = stdout.splitlines()
+    result: Dict[str, Any] = {"cpu": {}, "devices": []}
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("avg-cpu:") and i + 1 < len(lines):
+            labels = [label.lstrip("%") for label in line.split()[1:]]
+            result["cpu"] = {label: to_number(v) for label, v in zip(labels, lines[i + 1].split())}
+            i += 2
+            continue
+        if line.startswith("Device"):
+            labels = line.split()
+            i += 1
+            while i < len(lines) and lines[i].strip():
+                values = lines[i].split()
+                device = {"device": values[0]}
+                device.update({label: to_number(v) for label, v in zip(labels[1:], values[1:])})
+                result["devices"].append(device)
+                i += 1
+            continue
+        i += 1
+    return result
+
+
+def parse_journal(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reduce ``journalctl -o json`` entries to timestamp, unit, priority and message."""
+    records = []
+    for entry in entries:
+        message = entry.get("MESSAGE", "")
+        # Non-UTF-8 messages are exported as arrays of byte values
+        if isinstance(message, list):
+            message = bytes(message).decode("utf-8", errors="replace")
+        timestamp = entry.get("__REALTIME_TIMESTAMP")
+        records.append({
+            "timestamp": datetime.fromtimestamp(int(timestamp) / 1e6).isoformat(sep=" ", timespec="seconds") if timestamp else None,
+            "unit": entry.get("_SYSTEMD_UNIT") or entry.get("SYSLOG_IDENTIFIER") or entry.get("_COMM"),
+            "priority": int(entry["PRIORITY"]) if str(entry.get("PRIORITY", "")).isdigit() else None,
+            "message": message,
+        })
+    return records
+
+
+def parse_sensors(stdout: str) -> List[Dict[str, Any]]:
+    chips = []
+    chip: Optional[Dict[str, Any]] = None
+    for line in stdout.splitlines():
+        if not line.strip():
+            chip = None
+            continue
+        if chip is None:
+            chip = {"chip": line.strip(), "adapter": None, "temperatures": {}, "fans": {}}
+            chips.append(chip)
+            continue
+        if line.startswith("Adapter:"):
+            chip["adapter"] = line.split(":", 1)[1].strip()
+            continue
+        temperature = _TEMPERATURE.match(line)
+        if temperature:
+            chip["temperatures"][temperature.group(1).strip()] = float(temperature.group(2))
+            continue
+        fan = _FAN.match(line)
+        if fan:
+            chip["fans"][fan.group(1).strip()] = int(fan.group(2))
+    return chips
@@ -22,6 +22,7 @@ def create_find_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=30,
+        resource_class="disk_scan",
         binary="/usr/bin/find",
         argv_template=["{path}", "-maxdepth", "3", "-name", "{name}"],
         default_args={"name": "*"}
@@ -47,6 +48,7 @@ def create_fd_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=20,
+        resource_class="disk_scan",
         binary="/usr/bin/fdfind",
         argv_template=["-d", "3", "{pattern}", "{path}"],
         default_args={"pattern": "."}
@@ -72,6 +74,7 @@ def create_rg_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=30,
+        resource_class="disk_scan",
         binary="/usr/bin/rg",
         argv_template=["-i", "--max-depth", "3", "{pattern}", "{path}"],
         default_args={"path": "."}
@@ -96,6 +99,7 @@ def create_tree_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=15,
+        resource_class="disk_scan",
         binary="/usr/bin/tree",
         argv_template=["-L", "2", "{path}"]
     )
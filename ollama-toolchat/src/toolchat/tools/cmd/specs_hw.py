@@ -1,5 +1,6 @@
 from ..base import ToolTier
 from .command_tool import CommandTool, CommandToolSpec
+from .parsers import parse_sensors
 
 
 def create_lspci_tool() -> CommandTool:
@@ -15,6 +16,7 @@ def create_lspci_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=3600,
         binary="/usr/bin/lspci",
         argv_template=["-v"]
     )
@@ -34,6 +36,7 @@ def create_lsusb_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=60,
         binary="/usr/bin/lsusb",
         argv_template=["-v"]
     )
@@ -53,6 +56,7 @@ def create_lscpu_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=3600,
         binary="/usr/bin/lscpu",
         argv_template=[]
     )
@@ -72,7 +76,9 @@ def create_sensors_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=5,
         binary="/usr/bin/sensors",
-        argv_template=[]
+        argv_template=[],
+        parser=parse_sensors
     )
     return CommandTool(spec)
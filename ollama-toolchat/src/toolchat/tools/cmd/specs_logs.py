@@ -1,5 +1,6 @@
 from ..base import ToolTier
 from .command_tool import CommandTool, CommandToolSpec
+from .parsers import parse_journal
 
 
 def create_journalctl_tool() -> CommandTool:
@@ -26,8 +27,12 @@ def create_journalctl_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=15,
+        # One JSON document per entry; only the fields parse_journal reads
+        max_output_bytes=256000,
         binary="/usr/bin/journalctl",
-        argv_template=["-n", "{lines}", "--no-pager"]
+        argv_template=["-n", "{lines}", "--no-pager", "-o", "json", "--output-fields=MESSAGE,PRIORITY,_SYSTEMD_UNIT,SYSLOG_IDENTIFIER,_COMM"],
+        output_format="json_lines",
+        parser=parse_journal
     )
     return CommandTool(spec)
 
@@ -51,6 +56,7 @@ def create_dmesg_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=5,
         binary="/usr/bin/dmesg",
         argv_template=["--human", "--nopager"]
     )
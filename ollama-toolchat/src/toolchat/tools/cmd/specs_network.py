@@ -1,6 +1,7 @@
 """Network inspection command tool specifications."""
 
 from .command_tool import CommandTool, CommandToolSpec
+from .parsers import parse_ss, parse_ip_addr
 from ..base import ToolTier
 
 
@@ -15,8 +16,12 @@ def create_ip_addr_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=10,
+        max_output_bytes=64000,
         binary="/usr/sbin/ip",
-        argv_template=["addr", "show"]
+        argv_template=["-j", "addr", "show"],
+        output_format="json",
+        parser=parse_ip_addr
     )
     return CommandTool(spec)
 
@@ -32,8 +37,11 @@ def create_ip_route_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=10,
+        max_output_bytes=64000,
         binary="/usr/sbin/ip",
-        argv_template=["route", "show"]
+        argv_template=["-j", "route", "show"],
+        output_format="json"
     )
     return CommandTool(spec)
 
@@ -49,8 +57,10 @@ def create_ss_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=5,
         binary="/usr/bin/ss",
-        argv_template=["-tulpn"]
+        argv_template=["-H", "-tulpn"],
+        parser=parse_ss
     )
     return CommandTool(spec)
 
@@ -66,6 +76,7 @@ def create_nmcli_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=10,
         binary="/usr/bin/nmcli",
         argv_template=["dev", "status"]
     )
@@ -106,6 +117,7 @@ def create_resolvectl_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=30,
         binary="/usr/bin/resolvectl",
         argv_template=["status"]
     )
@@ -1,5 +1,6 @@
 from ..base import ToolTier
 from .command_tool import CommandTool, CommandToolSpec
+from .parsers import parse_ps, parse_free, parse_vmstat, parse_iostat
 
 
 def create_ps_tool() -> CommandTool:
@@ -15,8 +16,10 @@ def create_ps_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=2,
         binary="/usr/bin/ps",
-        argv_template=["aux"]
+        argv_template=["-eo", "user,pid,pcpu,pmem,rss,stat,args", "--sort=-pcpu", "--no-headers"],
+        parser=parse_ps
     )
     return CommandTool(spec)
 
@@ -34,8 +37,10 @@ def create_free_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=2,
         binary="/usr/bin/free",
-        argv_template=["-h"]
+        argv_template=["-b"],
+        parser=parse_free
     )
     return CommandTool(spec)
 
@@ -53,8 +58,10 @@ def create_vmstat_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=2,
         binary="/usr/bin/vmstat",
-        argv_template=[]
+        argv_template=[],
+        parser=parse_vmstat
     )
     return CommandTool(spec)
 
@@ -72,8 +79,10 @@ def create_iostat_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=2,
         binary="/usr/bin/iostat",
-        argv_template=["-x"]
+        argv_template=["-x"],
+        parser=parse_iostat
     )
     return CommandTool(spec)
 
@@ -91,6 +100,7 @@ def create_uptime_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=2,
         binary="/usr/bin/uptime",
         argv_template=[]
     )
@@ -101,6 +101,7 @@ def create_last_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=30,
         binary="/usr/bin/last",
         argv_template=["-n", "20"]
     )
@@ -15,6 +15,7 @@ def create_top_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=2,
         binary="/usr/bin/top",
         argv_template=["-b", "-n", "1"]
     )
@@ -49,6 +50,7 @@ def create_pidstat_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=2,
         binary="/usr/bin/pidstat",
         argv_template=["1", "1"]
     )
@@ -15,6 +15,7 @@ def create_ufw_status_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=30,
         binary="/usr/sbin/ufw",
         argv_template=["status", "verbose"]
     )
@@ -32,6 +33,7 @@ def create_aa_status_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=30,
         binary="/usr/sbin/aa-status",
         argv_template=[]
     )
@@ -49,6 +51,7 @@ def create_loginctl_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=30,
         binary="/usr/bin/loginctl",
         argv_template=["list-sessions"]
     )
@@ -1,11 +1,12 @@
 from ..base import ToolTier
 from .command_tool import CommandTool, CommandToolSpec
+from .parsers import parse_df, parse_lsblk, parse_findmnt
 
 
 def create_df_tool() -> CommandTool:
     spec = CommandToolSpec(
         name="df_command",
-        description="Show disk filesystem usage with human-readable sizes",
+        description="Show disk filesystem usage (size, used and available space per mount)",
         args_schema={
             "type": "object",
             "properties": {
@@ -21,8 +22,10 @@ def create_df_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=10,
         binary="/usr/bin/df",
-        argv_template=["-h", "{path}"]
+        argv_template=["-B1", "--output=source,fstype,size,used,avail,pcent,target", "{path}"],
+        parser=parse_df
     )
     return CommandTool(spec)
 
@@ -51,6 +54,8 @@ def create_du_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=30,
+        resource_class="disk_scan",
+        cache_ttl_sec=30,
         binary="/usr/bin/du",
         argv_template=["-h", "--max-depth={max_depth}", "{path}"]
     )
@@ -70,8 +75,12 @@ def create_lsblk_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=30,
+        max_output_bytes=64000,
         binary="/usr/bin/lsblk",
-        argv_template=["-f"]
+        argv_template=["--json", "-b", "-o", "NAME,TYPE,FSTYPE,LABEL,SIZE,FSAVAIL,FSUSE%,MOUNTPOINT"],
+        output_format="json",
+        parser=parse_lsblk
     )
     return CommandTool(spec)
 
@@ -95,7 +104,11 @@ def create_findmnt_tool() -> CommandTool:
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=10,
+        cache_ttl_sec=30,
+        max_output_bytes=64000,
         binary="/usr/bin/findmnt",
-        argv_template=["{target}"]
+        argv_template=["--json", "-o", "TARGET,SOURCE,FSTYPE,OPTIONS", "{target}"],
+        output_format="json",
+        parser=parse_findmnt
     )
     return CommandTool(spec)
@@ -15,6 +15,7 @@ def create_uname_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=3600,
         binary="/usr/bin/uname",
         argv_template=["-a"]
     )
@@ -32,6 +33,8 @@ def create_hostname_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=3600,
+        direct_answer="This machine's hostname is **{stdout}**.",
         binary="/usr/bin/hostname",
         argv_template=[]
     )
@@ -49,6 +52,8 @@ def create_whoami_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=3600,
+        direct_answer="You are logged in as **{stdout}**.",
         binary="/usr/bin/whoami",
         argv_template=[]
     )
@@ -66,6 +71,7 @@ def create_id_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=3600,
         binary="/usr/bin/id",
         argv_template=[]
     )
@@ -117,6 +123,7 @@ def create_locale_tool():
         supports_dry_run=False,
         allows_network=False,
         timeout_sec=5,
+        cache_ttl_sec=3600,
         binary="/usr/bin/locale",
         argv_template=[]
     )
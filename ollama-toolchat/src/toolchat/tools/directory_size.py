@@ -30,6 +30,7 @@ class DirectorySizeTool(BaseTool):
             tier=ToolTier.READ_ONLY,
             requires_confirmation=False,
             supports_dry_run=False,
+            resource_class="disk_scan",
         )
         super().__init__(spec)
     
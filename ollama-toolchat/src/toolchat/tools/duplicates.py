@@ -41,6 +41,7 @@ class DuplicateFinderTool(BaseTool):
             requires_confirmation=False,
             supports_dry_run=False,
             timeout_sec=120,
+            resource_class="disk_scan",
         )
         super().__init__(spec)
     
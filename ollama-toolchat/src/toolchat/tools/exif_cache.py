@@ -0,0 +1,98 @@
+"""Persistent cache of embedded photo capture dates keyed on file identity."""
+
+import os
+import sqlite3
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..config import settings
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+FileKey = Tuple[int, int, int, int]
+
+
+def file_key(stat: os.stat_result) -> FileKey:
+    """Identity of a file's content: (dev, inode, size, mtime_ns).
+    
+    A rename within a filesystem keeps the key, so photos moved by
+    organize_photos are still hits on the next run; any rewrite changes
+    size or mtime and invalidates the entry.
+    """
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class ExifDateCache:
+    """Stores the capture date found in a file's metadata.
+    
+    A NULL date is a valid entry meaning "neither exiftool nor Pillow found
+    an embedded date", so files that fall back to mtime are not re-probed.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(settings.exif_cache_db_path)
+        self._init_db()
+    
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS exif_dates (
+                dev INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                date_taken TEXT,
+                PRIMARY KEY (dev, inode, size, mtime_ns)
+            ) WITHOUT ROWID
+        """)
+        
+        conn.commit()
+        conn.close()
+        logger.info(f"Initialized EXIF date cache at {self.db_path}")
+    
+    def get_many(self, keys: Iterable[FileKey]) -> Dict[FileKey, Optional[datetime]]:
+        """Return cached entries for the given keys; misses are absent from the result."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        hits: Dict[FileKey, Optional[datetime]] = {}
+        for key in keys:
+            cursor.execute(
+                "SELECT date_taken FROM exif_dates WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ?",
+                key
+            )
+            row = cursor.fetchone()
+            if row is not None:
+                hits[key] = datetime.fromisoformat(row[0]) if row[0] else None
+        
+        conn.close()
+        return hits
+    
+    def get(self, key: FileKey) -> Tuple[bool, Optional[datetime]]:
+        """Return (hit, date_taken) for a single file."""
+        hits = self.get_many([key])
+        return key in hits, hits.get(key)
+    
+    def put_many(self, entries: List[Tuple[FileKey, Optional[datetime]]]) -> None:
+        if not entries:
+            return
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO exif_dates (dev, inode, size, mtime_ns, date_taken)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(*key, date_taken.isoformat() if date_taken else None) for key, date_taken in entries]
+        )
+        
+        conn.commit()
+        conn.close()
+
+
+exif_date_cache = ExifDateCache()
@@ -2,8 +2,9 @@ import subprocess
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from ..infra.logging import get_logger
+from .exif_cache import exif_date_cache, file_key
 
 logger = get_logger(__name__)
 
@@ -23,10 +24,34 @@ class ExifToolHelper:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
     
+    def _parse_date_taken(self, exif: Dict[str, Any]) -> Optional[datetime]:
+        for field in ["DateTimeOriginal", "CreateDate"]:
+            if field in exif:
+                date_str = exif[field]
+                try:
+                    return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
+                except ValueError:
+                    try:
+                        return datetime.strptime(date_str.split("+")[0].strip(), "%Y:%m:%d %H:%M:%S")
+                    except ValueError:
+                        continue
+        
+        return None
+    
     def get_date_taken(self, image_path: Path) -> Optional[datetime]:
         if not self.exiftool_available:
             return None
         
+        try:
+            key = file_key(image_path.stat())
+        except OSError:
+            key = None
+        
+        if key:
+            hit, cached = exif_date_cache.get(key)
+            if hit:
+                return cached
+        
         try:
             result = subprocess.run(
                 ["exiftool", "-DateTimeOriginal", "-CreateDate", "-json", str(image_path)],
@@ -42,23 +67,50 @@ class ExifToolHelper:
             if not data:
                 return None
             
-            exif = data[0]
+            date_taken = self._parse_date_taken(data[0])
+            if date_taken and key:
+                exif_date_cache.put_many([(key, date_taken)])
+            return date_taken
+        
+        except Exception as e:
+            logger.warning(f"exiftool failed for {image_path}: {e}")
+            return None
+    
+    def get_dates_taken(self, image_paths: List[Path]) -> Optional[Dict[str, datetime]]:
+        """Read capture dates for many files with a single exiftool invocation.
+        
+        Returns a mapping of source path to date; files without a usable date
+        are omitted so the caller can fall back to other sources. Returns None
+        when exiftool failed or timed out, since nothing can then be said
+        about which files lack a date.
+        """
+        if not self.exiftool_available or not image_paths:
+            return {}
+        
+        try:
+            # exiftool exits non-zero if any single file is unreadable but still
+            # reports the others, so parse stdout regardless of the return code.
+            result = subprocess.run(
+                ["exiftool", "-DateTimeOriginal", "-CreateDate", "-json", "-fast2", "--"]
+                + [str(p) for p in image_paths],
+                capture_output=True,
+                text=True,
+                timeout=10 + len(image_paths),
+            )
             
-            for field in ["DateTimeOriginal", "CreateDate"]:
-                if field in exif:
-                    date_str = exif[field]
-                    try:
-                        return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
-                    except ValueError:
-                        try:
-                            return datetime.strptime(date_str.split("+")[0].strip(), "%Y:%m:%d %H:%M:%S")
-                        except ValueError:
-                            continue
+            if not result.stdout.strip():
+                logger.warning(f"exiftool returned nothing for {len(image_paths)} files: {result.stderr.strip()[:200]}")
+                return None
             
-            return None
+            dates = {}
+            for exif in json.loads(result.stdout):
+                date_taken = self._parse_date_taken(exif)
+                if date_taken and "SourceFile" in exif:
+                    dates[exif["SourceFile"]] = date_taken
+            return dates
         
         except Exception as e:
-            logger.warning(f"exiftool failed for {image_path}: {e}")
+            logger.warning(f"exiftool batch failed for {len(image_paths)} files: {e}")
             return None
     
     def get_metadata(self, image_path: Path) -> Optional[Dict[str, Any]]:
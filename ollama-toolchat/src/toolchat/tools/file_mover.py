@@ -0,0 +1,264 @@
+"""Journaled bulk file mover used by write tools such as organize_photos."""
+
+import errno
+import fcntl
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Errors meaning "this copy primitive is not usable for this pair of files"
+_UNSUPPORTED_COPY_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.EBADF}
+
+
+def _copy_contents(fd_in: int, fd_out: int, size: int) -> None:
+    """Copy file contents in the kernel where possible.
+    
+    copy_file_range can reflink or copy server-side; sendfile still avoids
+    user-space buffers. Fallbacks are only taken before any bytes were
+    written, so a failure mid-copy is never silently retried.
+    """
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < size:
+                sent = os.copy_file_range(fd_in, fd_out, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return
+        except OSError as e:
+            if copied or e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+                raise
+    
+    try:
+        while copied < size:
+            sent = os.sendfile(fd_out, fd_in, copied, size - copied)
+            if sent == 0:
+                break
+            copied += sent
+        return
+    except OSError as e:
+        if copied or e.errno not in _UNSUPPORTED_COPY_ERRNOS:
+            raise
+    
+    with os.fdopen(os.dup(fd_in), "rb") as fsrc, os.fdopen(os.dup(fd_out), "wb") as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+
+def _fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _partial_path(dest: Path) -> Path:
+    return dest.with_name(f".{dest.name}.partial")
+
+
+def _lock_path(journal_path: Path) -> Path:
+    # A separate file, since the journal itself is removed at the end of each run
+    return journal_path.with_name(f"{journal_path.name}.lock")
+
+
+class FileMover:
+    """Moves many files with a bounded worker pool.
+    
+    Same-filesystem moves are a single rename. Cross-device moves copy into a
+    hidden ``.partial`` file with copy_file_range/sendfile, fsync it, rename
+    it into place, and only unlink the source after the batch's directories
+    have been fsynced. Every batch is recorded in a journal before it starts,
+    so ``recover`` can finish or roll back whatever an interrupted run left
+    in flight. Runs sharing a journal hold an flock on it for their whole
+    duration, so they take turns rather than recovering each other's moves.
+    """
+    
+    def __init__(self, workers: int = 4, batch_size: int = 256):
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._reserved: Set[Path] = set()
+        self.stats: Dict[str, Any] = {}
+    
+    def _reserve(self, dest: Path) -> Path:
+        candidate = dest
+        counter = 1
+        while candidate in self._reserved or os.path.lexists(candidate):
+            candidate = dest.with_name(f"{dest.stem}_{counter}{dest.suffix}")
+            counter += 1
+        self._reserved.add(candidate)
+        return candidate
+    
+    def _move_one(self, source: Path, dest: Path) -> Tuple[str, int]:
+        """Move or copy a single file; returns (method, bytes_copied)."""
+        try:
+            os.rename(source, dest)
+            return "rename", 0
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        
+        partial = _partial_path(dest)
+        try:
+            with open(source, "rb") as fsrc, open(partial, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                _copy_contents(fsrc.fileno(), fdst.fileno(), size)
+                fdst.flush()
+                os.fsync(fdst.fileno())
+            shutil.copystat(source, partial)
+            os.rename(partial, dest)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+        return "copy", size
+    
+    @staticmethod
+    def recover(journal_path: Path) -> int:
+        """Settle moves left in flight by an interrupted run; returns how many were settled."""
+        if not journal_path.exists():
+            return 0
+        
+        begun: Dict[Tuple[str, str], bool] = {}
+        with open(journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    state, source, dest = json.loads(line)
+                except ValueError:
+                    # A torn final line from the crash; everything before it is intact
+                    break
+                if state == "B":
+                    begun[(source, dest)] = True
+                else:
+                    begun.pop((source, dest), None)
+        
+        for source, dest in begun:
+            source_path, dest_path = Path(source), Path(dest)
+            try:
+                _partial_path(dest_path).unlink(missing_ok=True)
+                # dest only appears via rename of a fully fsynced copy, so when
+                # both exist the copy finished and only the unlink was lost
+                if dest_path.exists() and source_path.exists():
+                    source_path.unlink()
+            except OSError as e:
+                # Both copies are intact; leave the leftover for the user rather than retrying forever
+                logger.warning(f"Could not settle interrupted move {source} -> {dest}: {e}")
+                continue
+            logger.info(f"Recovered interrupted move {source} -> {dest}")
+        
+        journal_path.unlink()
+        return len(begun)
+    
+    def move_all(
+        self,
+        moves: Iterable[Tuple[Path, Path]],
+        journal_path: Path,
+    ) -> Iterator[Tuple[Path, Path, Optional[str]]]:
+        """Move files, yielding (source, final_destination, error) in input order.
+        
+        Destinations that already exist get a ``_N`` suffix. Throughput
+        counters for the run are available in ``self.stats`` afterwards.
+        """
+        journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(_lock_path(journal_path), "a") as lock:
+            # Blocks while another run uses the same journal
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            yield from self._move_locked(moves, journal_path)
+    
+    def _move_locked(
+        self,
+        moves: Iterable[Tuple[Path, Path]],
+        journal_path: Path,
+    ) -> Iterator[Tuple[Path, Path, Optional[str]]]:
+        self.recover(journal_path)
+        self._reserved.clear()
+        self.stats = {"renamed": 0, "copied": 0, "failed": 0, "bytes_copied": 0}
+        started = time.monotonic()
+        created_dirs: Set[Path] = set()
+        
+        iterator = iter(moves)
+        with open(journal_path, "a", encoding="utf-8") as journal, \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                batch = list(islice(iterator, self.batch_size))
+                if not batch:
+                    break
+                
+                planned: List[Tuple[Path, Path]] = []
+                for source, dest in batch:
+                    if dest.parent not in created_dirs:
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(dest.parent)
+                    planned.append((source, self._reserve(dest)))
+                
+                for source, dest in planned:
+                    journal.write(json.dumps(["B", str(source), str(dest)]) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+                
+                futures = [pool.submit(self._move_one, source, dest) for source, dest in planned]
+                outcomes = []
+                dirty_dirs: Set[Path] = set()
+                for (source, dest), future in zip(planned, futures):
+                    try:
+                        method, size = future.result()
+                    except OSError as e:
+                        logger.error(f"Failed to move {source} -> {dest}: {e}")
+                        self.stats["failed"] += 1
+                        outcomes.append((source, dest, str(e), None))
+                        continue
+                    dirty_dirs.add(dest.parent)
+                    dirty_dirs.add(source.parent)
+                    outcomes.append((source, dest, None, method))
+                    if method == "rename":
+                        self.stats["renamed"] += 1
+                    else:
+                        self.stats["copied"] += 1
+                        self.stats["bytes_copied"] += size
+                
+                # Copies are durable at their destination before sources go away
+                for directory in dirty_dirs:
+                    _fsync_dir(directory)
+                for index, (source, dest, error, method) in enumerate(outcomes):
+                    if method != "copy":
+                        continue
+                    try:
+                        os.unlink(source)
+                    except OSError as e:
+                        # The copy is complete, but the file now exists twice
+                        logger.error(f"Copied {source} -> {dest} but could not remove the source: {e}")
+                        self.stats["copied"] -= 1
+                        self.stats["failed"] += 1
+                        outcomes[index] = (source, dest, f"copied but could not remove the original: {e}", None)
+                for directory in {source.parent for source, _, _, method in outcomes if method == "copy"}:
+                    _fsync_dir(directory)
+                
+                for source, dest, error, _ in outcomes:
+                    journal.write(json.dumps(["D", str(source), str(dest)]) + "\n")
+                journal.flush()
+                
+                for source, dest, error, _ in outcomes:
+                    yield source, dest, error
+        
+        journal_path.unlink()
+        
+        elapsed = time.monotonic() - started
+        moved = self.stats["renamed"] + self.stats["copied"]
+        self.stats["seconds"] = round(elapsed, 3)
+        self.stats["files_per_sec"] = round(moved / elapsed, 1) if elapsed > 0 else None
+        self.stats["mb_per_sec"] = round(self.stats["bytes_copied"] / (1024 * 1024) / elapsed, 1) if elapsed > 0 else None
@@ -1,16 +1,33 @@
 import subprocess
 from typing import Dict, Any
 from .base import BaseTool, ToolSpec, ToolResult, ToolTier
+from .nvml import get_gpu_backend
 from ..infra.logging import get_logger
 
 logger = get_logger(__name__)
 
+_GPU_METRIC_FIELDS = ["temperature_c", "utilization_percent", "memory_used_mb", "power_draw_w"]
+
+
+def gpu_metrics() -> Dict[str, float]:
+    """Numeric GPU gauges for the background sampler, e.g. {"gpu0.temperature_c": 61}."""
+    backend = get_gpu_backend()
+    if backend is None:
+        return {}
+    metrics = {}
+    for gpu in backend.read():
+        for field in _GPU_METRIC_FIELDS:
+            # None for fields the board does not report
+            if gpu[field] is not None:
+                metrics[f"gpu{gpu['index']}.{field}"] = gpu[field]
+    return metrics
+
 
 class GPUTemperatureTool(BaseTool):
     def __init__(self):
         spec = ToolSpec(
             name="gpu_temperature",
-            description="Check GPU temperature and utilization using nvidia-smi. Shows temperature, utilization, memory usage, and power draw for NVIDIA GPUs.",
+            description="Check GPU temperature and utilization for NVIDIA GPUs (via NVML, or nvidia-smi as fallback). Shows temperature, utilization, memory usage, and power draw.",
             args_schema={
                 "type": "object",
                 "properties": {},
@@ -24,36 +41,15 @@ class GPUTemperatureTool(BaseTool):
     
     def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
         try:
-            # Check if nvidia-smi is available
-            result = subprocess.run(
-                ['nvidia-smi', '--query-gpu=index,name,temperature.gpu,utilization.gpu,memory.used,memory.total,power.draw', '--format=csv,noheader,nounits'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode != 0:
+            backend = get_gpu_backend()
+            if backend is None:
                 return ToolResult(
                     ok=False,
-                    error_code="nvidia_smi_error",
-                    message="nvidia-smi command failed. Make sure NVIDIA drivers are installed and you have an NVIDIA GPU."
+                    error_code="nvidia_smi_not_found",
+                    message="Neither NVML nor nvidia-smi was found. Install NVIDIA drivers to use this tool."
                 )
             
-            # Parse the output
-            gpus = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    parts = [p.strip() for p in line.split(',')]
-                    if len(parts) >= 7:
-                        gpus.append({
-                            "index": parts[0],
-                            "name": parts[1],
-                            "temperature_c": parts[2],
-                            "utilization_percent": parts[3],
-                            "memory_used_mb": parts[4],
-                            "memory_total_mb": parts[5],
-                            "power_draw_w": parts[6]
-                        })
+            gpus = backend.read()
             
             if not gpus:
                 return ToolResult(
@@ -66,22 +62,23 @@ class GPUTemperatureTool(BaseTool):
                 ok=True,
                 data={
                     "gpu_count": len(gpus),
-                    "gpus": gpus
+                    "gpus": gpus,
+                    "backend": backend.name,
                 }
             )
-            
-        except FileNotFoundError:
-            return ToolResult(
-                ok=False,
-                error_code="nvidia_smi_not_found",
-                message="nvidia-smi not found. Install NVIDIA drivers to use this tool."
-            )
+        
         except subprocess.TimeoutExpired:
             return ToolResult(
                 ok=False,
                 error_code="timeout",
                 message="nvidia-smi command timed out."
             )
+        except RuntimeError as e:
+            return ToolResult(
+                ok=False,
+                error_code="nvidia_smi_error",
+                message=f"{e}. Make sure NVIDIA drivers are installed and you have an NVIDIA GPU."
+            )
         except Exception as e:
             logger.error(f"gpu_temperature failed: {e}", exc_info=True)
             return ToolResult(
@@ -1,7 +1,8 @@
-import psutil
+import time
 from typing import Dict, Any
 from .base import BaseTool, ToolSpec, ToolResult, ToolTier
 from ..infra.logging import get_logger
+from ..infra.sampler import health_sampler
 
 logger = get_logger(__name__)
 
@@ -16,7 +17,7 @@ class SystemHealthTool(BaseTool):
                 "properties": {
                     "limit": {
                         "type": "integer",
-                        "description": "Number of top processes to return (default: 5)",
+                        "description": "Number of top processes to return (default: 5, max: 25)",
                         "default": 5
                     }
                 }
@@ -31,38 +32,25 @@ class SystemHealthTool(BaseTool):
         limit = args.get("limit", 5)
         
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_used_gb = memory.used / (1024**3)
-            memory_total_gb = memory.total / (1024**3)
-            
-            processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-                try:
-                    pinfo = proc.info
-                    processes.append({
-                        'pid': pinfo['pid'],
-                        'name': pinfo['name'],
-                        'cpu_percent': pinfo['cpu_percent'] or 0,
-                        'memory_percent': pinfo['memory_percent'] or 0,
-                    })
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            
-            top_cpu = sorted(processes, key=lambda x: x['cpu_percent'], reverse=True)[:limit]
-            top_memory = sorted(processes, key=lambda x: x['memory_percent'], reverse=True)[:limit]
+            sample = health_sampler.latest()
+            if sample is None:
+                return ToolResult(
+                    ok=False,
+                    error_code="system_health_unavailable",
+                    message="No system health sample is available yet"
+                )
             
             return ToolResult(
                 ok=True,
                 data={
-                    "cpu_percent": round(cpu_percent, 1),
-                    "memory_percent": round(memory_percent, 1),
-                    "memory_used_gb": round(memory_used_gb, 2),
-                    "memory_total_gb": round(memory_total_gb, 2),
-                    "top_cpu_processes": top_cpu,
-                    "top_memory_processes": top_memory,
+                    "cpu_percent": sample["cpu_percent"],
+                    "memory_percent": sample["memory_percent"],
+                    "memory_used_gb": sample["memory_used_gb"],
+                    "memory_total_gb": sample["memory_total_gb"],
+                    "top_cpu_processes": sample["top_cpu_processes"][:limit],
+                    "top_memory_processes": sample["top_memory_processes"][:limit],
+                    "sample_age_sec": round(time.time() - sample["timestamp"], 1),
+                    "sample_interval_sec": sample["interval_sec"],
                 }
             )
         except Exception as e:
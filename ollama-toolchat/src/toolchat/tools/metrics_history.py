@@ -0,0 +1,101 @@
+import time
+from typing import Dict, Any
+from .base import BaseTool, ToolSpec, ToolResult, ToolTier
+from ..infra.metrics_store import metrics_store, parse_duration
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MetricsHistoryTool(BaseTool):
+    def __init__(self):
+        spec = ToolSpec(
+            name="metrics_history",
+            description="Look up recorded host metrics over a past time window (min/avg/max and a trend). Use for questions like 'was RAM high an hour ago?' or 'CPU load over the last day'. Metrics include cpu.percent, memory.percent, memory.used_gb, swap.percent, load.1m, disk.read_bytes_per_sec, disk.write_bytes_per_sec, net.recv_bytes_per_sec, net.sent_bytes_per_sec, temp.<sensor> and gpu<N>.temperature_c. Omit metric to list what is recorded.",
+            args_schema={
+                "type": "object",
+                "properties": {
+                    "metric": {
+                        "type": "string",
+                        "description": "Metric name, e.g. 'memory.percent' or 'cpu.percent'"
+                    },
+                    "window": {
+                        "type": "string",
+                        "description": "Length of the window, e.g. '30m', '6h', '7d' (default: 1h)",
+                        "default": "1h"
+                    },
+                    "end_ago": {
+                        "type": "string",
+                        "description": "How long ago the window ends, e.g. '1h' for the hour before last (default: now)",
+                        "default": "0"
+                    },
+                    "points": {
+                        "type": "integer",
+                        "description": "Maximum number of trend points to return (default: 12)",
+                        "default": 12
+                    }
+                }
+            },
+            tier=ToolTier.READ_ONLY,
+            requires_confirmation=False,
+            supports_dry_run=False,
+        )
+        super().__init__(spec)
+    
+    def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
+        metric = args.get("metric")
+        points = args.get("points", 12)
+        
+        try:
+            if not metric:
+                return ToolResult(
+                    ok=True,
+                    data={"available_metrics": metrics_store.list_metrics()}
+                )
+            
+            try:
+                window = parse_duration(args.get("window", "1h"))
+                end_ago = parse_duration(args.get("end_ago", "0"))
+            except ValueError as e:
+                return ToolResult(
+                    ok=False,
+                    error_code="invalid_window",
+                    message=str(e)
+                )
+            
+            try:
+                points = int(points)
+            except (TypeError, ValueError):
+                return ToolResult(
+                    ok=False,
+                    error_code="invalid_arguments",
+                    message=f"points must be a whole number, got {points!r}"
+                )
+            
+            if window <= 0:
+                return ToolResult(
+                    ok=False,
+                    error_code="invalid_window",
+                    message="window must be greater than zero"
+                )
+            
+            now = time.time()
+            end = now - end_ago
+            history = metrics_store.query(metric, end - window, end, max_points=max(1, min(points, 500)), now=now)
+            
+            if history["samples"] == 0:
+                return ToolResult(
+                    ok=False,
+                    error_code="no_metric_data",
+                    message=f"No data recorded for '{metric}' in that window",
+                    data={"available_metrics": metrics_store.list_metrics()}
+                )
+            
+            return ToolResult(ok=True, data=history)
+        except Exception as e:
+            logger.error("metrics_history failed", exc_info=True)
+            return ToolResult(
+                ok=False,
+                error_code="metrics_history_error",
+                message=f"Failed to read metrics history: {str(e)}"
+            )
@@ -0,0 +1,184 @@
+"""GPU telemetry backends: NVML through ctypes, with nvidia-smi as fallback."""
+
+import ctypes
+import shutil
+import subprocess
+import threading
+from typing import Dict, Any, List
+from ..config import settings
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+NVML_SUCCESS = 0
+NVML_TEMPERATURE_GPU = 0
+_NVML_LIBRARIES = ["libnvidia-ml.so.1", "libnvidia-ml.so"]
+_NAME_BUFFER_SIZE = 96
+
+
+class NVMLError(Exception):
+    def __init__(self, function: str, code: int):
+        super().__init__(f"{function} failed with NVML error {code}")
+        self.function = function
+        self.code = code
+
+
+class _Utilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+
+class _Memory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+
+
+class NVMLBackend:
+    """Reads GPU telemetry in-process through libnvidia-ml.
+    
+    The library is loaded and initialised once and device handles are kept
+    for the life of the process, so a reading is a handful of driver calls
+    instead of an nvidia-smi fork.
+    """
+    
+    name = "nvml"
+    
+    def __init__(self, library: str):
+        self._lib = ctypes.CDLL(library)
+        self._lock = threading.Lock()
+        self._call("nvmlInit_v2")
+        
+        count = ctypes.c_uint()
+        self._call("nvmlDeviceGetCount_v2", ctypes.byref(count))
+        self._handles = []
+        for index in range(count.value):
+            handle = ctypes.c_void_p()
+            self._call("nvmlDeviceGetHandleByIndex_v2", ctypes.c_uint(index), ctypes.byref(handle))
+            self._handles.append(handle)
+        
+        self._names = []
+        for handle in self._handles:
+            buffer = ctypes.create_string_buffer(_NAME_BUFFER_SIZE)
+            self._call("nvmlDeviceGetName", handle, buffer, ctypes.c_uint(_NAME_BUFFER_SIZE))
+            self._names.append(buffer.value.decode(errors="replace"))
+    
+    def _call(self, function: str, *args) -> None:
+        code = getattr(self._lib, function)(*args)
+        if code != NVML_SUCCESS:
+            raise NVMLError(function, code)
+    
+    def _optional(self, function: str, *args) -> bool:
+        """Call a query that a board may not support; False instead of raising."""
+        try:
+            self._call(function, *args)
+            return True
+        except NVMLError:
+            return False
+    
+    def read(self) -> List[Dict[str, Any]]:
+        gpus = []
+        with self._lock:
+            for index, handle in enumerate(self._handles):
+                temperature = ctypes.c_uint()
+                utilization = _Utilization()
+                memory = _Memory()
+                power = ctypes.c_uint()
+                
+                has_temperature = self._optional("nvmlDeviceGetTemperature", handle, NVML_TEMPERATURE_GPU, ctypes.byref(temperature))
+                has_utilization = self._optional("nvmlDeviceGetUtilizationRates", handle, ctypes.byref(utilization))
+                has_memory = self._optional("nvmlDeviceGetMemoryInfo", handle, ctypes.byref(memory))
+                has_power = self._optional("nvmlDeviceGetPowerUsage", handle, ctypes.byref(power))
+                
+                gpus.append({
+                    "index": index,
+                    "name": self._names[index],
+                    "temperature_c": temperature.value if has_temperature else None,
+                    "utilization_percent": utilization.gpu if has_utilization else None,
+                    "memory_used_mb": memory.used // (1024 * 1024) if has_memory else None,
+                    "memory_total_mb": memory.total // (1024 * 1024) if has_memory else None,
+                    # NVML reports milliwatts
+                    "power_draw_w": round(power.value / 1000, 2) if has_power else None,
+                })
+        return gpus
+    
+    def close(self) -> None:
+        with self._lock:
+            self._handles = []
+            self._optional("nvmlShutdown")
+
+
+class NvidiaSmiBackend:
+    """Fallback that forks nvidia-smi for every reading."""
+    
+    name = "nvidia-smi"
+    
+    def read(self) -> List[Dict[str, Any]]:
+        result = subprocess.run(
+            ['nvidia-smi', '--query-gpu=index,name,temperature.gpu,utilization.gpu,memory.used,memory.total,power.draw', '--format=csv,noheader,nounits'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"nvidia-smi failed: {result.stderr.strip()}")
+        
+        gpus = []
+        for line in result.stdout.strip().split('\n'):
+            parts = [p.strip() for p in line.split(',')]
+            if len(parts) < 7:
+                continue
+            gpus.append({
+                "index": int(parts[0]),
+                "name": parts[1],
+                "temperature_c": _number(parts[2]),
+                "utilization_percent": _number(parts[3]),
+                "memory_used_mb": _number(parts[4]),
+                "memory_total_mb": _number(parts[5]),
+                "power_draw_w": _number(parts[6]),
+            })
+        return gpus
+
+
+def _number(value: str):
+    """Parse an nvidia-smi field; "[N/A]" and friends become None."""
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return int(number) if number.is_integer() else number
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_backend_probed = False
+
+
+def get_gpu_backend():
+    """Return the process-wide GPU backend, or None when no NVIDIA stack is present."""
+    global _backend, _backend_probed
+    with _backend_lock:
+        if _backend_probed:
+            return _backend
+        _backend_probed = True
+        
+        libraries = [settings.nvml_library] if settings.nvml_library else _NVML_LIBRARIES
+        for library in libraries:
+            try:
+                _backend = NVMLBackend(library)
+                logger.info(f"Using NVML GPU backend ({library})")
+                return _backend
+            except (OSError, AttributeError, NVMLError) as e:
+                logger.debug(f"NVML unavailable via {library}: {e}")
+        
+        if shutil.which("nvidia-smi"):
+            _backend = NvidiaSmiBackend()
+            logger.info("NVML not found, using nvidia-smi GPU backend")
+        return _backend
+
+
+def reset_gpu_backend() -> None:
+    """Drop the cached backend so the next call probes again."""
+    global _backend, _backend_probed
+    with _backend_lock:
+        if isinstance(_backend, NVMLBackend):
+            _backend.close()
+        _backend = None
+        _backend_probed = False
@@ -0,0 +1,88 @@
+"""Persistent index of perceptual photo hashes keyed on file identity."""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..config import settings
+from ..infra.logging import get_logger
+from .exif_cache import FileKey
+
+logger = get_logger(__name__)
+
+_SIGN_BIT = 1 << 63
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit; hashes use all 64 bits
+    return value - (1 << 64) if value & _SIGN_BIT else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class PhotoHashIndex:
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else Path(settings.photo_hash_db_path)
+        self._init_db()
+    
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS photo_hashes (
+                dev INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                hash INTEGER NOT NULL,
+                PRIMARY KEY (dev, inode, size, mtime_ns, algorithm)
+            ) WITHOUT ROWID
+        """)
+        
+        conn.commit()
+        conn.close()
+        logger.info(f"Initialized photo hash index at {self.db_path}")
+    
+    def get_many(self, keys: Iterable[FileKey], algorithm: str) -> Dict[FileKey, int]:
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        hits: Dict[FileKey, int] = {}
+        for key in keys:
+            cursor.execute(
+                """
+                SELECT hash FROM photo_hashes
+                WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ? AND algorithm = ?
+                """,
+                (*key, algorithm)
+            )
+            row = cursor.fetchone()
+            if row is not None:
+                hits[key] = _to_unsigned(row[0])
+        
+        conn.close()
+        return hits
+    
+    def put_many(self, entries: List[Tuple[FileKey, int]], algorithm: str) -> None:
+        if not entries:
+            return
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO photo_hashes (dev, inode, size, mtime_ns, algorithm, hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [(*key, algorithm, _to_signed(value)) for key, value in entries]
+        )
+        
+        conn.commit()
+        conn.close()
+
+
+photo_hash_index = PhotoHashIndex()
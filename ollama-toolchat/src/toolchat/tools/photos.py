@@ -1,16 +1,107 @@
-import shutil
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from PIL import Image
-from PIL.ExifTags import TAGS
-from .base import BaseTool, ToolSpec, ToolResult, ToolTier
+from .base import BaseTool, PlanOperations, ToolSpec, ToolResult, ToolTier
+from ..config import settings
 from ..infra.security import path_validator
 from ..infra.logging import get_logger
 from .exiftool_helper import exiftool_helper
+from .exif_cache import exif_date_cache, file_key, FileKey
+from .file_mover import FileMover
 
 logger = get_logger(__name__)
 
+PHOTO_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.heic', '.heif'}
+
+# EXIF tag ids: the Exif sub-IFD pointer and the capture timestamps stored in it
+_EXIF_IFD = 0x8769
+_DATE_TIME_ORIGINAL = 0x9003
+_DATE_TIME_DIGITIZED = 0x9004
+
+# Formats whose EXIF Pillow parses from header segments at open() time;
+# for anything else getexif() may decode the full image to find it.
+_HEADER_EXIF_FORMATS = {"JPEG", "MPO", "TIFF"}
+
+_DATE_CHUNK_SIZE = 64
+_PREVIEW_LIMIT = 10
+_JOURNAL_NAME = ".organize_photos.journal"
+
+
+def _pillow_date_taken(image_path: Path) -> Optional[datetime]:
+    """Read the capture date from the EXIF segment without decoding pixel data."""
+    try:
+        # Image.open only parses headers; pixels are decoded lazily on load()
+        with Image.open(image_path) as image:
+            if image.format in _HEADER_EXIF_FORMATS:
+                exif = image.getexif()
+            elif "exif" in image.info:
+                exif = Image.Exif()
+                exif.load(image.info["exif"])
+            else:
+                return None
+            
+            exif_ifd = exif.get_ifd(_EXIF_IFD)
+            for tag in (_DATE_TIME_ORIGINAL, _DATE_TIME_DIGITIZED):
+                value = exif_ifd.get(tag) or exif.get(tag)
+                if value:
+                    return datetime.strptime(str(value).strip("\x00 "), "%Y:%m:%d %H:%M:%S")
+    except Exception:
+        pass
+    return None
+
+
+def _extract_dates(paths: List[str]) -> List[Tuple[str, Optional[datetime]]]:
+    """Read embedded capture dates for a chunk of photos (runs in a worker process).
+    
+    Returns None for photos without an embedded date; the caller falls back
+    to mtime and records the miss in the EXIF date cache. If the exiftool
+    batch failed, photos Pillow cannot date either are left out, so the
+    caller falls back to mtime without caching a miss that may not be real.
+    """
+    exif_dates = exiftool_helper.get_dates_taken([Path(p) for p in paths])
+    dates = []
+    for path in paths:
+        date_taken = (exif_dates or {}).get(path) or _pillow_date_taken(Path(path))
+        if date_taken is not None or exif_dates is not None:
+            dates.append((path, date_taken))
+    return dates
+
+
+def iter_photo_files(root: Path, exclude_dir: Optional[Path] = None) -> Iterator[str]:
+    """Yield photo paths under root lazily, skipping exclude_dir (e.g. an output tree inside it)."""
+    stack = [str(root)]
+    exclude = str(exclude_dir) if exclude_dir else None
+    
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.path != exclude:
+                                stack.append(entry.path)
+                        elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in PHOTO_EXTENSIONS:
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {current}: {e}")
+
+
+def chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class OrganizePhotosTool(BaseTool):
     def __init__(self):
@@ -45,46 +136,113 @@ class OrganizePhotosTool(BaseTool):
             tier=ToolTier.WRITE_SAFE,
             requires_confirmation=True,
             supports_dry_run=True,
+            resource_class="cpu",
         )
         super().__init__(spec)
     
-    def _get_date_taken(self, image_path: Path) -> datetime:
-        if exiftool_helper.exiftool_available:
-            date_taken = exiftool_helper.get_date_taken(image_path)
-            if date_taken:
-                return date_taken
-        
-        try:
-            image = Image.open(image_path)
-            exif_data = image.getexif()
-            
-            if exif_data:
-                for tag_id, value in exif_data.items():
-                    tag = TAGS.get(tag_id, tag_id)
-                    if tag == "DateTimeOriginal":
-                        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-            
-            stat = image_path.stat()
-            return datetime.fromtimestamp(stat.st_mtime)
-        except Exception:
-            stat = image_path.stat()
-            return datetime.fromtimestamp(stat.st_mtime)
-    
     def _get_target_dir(self, date_taken: datetime, mode: str, output_dir: Path) -> Path:
         if mode == "yyyy_mm":
             return output_dir / f"{date_taken.year}_{date_taken.month:02d}"
         else:
             return output_dir / f"{date_taken.year}_{date_taken.month:02d}_{date_taken.day:02d}"
     
-    def _scan_photos(self, input_dir: Path) -> List[Tuple[Path, str]]:
-        photo_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.heic', '.heif'}
-        photos = []
+    def _scan_photos(self, input_dir: Path, exclude_dir: Optional[Path] = None) -> Iterator[str]:
+        return iter_photo_files(input_dir, exclude_dir)
+    
+    def _lookup_chunk(self, paths: List[str]) -> Tuple[List[Tuple[str, FileKey, float]], Dict[FileKey, Optional[datetime]]]:
+        entries = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                logger.debug(f"Skipping photo that disappeared during scan {path}: {e}")
+                continue
+            entries.append((path, file_key(stat), stat.st_mtime))
+        
+        return entries, exif_date_cache.get_many(key for _, key, _ in entries)
+    
+    def _finish_chunk(
+        self,
+        entries: List[Tuple[str, FileKey, float]],
+        hits: Dict[FileKey, Optional[datetime]],
+        extracted: Dict[str, Optional[datetime]],
+    ) -> List[Tuple[str, datetime, FileKey]]:
+        dates = []
+        new_entries = []
+        for path, key, mtime in entries:
+            if key in hits:
+                embedded = hits[key]
+            else:
+                embedded = extracted.get(path)
+                if path in extracted:
+                    new_entries.append((key, embedded))
+            dates.append((path, embedded or datetime.fromtimestamp(mtime), key))
         
-        for item in input_dir.rglob('*'):
-            if item.is_file() and item.suffix.lower() in photo_extensions:
-                photos.append((item, item.suffix.lower()))
+        exif_date_cache.put_many(new_entries)
+        return dates
+    
+    def _iter_dates(self, photos: Iterable[str]) -> Iterator[Tuple[str, datetime, FileKey]]:
+        """Yield (path, date_taken, file_key) in scan order, fanning chunks out to a process pool.
+        
+        Each chunk is first looked up in the EXIF date cache; only misses are
+        sent to workers, and a fully cached run never starts the pool. At most
+        two chunks per worker are in flight, so memory stays bounded no matter
+        how many photos the scan produces.
+        """
+        chunks = map(self._lookup_chunk, chunked(photos, _DATE_CHUNK_SIZE))
+        first = next(chunks, None)
+        if first is None:
+            return
+        
+        def misses(chunk):
+            entries, hits = chunk
+            return [path for path, key, _ in entries if key not in hits]
+        
+        second = next(chunks, None)
+        if second is None:
+            missing = misses(first)
+            extracted = dict(_extract_dates(missing)) if missing else {}
+            yield from self._finish_chunk(*first, extracted)
+            return
+        
+        workers = settings.photo_workers or min(os.cpu_count() or 1, 8)
+        pool = None
+        try:
+            pending = deque()
+            for chunk in chain([first, second], chunks):
+                missing = misses(chunk)
+                future = None
+                if missing:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=workers)
+                    future = pool.submit(_extract_dates, missing)
+                pending.append((chunk, future))
+                
+                while pending and (len(pending) >= workers * 2 or pending[0][1] is None):
+                    (entries, hits), future = pending.popleft()
+                    extracted = dict(future.result()) if future else {}
+                    yield from self._finish_chunk(entries, hits, extracted)
+            
+            while pending:
+                (entries, hits), future = pending.popleft()
+                extracted = dict(future.result()) if future else {}
+                yield from self._finish_chunk(entries, hits, extracted)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    
+    def _resolve_target(self, source: Path, target_dir: Path, claimed: Set[Path]) -> Path:
+        target_path = target_dir / source.name
+        if target_path == source:
+            return target_path
         
-        return photos
+        base_name = source.stem
+        suffix = source.suffix
+        counter = 1
+        while target_path in claimed or target_path.exists():
+            target_path = target_dir / f"{base_name}_{counter}{suffix}"
+            counter += 1
+        return target_path
     
     def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
         input_dir_str = args.get("input_dir")
@@ -103,9 +261,36 @@ class OrganizePhotosTool(BaseTool):
                     message=f"Input directory does not exist: {input_dir}"
                 )
             
-            photos = self._scan_photos(input_dir)
+            photos = self._scan_photos(input_dir, exclude_dir=output_dir)
+            
+            # Destinations handed out during this run; photos sharing a name and
+            # date would otherwise all be planned onto the same not-yet-existing file.
+            claimed: Set[Path] = set()
+            preview = []
+            total = 0
+            # Every move is recorded; dry runs hand the list to the plan for
+            # replay on confirmation, direct runs apply it straight away.
+            operations = PlanOperations()
+            
+            for source_str, date_taken, key in self._iter_dates(photos):
+                source = Path(source_str)
+                target_dir = self._get_target_dir(date_taken, mode, output_dir)
+                target_path = self._resolve_target(source, target_dir, claimed)
+                claimed.add(target_path)
+                operations.append([source_str, str(target_path), *key])
+                
+                total += 1
+                if len(preview) < _PREVIEW_LIMIT:
+                    preview.append({
+                        "source": source_str,
+                        "destination": str(target_path),
+                        "date_taken": date_taken.isoformat(),
+                    })
+            
+            operations.close()
             
-            if not photos:
+            if total == 0:
+                operations.discard()
                 return ToolResult(
                     ok=True,
                     data={
@@ -115,51 +300,21 @@ class OrganizePhotosTool(BaseTool):
                     }
                 )
             
-            plan = []
-            for photo_path, ext in photos:
-                date_taken = self._get_date_taken(photo_path)
-                target_dir = self._get_target_dir(date_taken, mode, output_dir)
-                target_path = target_dir / photo_path.name
-                
-                if target_path.exists() and target_path != photo_path:
-                    base_name = photo_path.stem
-                    suffix = photo_path.suffix
-                    counter = 1
-                    while target_path.exists():
-                        target_path = target_dir / f"{base_name}_{counter}{suffix}"
-                        counter += 1
-                
-                plan.append({
-                    "source": str(photo_path),
-                    "destination": str(target_path),
-                    "date_taken": date_taken.isoformat(),
-                })
-            
             if not dry_run:
-                for item in plan:
-                    source = Path(item["source"])
-                    dest = Path(item["destination"])
-                    dest.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    if dest.exists() and dest != source:
-                        base_name = dest.stem
-                        suffix = dest.suffix
-                        counter = 1
-                        while dest.exists():
-                            dest = dest.parent / f"{base_name}_{counter}{suffix}"
-                            counter += 1
-                    
-                    shutil.move(str(source), str(dest))
-                    logger.info(f"Moved {source} -> {dest}")
+                try:
+                    return self._apply_operations(output_dir, operations)
+                finally:
+                    operations.discard()
             
             return ToolResult(
                 ok=True,
                 data={
                     "dry_run": dry_run,
-                    "total_photos": len(photos),
-                    "plan": plan[:10],
-                    "message": f"{'Would move' if dry_run else 'Moved'} {len(photos)} photos"
-                }
+                    "total_photos": total,
+                    "plan": preview,
+                    "message": f"Would move {total} photos"
+                },
+                operations=operations,
             )
         except Exception as e:
             logger.error("organize_photos failed", exc_info=True)
@@ -168,3 +323,82 @@ class OrganizePhotosTool(BaseTool):
                 error_code="organize_photos_error",
                 message=f"Failed to organize photos: {str(e)}"
             )
+    
+    def execute_plan(self, args: Dict[str, Any], operations: PlanOperations) -> ToolResult:
+        try:
+            output_dir = path_validator.validate_write(args.get("output_dir"))
+            return self._apply_operations(output_dir, operations)
+        except Exception as e:
+            logger.error("organize_photos plan execution failed", exc_info=True)
+            return ToolResult(
+                ok=False,
+                error_code="organize_photos_error",
+                message=f"Failed to organize photos: {str(e)}"
+            )
+    
+    def _apply_operations(self, output_dir: Path, operations: PlanOperations) -> ToolResult:
+        """Replay recorded moves without rescanning.
+        
+        Each source is checked against the file identity captured when the
+        plan was built; photos that were removed or modified in between are
+        skipped rather than moved to a destination computed from stale
+        metadata. Moves run through a journaled FileMover so an interrupted
+        run is settled on the next invocation.
+        """
+        skipped = 0
+        
+        def valid_moves():
+            nonlocal skipped
+            for source_str, destination_str, *key in operations:
+                source = Path(source_str)
+                target_path = Path(destination_str)
+                
+                try:
+                    current_key = file_key(os.stat(source))
+                except OSError:
+                    current_key = None
+                
+                if current_key != tuple(key) or not target_path.is_relative_to(output_dir):
+                    logger.warning(f"Skipping {source}: changed since the dry run")
+                    skipped += 1
+                elif target_path != source:
+                    yield source, target_path
+        
+        mover = FileMover(workers=settings.photo_move_workers)
+        moved = 0
+        preview = []
+        errors = []
+        
+        for source, target_path, error in mover.move_all(valid_moves(), output_dir / _JOURNAL_NAME):
+            if error:
+                errors.append(f"{source}: {error}")
+                continue
+            moved += 1
+            if len(preview) < _PREVIEW_LIMIT:
+                preview.append({"source": str(source), "destination": str(target_path)})
+        
+        logger.info(f"organize_photos moved {moved} photos", extra={"latency_ms": int(mover.stats.get("seconds", 0) * 1000)})
+        
+        message = f"Moved {moved} photos"
+        if skipped:
+            message += f" (skipped {skipped} changed since the dry run)"
+        
+        data = {
+            "dry_run": False,
+            "total_photos": moved,
+            "skipped_photos": skipped,
+            "failed_photos": len(errors),
+            "errors": errors[:_PREVIEW_LIMIT],
+            "throughput": mover.stats,
+            "plan": preview,
+            "message": message
+        }
+        if errors:
+            # Any failed move fails the run, so the reply never reads as a clean success
+            return ToolResult(
+                ok=False,
+                error_code="partial_failure" if moved else "move_failed",
+                message=f"{message}, {len(errors)} failed: " + "; ".join(errors[:3]),
+                details=data
+            )
+        return ToolResult(ok=True, data=data)
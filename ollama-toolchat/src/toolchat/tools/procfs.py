@@ -0,0 +1,284 @@
+"""In-process replacements for small command tools that only read /proc or a syscall.
+
+These keep the names of the command tools they replace (free_command,
+uptime_command, ...) so routing, aliases and prompts are unchanged, but
+answer without fork/exec through the sandbox runner and return
+structured data instead of a text table.
+"""
+
+import os
+import pwd
+import socket
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import Dict, Any, Optional
+from .base import BaseTool, ToolSpec, ToolResult, ToolTier
+from ..infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROC = Path("/proc")
+
+
+def procfs_available() -> bool:
+    return (PROC / "meminfo").exists()
+
+
+def read_key_values(path: Path) -> Dict[str, int]:
+    """Parse 'key value [kB]' files such as /proc/meminfo and /proc/vmstat.
+    
+    Values with a kB unit are returned in bytes.
+    """
+    values = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.replace(":", " ").split()
+            if len(parts) < 2:
+                continue
+            try:
+                value = int(parts[1])
+            except ValueError:
+                continue
+            if len(parts) > 2 and parts[2] == "kB":
+                value *= 1024
+            values[parts[0]] = value
+    return values
+
+
+def read_stat() -> Dict[str, Any]:
+    """Parse the aggregate cpu line and scalar counters from /proc/stat."""
+    stat: Dict[str, Any] = {}
+    with open(PROC / "stat") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "cpu":
+                stat["cpu"] = [int(v) for v in parts[1:]]
+            elif parts[0] in ("ctxt", "btime", "processes", "procs_running", "procs_blocked", "intr"):
+                stat[parts[0]] = int(parts[1])
+    return stat
+
+
+def _format_size(size_bytes: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size_bytes < 1024:
+            return f"{size_bytes:.1f}{unit}"
+        size_bytes /= 1024
+    return f"{size_bytes:.1f}PB"
+
+
+def _format_duration(seconds: float) -> str:
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
+    if days:
+        return f"{days} day{'s' if days != 1 else ''}, {hours}:{minutes:02d}"
+    return f"{hours}:{minutes:02d}"
+
+
+class ProcfsTool(BaseTool):
+    """Read-only tool answered in-process; subclasses implement read()."""
+    
+    def __init__(self, name: str, description: str, direct_answer: Optional[str] = None):
+        spec = ToolSpec(
+            name=name,
+            description=description,
+            direct_answer=direct_answer,
+            args_schema={"type": "object", "properties": {}},
+            tier=ToolTier.READ_ONLY,
+            requires_confirmation=False,
+            supports_dry_run=False,
+            timeout_sec=5,
+        )
+        super().__init__(spec)
+    
+    @abstractmethod
+    def read(self) -> Dict[str, Any]:
+        pass
+    
+    def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
+        try:
+            return ToolResult(ok=True, data=self.read())
+        except Exception as e:
+            logger.error(f"{self.spec.name} failed", exc_info=True)
+            return ToolResult(
+                ok=False,
+                error_code="procfs_error",
+                message=f"Failed to read system information: {str(e)}"
+            )
+
+
+class MemoryInfoTool(ProcfsTool):
+    def __init__(self):
+        super().__init__(
+            "free_command",
+            "Display amount of free, used and available memory and swap",
+            direct_answer=(
+                "You have **{memory[available]}** of memory available out of {memory[total]} "
+                "({memory[percent_used]}% in use). Swap: {swap[used]} used of {swap[total]}."
+            ),
+        )
+    
+    def read(self) -> Dict[str, Any]:
+        info = read_key_values(PROC / "meminfo")
+        total = info["MemTotal"]
+        free = info["MemFree"]
+        buffers = info.get("Buffers", 0)
+        cached = info.get("Cached", 0) + info.get("SReclaimable", 0)
+        available = info.get("MemAvailable", free + buffers + cached)
+        # Same definition of "used" as procps free(1)
+        used = total - free - buffers - cached
+        if used < 0:
+            used = total - free
+        swap_total = info.get("SwapTotal", 0)
+        swap_free = info.get("SwapFree", 0)
+        
+        return {
+            "memory": {
+                "total": _format_size(total),
+                "used": _format_size(used),
+                "free": _format_size(free),
+                "available": _format_size(available),
+                "buff_cache": _format_size(buffers + cached),
+                "total_bytes": total,
+                "used_bytes": used,
+                "available_bytes": available,
+                "percent_used": round((total - available) / total * 100, 1) if total else 0.0,
+            },
+            "swap": {
+                "total": _format_size(swap_total),
+                "used": _format_size(swap_total - swap_free),
+                "free": _format_size(swap_free),
+                "total_bytes": swap_total,
+                "used_bytes": swap_total - swap_free,
+            },
+        }
+
+
+class UptimeTool(ProcfsTool):
+    def __init__(self):
+        super().__init__(
+            "uptime_command",
+            "Show how long the system has been running and the load averages",
+            direct_answer=(
+                "The system has been up for **{uptime}** (since {boot_time}). Load average: "
+                "{load_average[1m]}, {load_average[5m]}, {load_average[15m]} on {cpu_count} CPUs."
+            ),
+        )
+    
+    def read(self) -> Dict[str, Any]:
+        uptime_seconds = float((PROC / "uptime").read_text().split()[0])
+        load = (PROC / "loadavg").read_text().split()
+        running, total = load[3].split("/")
+        
+        return {
+            "uptime": _format_duration(uptime_seconds),
+            "uptime_seconds": round(uptime_seconds),
+            "boot_time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - uptime_seconds)),
+            "load_average": {"1m": float(load[0]), "5m": float(load[1]), "15m": float(load[2])},
+            "cpu_count": os.cpu_count(),
+            "tasks_running": int(running),
+            "tasks_total": int(total),
+        }
+
+
+class VmstatTool(ProcfsTool):
+    def __init__(self):
+        super().__init__("vmstat_command", "Report virtual memory statistics: processes, memory, swap and paging activity, interrupts, context switches and CPU time split since boot")
+    
+    def read(self) -> Dict[str, Any]:
+        stat = read_stat()
+        vmstat = read_key_values(PROC / "vmstat")
+        meminfo = read_key_values(PROC / "meminfo")
+        uptime_seconds = float((PROC / "uptime").read_text().split()[0]) or 1.0
+        
+        # Like vmstat(8) without a delay, rates are averages since boot
+        cpu = stat.get("cpu", [])
+        fields = ["user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal"]
+        ticks = dict(zip(fields, cpu))
+        total_ticks = sum(ticks.values()) or 1
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        
+        return {
+            "procs_running": stat.get("procs_running", 0),
+            "procs_blocked": stat.get("procs_blocked", 0),
+            "memory": {
+                "free": _format_size(meminfo["MemFree"]),
+                "buffers": _format_size(meminfo.get("Buffers", 0)),
+                "cache": _format_size(meminfo.get("Cached", 0) + meminfo.get("SReclaimable", 0)),
+                "swap_used": _format_size(meminfo.get("SwapTotal", 0) - meminfo.get("SwapFree", 0)),
+            },
+            "swap_in_kb_per_sec": round(vmstat.get("pswpin", 0) * page_size / 1024 / uptime_seconds, 1),
+            "swap_out_kb_per_sec": round(vmstat.get("pswpout", 0) * page_size / 1024 / uptime_seconds, 1),
+            "blocks_in_per_sec": round(vmstat.get("pgpgin", 0) / uptime_seconds, 1),
+            "blocks_out_per_sec": round(vmstat.get("pgpgout", 0) / uptime_seconds, 1),
+            "interrupts_per_sec": round(stat.get("intr", 0) / uptime_seconds, 1),
+            "context_switches_per_sec": round(stat.get("ctxt", 0) / uptime_seconds, 1),
+            "major_page_faults": vmstat.get("pgmajfault", 0),
+            "cpu_percent": {
+                "user": round((ticks.get("user", 0) + ticks.get("nice", 0)) / total_ticks * 100, 1),
+                "system": round((ticks.get("system", 0) + ticks.get("irq", 0) + ticks.get("softirq", 0)) / total_ticks * 100, 1),
+                "idle": round(ticks.get("idle", 0) / total_ticks * 100, 1),
+                "iowait": round(ticks.get("iowait", 0) / total_ticks * 100, 1),
+                "steal": round(ticks.get("steal", 0) / total_ticks * 100, 1),
+            },
+        }
+
+
+class HostnameTool(ProcfsTool):
+    def __init__(self):
+        super().__init__(
+            "hostname_command",
+            "Display the system's hostname",
+            direct_answer="This machine's hostname is **{hostname}**.",
+        )
+    
+    def read(self) -> Dict[str, Any]:
+        return {"hostname": socket.gethostname()}
+
+
+class UnameTool(ProcfsTool):
+    def __init__(self):
+        super().__init__(
+            "uname_command",
+            "Show system information (kernel, architecture, OS)",
+            direct_answer="This machine runs **{os}** with the {sysname} kernel {kernel_release} ({machine}).",
+        )
+    
+    def read(self) -> Dict[str, Any]:
+        uname = os.uname()
+        data = {
+            "sysname": uname.sysname,
+            "nodename": uname.nodename,
+            "kernel_release": uname.release,
+            "kernel_version": uname.version,
+            "machine": uname.machine,
+        }
+        os_release = Path("/etc/os-release")
+        if os_release.exists():
+            for line in os_release.read_text().splitlines():
+                if line.startswith("PRETTY_NAME="):
+                    data["os"] = line.split("=", 1)[1].strip().strip('"')
+        return data
+
+
+class WhoamiTool(ProcfsTool):
+    def __init__(self):
+        super().__init__(
+            "whoami_command",
+            "Display the current username",
+            direct_answer="You are logged in as **{user}** (uid {uid}).",
+        )
+    
+    def read(self) -> Dict[str, Any]:
+        uid = os.geteuid()
+        try:
+            user = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            user = str(uid)
+        return {"user": user, "uid": uid, "gid": os.getegid()}
+
+
+PROCFS_TOOLS = [MemoryInfoTool, UptimeTool, VmstatTool, HostnameTool, UnameTool, WhoamiTool]
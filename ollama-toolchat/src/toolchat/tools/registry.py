@@ -70,6 +70,11 @@ TOOL_ALIASES: Dict[str, str] = {
     # File utilities
     "duplicates": "find_duplicates",
     "find_dups": "find_duplicates",
+    "similar_photos": "find_similar_photos",
+    "near_duplicates": "find_similar_photos",
+    # Telemetry
+    "metrics": "metrics_history",
+    "history": "metrics_history",
 }
 
 
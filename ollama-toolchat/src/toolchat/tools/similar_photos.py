@@ -0,0 +1,359 @@
+"""Near-duplicate photo finder using perceptual hashes."""
+
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from PIL import Image
+from .base import BaseTool, ToolSpec, ToolResult, ToolTier
+from ..config import settings
+from ..infra.security import path_validator
+from ..infra.logging import get_logger
+from .exif_cache import file_key, FileKey
+from .photo_hash_index import photo_hash_index
+from .photos import iter_photo_files, chunked
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = get_logger(__name__)
+
+_HASH_CHUNK_SIZE = 32
+_MAX_PHOTOS = 50000
+_MAX_GROUPS = 20
+
+
+def _load_grayscale(path: str, size: Tuple[int, int]) -> Image.Image:
+    with Image.open(path) as image:
+        # For JPEG, draft() makes the decoder scale down by up to 8x while
+        # decoding, so a thumbnail never costs a full-resolution decode.
+        image.draft("L", (size[0] * 4, size[1] * 4))
+        return image.convert("L").resize(size, Image.Resampling.BILINEAR)
+
+
+def dhash(path: str) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail."""
+    pixels = list(_load_grayscale(path, (9, 8)).getdata())
+    value = 0
+    for row in range(8):
+        offset = row * 9
+        for col in range(8):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _dct_matrix(n: int):
+    k = np.arange(n)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT_32 = _dct_matrix(32) if np is not None else None
+
+
+def phash(path: str) -> int:
+    """64-bit DCT hash: low-frequency coefficients of a 32x32 thumbnail vs. their median."""
+    pixels = np.asarray(_load_grayscale(path, (32, 32)), dtype=np.float64)
+    coefficients = (_DCT_32 @ pixels @ _DCT_32.T)[:8, :8].flatten()
+    # The DC term only reflects overall brightness; exclude it from the median
+    bits = coefficients > np.median(coefficients[1:])
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+HASH_FUNCTIONS = {"dhash": dhash, "phash": phash}
+
+
+def _hash_photos(paths: List[str], algorithm: str) -> List[Tuple[str, Optional[int]]]:
+    """Hash a chunk of photos (runs in a worker process)."""
+    hash_function = HASH_FUNCTIONS[algorithm]
+    hashes = []
+    for path in paths:
+        try:
+            hashes.append((path, hash_function(path)))
+        except Exception as e:
+            logger.debug(f"Could not hash {path}: {e}")
+            hashes.append((path, None))
+    return hashes
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes under Hamming distance.
+    
+    A radius query only descends into children whose edge distance lies in
+    [d - radius, d + radius], so lookups touch a small fraction of the tree
+    instead of comparing against every hash.
+    """
+    
+    def __init__(self):
+        self._root: Optional[list] = None
+    
+    def add(self, value: int) -> None:
+        if self._root is None:
+            self._root = [value, {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [value, {}]
+                return
+            node = child
+    
+    def search(self, value: int, radius: int) -> List[Tuple[int, int]]:
+        """Return (hash, distance) for every stored hash within radius of value."""
+        if self._root is None:
+            return []
+        matches = []
+        stack = [self._root]
+        while stack:
+            node_value, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= radius:
+                matches.append((node_value, distance))
+            for edge in range(max(1, distance - radius), distance + radius + 1):
+                child = children.get(edge)
+                if child is not None:
+                    stack.append(child)
+        return matches
+
+
+class SimilarPhotosTool(BaseTool):
+    def __init__(self):
+        spec = ToolSpec(
+            name="find_similar_photos",
+            description="Find near-duplicate photos (resized, re-encoded or lightly edited copies) in a directory using perceptual hashes. Returns groups of visually similar photos.",
+            args_schema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Directory path to scan for similar photos"
+                    },
+                    "threshold": {
+                        "type": "integer",
+                        "description": "Maximum Hamming distance between 64-bit hashes to count as similar (0-16, default: 6)",
+                        "default": 6
+                    },
+                    "algorithm": {
+                        "type": "string",
+                        "description": "Hash algorithm: 'dhash' (fast, default) or 'phash' (more robust, requires numpy)",
+                        "enum": ["dhash", "phash"],
+                        "default": "dhash"
+                    }
+                },
+                "required": ["path"]
+            },
+            tier=ToolTier.READ_ONLY,
+            requires_confirmation=False,
+            supports_dry_run=False,
+            timeout_sec=300,
+            resource_class="cpu",
+        )
+        super().__init__(spec)
+    
+    def _lookup_chunk(self, paths: List[str], algorithm: str) -> Tuple[List[Tuple[str, FileKey, int]], Dict[FileKey, int]]:
+        entries = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, file_key(stat), stat.st_size))
+        return entries, photo_hash_index.get_many((key for _, key, _ in entries), algorithm)
+    
+    def _iter_hashes(self, photos: Iterator[str], algorithm: str, stats: Dict[str, int]) -> Iterator[Tuple[str, int, int]]:
+        """Yield (path, hash, size), hashing index misses across a bounded process pool."""
+        workers = settings.photo_workers or min(os.cpu_count() or 1, 8)
+        pool = None
+        
+        def finish(entries, hits, future):
+            hashed = dict(future.result()) if future else {}
+            new_entries = []
+            for path, key, size in entries:
+                if key in hits:
+                    stats["cached"] += 1
+                    yield path, hits[key], size
+                elif hashed.get(path) is not None:
+                    stats["hashed"] += 1
+                    new_entries.append((key, hashed[path]))
+                    yield path, hashed[path], size
+                else:
+                    stats["unreadable"] += 1
+            photo_hash_index.put_many(new_entries, algorithm)
+        
+        try:
+            pending = deque()
+            for paths in chunked(photos, _HASH_CHUNK_SIZE):
+                entries, hits = self._lookup_chunk(paths, algorithm)
+                missing = [path for path, key, _ in entries if key not in hits]
+                future = None
+                if missing:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=workers)
+                    future = pool.submit(_hash_photos, missing, algorithm)
+                pending.append((entries, hits, future))
+                while pending and (len(pending) >= workers * 2 or pending[0][2] is None):
+                    yield from finish(*pending.popleft())
+            while pending:
+                yield from finish(*pending.popleft())
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+    
+    def _group(self, photos: List[Tuple[str, int, int]], threshold: int) -> List[Dict[str, Any]]:
+        by_hash: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        for path, value, size in photos:
+            by_hash[value].append((path, size))
+        
+        # Union-find over distinct hashes; each is linked to every earlier
+        # hash within the threshold, found through the BK-tree.
+        parent = {value: value for value in by_hash}
+        
+        def find(value):
+            while parent[value] != value:
+                parent[value] = parent[parent[value]]
+                value = parent[value]
+            return value
+        
+        tree = BKTree()
+        max_distance: Dict[int, int] = defaultdict(int)
+        for value in by_hash:
+            for other, distance in tree.search(value, threshold):
+                root_a, root_b = find(value), find(other)
+                if root_a != root_b:
+                    parent[root_a] = root_b
+                max_distance[value] = max(max_distance[value], distance)
+                max_distance[other] = max(max_distance[other], distance)
+            tree.add(value)
+        
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for value in by_hash:
+            clusters[find(value)].append(value)
+        
+        groups = []
+        for members in clusters.values():
+            files = [item for value in members for item in by_hash[value]]
+            if len(files) < 2:
+                continue
+            files.sort(key=lambda item: item[1], reverse=True)
+            groups.append({
+                "count": len(files),
+                "max_distance": max(max_distance[value] for value in members),
+                "reclaimable_bytes": sum(size for _, size in files[1:]),
+                "files": [path for path, _ in files[:5]],
+            })
+        
+        groups.sort(key=lambda group: group["reclaimable_bytes"], reverse=True)
+        return groups
+    
+    def _format_size(self, size_bytes: float) -> str:
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if size_bytes < 1024:
+                return f"{size_bytes:.1f}{unit}"
+            size_bytes /= 1024
+        return f"{size_bytes:.1f}TB"
+    
+    def execute(self, args: Dict[str, Any], dry_run: bool = False) -> ToolResult:
+        path = args.get("path")
+        threshold = args.get("threshold", 6)
+        algorithm = args.get("algorithm", "dhash")
+        
+        if not path:
+            return ToolResult(
+                ok=False,
+                error_code="missing_path",
+                message="Path is required"
+            )
+        
+        try:
+            threshold = int(threshold)
+        except (TypeError, ValueError):
+            threshold = -1
+        if threshold < 0 or threshold > 16:
+            return ToolResult(
+                ok=False,
+                error_code="invalid_threshold",
+                message="threshold must be between 0 and 16"
+            )
+        
+        if algorithm not in HASH_FUNCTIONS:
+            return ToolResult(
+                ok=False,
+                error_code="invalid_algorithm",
+                message=f"Unknown algorithm '{algorithm}'. Use 'dhash' or 'phash'"
+            )
+        
+        if algorithm == "phash" and np is None:
+            return ToolResult(
+                ok=False,
+                error_code="numpy_not_installed",
+                message="phash requires numpy (pip install numpy); use algorithm 'dhash' instead"
+            )
+        
+        try:
+            base_path = path_validator.validate_read(path)
+            
+            if not base_path.is_dir():
+                return ToolResult(
+                    ok=False,
+                    error_code="not_a_directory",
+                    message=f"'{path}' is not a directory"
+                )
+            
+            stats = {"hashed": 0, "cached": 0, "unreadable": 0}
+            files = iter_photo_files(base_path)
+            photos = list(self._iter_hashes(
+                # range first, so zip stops without consuming a file past the limit
+                (p for _, p in zip(range(_MAX_PHOTOS), files)),
+                algorithm,
+                stats,
+            ))
+            truncated = next(files, None) is not None
+            if truncated:
+                logger.warning(f"find_similar_photos stopped at {_MAX_PHOTOS} photos in {base_path}")
+            groups = self._group(photos, threshold)
+            
+            reclaimable = sum(group["reclaimable_bytes"] for group in groups)
+            for group in groups:
+                group["reclaimable"] = self._format_size(group["reclaimable_bytes"])
+            
+            return ToolResult(
+                ok=True,
+                data={
+                    "scanned_path": str(base_path),
+                    "algorithm": algorithm,
+                    "threshold": threshold,
+                    "photos_scanned": len(photos),
+                    "hashes_computed": stats["hashed"],
+                    "hashes_cached": stats["cached"],
+                    "unreadable": stats["unreadable"],
+                    "similar_groups": len(groups),
+                    "total_similar_files": sum(group["count"] for group in groups),
+                    "total_reclaimable": self._format_size(reclaimable),
+                    "top_groups": groups[:_MAX_GROUPS],
+                    "truncated": truncated,
+                    "photo_limit": _MAX_PHOTOS,
+                }
+            )
+        
+        except Exception as e:
+            logger.error(f"find_similar_photos failed for {path}", exc_info=True)
+            return ToolResult(
+                ok=False,
+                error_code="similar_photos_error",
+                message=f"Failed to find similar photos: {str(e)}"
+            )
@@ -94,3 +94,101 @@ def test_tool_alias_resolution():
     assert TOOL_ALIASES["fd"] == "fd_command"
     assert "df" in TOOL_ALIASES
     assert TOOL_ALIASES["df"] == "df_command"
+
+
+async def test_execute_tool_async_runs_command_tools_on_the_loop(monkeypatch):
+    from src.toolchat.tools.registry import registry
+    from src.toolchat.tools.cmd.command_tool import CommandTool, CommandToolSpec
+    from src.toolchat.tools.base import ToolTier
+    
+    spec = CommandToolSpec(
+        name="async_echo_command",
+        description="Echo for async execution",
+        args_schema={"type": "object", "properties": {}},
+        tier=ToolTier.READ_ONLY,
+        binary="/bin/echo",
+        argv_template=["hello"],
+    )
+    monkeypatch.setitem(registry._tools, spec.name, CommandTool(spec))
+    router = ToolRouter()
+    
+    result, plan_id = await router.execute_tool_async("async_echo_command", {}, "test_session")
+    
+    assert result.ok is True
+    assert result.data["stdout"].strip() == "hello"
+    assert plan_id is None
+
+
+def test_read_only_results_are_cached_until_a_write(monkeypatch):
+    from src.toolchat.tools.registry import registry
+    from src.toolchat.tools.base import BaseTool, ToolSpec, ToolResult, ToolTier
+    from src.toolchat.agent import tool_router as router_module
+    from src.toolchat.agent.result_cache import ResultCache
+    
+    class CountingTool(BaseTool):
+        calls = 0
+        
+        def execute(self, args, dry_run=False):
+            CountingTool.calls += 1
+            return ToolResult(ok=True, data={"calls": CountingTool.calls})
+    
+    reader = CountingTool(ToolSpec(
+        name="cached_reader", description="", args_schema={},
+        tier=ToolTier.READ_ONLY, cache_ttl_sec=60,
+    ))
+    writer = CountingTool(ToolSpec(
+        name="uncached_writer", description="", args_schema={},
+        tier=ToolTier.WRITE_SAFE, cache_ttl_sec=60,
+    ))
+    monkeypatch.setitem(registry._tools, "cached_reader", reader)
+    monkeypatch.setitem(registry._tools, "uncached_writer", writer)
+    monkeypatch.setattr(router_module, "result_cache", ResultCache(max_entries=8))
+    audited = []
+    monkeypatch.setattr(router_module.audit_logger, "log_tool_execution", lambda **kwargs: audited.append(kwargs))
+    router = ToolRouter()
+    
+    first, _ = router.execute_tool("cached_reader", {}, "test_session")
+    second, _ = router.execute_tool("cached_reader", {}, "other_session")
+    assert first.data == second.data == {"calls": 1}
+    # The cache hit is still audited, for the session that asked
+    assert [(a["session_id"], a["action"]) for a in audited] == [("test_session", "execute"), ("other_session", "execute_cached")]
+    
+    # Write tools are never cached and invalidate earlier readings
+    router.execute_tool("uncached_writer", {}, "test_session")
+    router.execute_tool("uncached_writer", {}, "test_session")
+    assert CountingTool.calls == 3
+    
+    third, _ = router.execute_tool("cached_reader", {}, "test_session")
+    assert third.data == {"calls": 4}
+
+
+async def test_concurrent_identical_calls_share_one_execution(monkeypatch):
+    import asyncio
+    import time
+    from src.toolchat.tools.registry import registry
+    from src.toolchat.tools.base import BaseTool, ToolSpec, ToolResult, ToolTier
+    from src.toolchat.agent import tool_router as router_module
+    
+    calls = []
+    
+    class SlowScan(BaseTool):
+        def execute(self, args, dry_run=False):
+            calls.append(args)
+            time.sleep(0.2)
+            return ToolResult(ok=True, data={"bytes": 42})
+    
+    tool = SlowScan(ToolSpec(name="slow_scan", description="", args_schema={}))
+    monkeypatch.setitem(registry._tools, "slow_scan", tool)
+    audited = []
+    monkeypatch.setattr(router_module.audit_logger, "log_tool_execution", lambda **kwargs: audited.append(kwargs))
+    router = ToolRouter()
+    
+    results = await asyncio.gather(*[
+        router.execute_tool_async("slow_scan", {"path": "/mnt/server"}, f"session-{i}") for i in range(3)
+    ])
+    
+    assert len(calls) == 1
+    assert all(result.data == {"bytes": 42} for result, _ in results)
+    # Callers that joined the running scan are audited too
+    assert sorted(a["session_id"] for a in audited) == ["session-0", "session-1", "session-2"]
+    assert sorted(a["action"] for a in audited) == ["execute", "execute_coalesced", "execute_coalesced"]
@@ -0,0 +1,73 @@
+import os
+from pathlib import Path
+from src.toolchat.agent.arg_extractor import (
+    extract_args,
+    extract_host,
+    extract_lines,
+    extract_path,
+    extract_service,
+)
+from src.toolchat.agent.query_classifier import classify_query
+from src.toolchat.tools.cmd.specs_logs import create_journalctl_tool
+from src.toolchat.tools.cmd.specs_network import create_ping_tool
+from src.toolchat.tools.cmd.specs_system import create_systemctl_status_tool
+from src.toolchat.tools.directory_size import DirectorySizeTool
+from src.toolchat.tools.duplicates import DuplicateFinderTool
+
+
+def test_extract_path():
+    assert extract_path("how big is /mnt/data?") == "/mnt/data"
+    assert extract_path("duplicates in ~/Downloads/") == os.path.expanduser("~/Downloads")
+    assert extract_path('size of "/mnt/my photos"') == "/mnt/my photos"
+    assert extract_path("duplicates in my Downloads folder") == str(Path.home() / "Downloads")
+    assert extract_path("is swap and/or zram enabled") is None
+
+
+def test_extract_service():
+    assert extract_service("status of the nginx service") == "nginx"
+    assert extract_service("is docker.service running") == "docker"
+    assert extract_service("check service sshd") == "sshd"
+    assert extract_service("is the service running") is None
+
+
+def test_extract_lines_and_host():
+    assert extract_lines("show the last 50 journal entries") == 50
+    assert extract_lines("journal, last 200") == 200
+    assert extract_lines("show the journal") is None
+    assert extract_host("ping 192.168.1.10 please") == "192.168.1.10"
+    assert extract_host("is Example.org reachable") == "example.org"
+    assert extract_host("ping the router") is None
+
+
+def test_extract_args_fills_schema_properties():
+    schema = DirectorySizeTool().spec.args_schema
+    
+    assert extract_args("how big is /mnt/data, 2 levels deep", schema) == {"path": "/mnt/data", "depth": 2}
+    # path is required: without one the LLM has to decide
+    assert extract_args("how big is my home", schema) is None
+    assert extract_args("show the journal", create_journalctl_tool().spec.args_schema) == {}
+
+
+def test_path_queries_take_the_fast_path():
+    cases = [
+        ("how big is /mnt/data", DirectorySizeTool(), {"path": "/mnt/data"}),
+        ("find duplicates in ~/Downloads", DuplicateFinderTool(), {"path": os.path.expanduser("~/Downloads")}),
+        ("ping github.com", create_ping_tool(), {"host": "github.com"}),
+        ("status of the nginx service", create_systemctl_status_tool(), {"service": "nginx"}),
+        ("last 20 lines of the journal", create_journalctl_tool(), {"lines": 20}),
+    ]
+    
+    for query, tool, expected in cases:
+        requires_tool, tool_name = classify_query(query)
+        assert requires_tool and tool_name == tool.spec.name, query
+        args = extract_args(query, tool.spec.args_schema)
+        assert args == expected, query
+        assert tool.validate_args(args), query
+
+
+def test_target_patterns_need_a_target():
+    # Without a service, host or path the topical pattern still decides
+    assert classify_query("what's the status of dns") == (True, "resolvectl_command")
+    assert classify_query("how big is the journal") == (True, "journalctl_command")
+    assert classify_query("is the dns server reachable") == (True, "resolvectl_command")
+    assert classify_query("is 10.0.0.1 reachable") == (True, "ping_command")
@@ -0,0 +1,207 @@
+import json
+from src.toolchat.tools.cmd.parsers import (
+    parse_df, parse_free, parse_ps, parse_lsblk, parse_findmnt, parse_ip_addr, parse_ss,
+    parse_journal, parse_vmstat, parse_iostat, parse_sensors
+)
+from src.toolchat.tools.cmd.command_tool import CommandTool, CommandToolSpec
+from src.toolchat.tools.base import ToolTier
+from src.toolchat.agent.prompt import format_tool_result
+
+DF = """Filesystem     Type        1B-blocks        Used       Avail Use% Mounted on
+tmpfs          tmpfs      1677721600     2202009  1675519591   1% /run
+/dev/nvme0n1p2 ext4     982456795136 431644213248 501437497344  47% /
+/dev/sdb1      ext4    1979120929996 1319413953331 644245094400  67% /mnt/my data
+"""
+
+FREE = """               total        used        free      shared  buff/cache   available
+Mem:     33285996544 10522669056 12884901888  1181116006 10737418240 21474836480
+Swap:     2147483648           0  2147483648
+"""
+
+PS = """root           1  0.0  0.1 12000 Ss   /sbin/init splash
+alice       4242 37.5  4.2 700000 Sl   /usr/bin/python3 train.py --epochs 10
+"""
+
+LSBLK = {"blockdevices": [
+    {"name": "nvme0n1", "type": "disk", "fstype": None, "label": None, "size": 1024209543168,
+     "fsavail": None, "fsuse%": None, "mountpoint": None, "children": [
+        {"name": "nvme0n1p1", "type": "part", "fstype": "vfat", "label": None, "size": 536870912,
+         "fsavail": 530368512, "fsuse%": "1%", "mountpoint": "/boot/efi"},
+        {"name": "nvme0n1p2", "type": "part", "fstype": "ext4", "label": "root", "size": 1023671795712,
+         "fsavail": 501437497344, "fsuse%": "47%", "mountpoint": "/"},
+    ]},
+]}
+
+IP_ADDR = [
+    {"ifname": "lo", "operstate": "UNKNOWN", "address": "00:00:00:00:00:00", "mtu": 65536,
+     "addr_info": [{"family": "inet", "local": "127.0.0.1", "prefixlen": 8}]},
+    {"ifname": "eth0", "operstate": "UP", "address": "52:54:00:12:34:56", "mtu": 1500,
+     "addr_info": [{"family": "inet", "local": "192.168.1.20", "prefixlen": 24},
+                   {"family": "inet6", "local": "fe80::1", "prefixlen": 64}]},
+]
+
+SS = """tcp   LISTEN 0      4096       127.0.0.1:631       0.0.0.0:*    users:(("cupsd",pid=812,fd=7))
+udp   UNCONN 0      0            0.0.0.0:5353      0.0.0.0:*
+"""
+
+VMSTAT = """procs -----------memory---------- ---swap-- -----io---- -system-- ------cpu-----
+ r  b   swpd   free   buff  cache   si   so    bi    bo   in   cs us sy id wa st
+ 2  0      0 812344  10240 902100    0    0    12    30  150  300  5  2 92  1  0
+"""
+
+IOSTAT = """Linux 6.5.0 (host) 	10/19/2026 	_x86_64_	(8 CPU)
+
+avg-cpu:  %user   %nice %system %iowait  %steal   %idle
+           4,20    0,00    1,10    0,50    0,00   94,20
+
+Device            r/s     rkB/s   w/s     wkB/s  %util
+nvme0n1          5.10    120.00  3.20     64.00   1.30
+"""
+
+SENSORS = """k10temp-pci-00c3
+Adapter: PCI adapter
+Tctl:         +48.9°C
+
+nct6798-isa-0290
+Adapter: ISA adapter
+fan2:        1021 RPM  (min =    0 RPM)
+"""
+
+
+def test_parse_df_bytes():
+    records = parse_df(DF)
+    
+    assert [r["mount"] for r in records] == ["/run", "/", "/mnt/my data"]
+    assert records[1]["available_bytes"] == 501437497344
+    assert records[1]["use_percent"] == 47 and records[1]["fstype"] == "ext4"
+
+
+def test_parse_free_and_ps():
+    free = parse_free(FREE)
+    assert free["memory"]["available"] == 21474836480
+    assert free["memory"]["buff_cache"] == 10737418240
+    assert free["swap"]["used"] == 0
+    
+    ps = parse_ps(PS)
+    assert ps[1]["pid"] == 4242 and ps[1]["cpu_percent"] == 37.5
+    assert ps[1]["command"] == "/usr/bin/python3 train.py --epochs 10"
+
+
+def test_parse_json_documents():
+    lsblk = parse_lsblk(LSBLK)
+    assert [(d["name"], d["depth"]) for d in lsblk] == [("nvme0n1", 0), ("nvme0n1p1", 1), ("nvme0n1p2", 1)]
+    assert lsblk[2]["fsuse_percent"] == 47 and lsblk[2]["size_bytes"] == 1023671795712
+    assert lsblk[0]["fsuse_percent"] is None
+    
+    findmnt = parse_findmnt({"filesystems": [
+        {"target": "/", "source": "/dev/sda1", "fstype": "ext4", "options": "rw",
+         "children": [{"target": "/proc", "source": "proc", "fstype": "proc", "options": "rw"}]},
+    ]})
+    assert [m["target"] for m in findmnt] == ["/", "/proc"]
+    
+    interfaces = parse_ip_addr(IP_ADDR)
+    assert interfaces[1]["ipv4"] == ["192.168.1.20/24"] and interfaces[1]["ipv6"] == ["fe80::1/64"]
+    
+    journal = parse_journal([
+        {"__REALTIME_TIMESTAMP": "1700000000000000", "_SYSTEMD_UNIT": "ssh.service", "PRIORITY": "3", "MESSAGE": "boom"},
+        {"SYSLOG_IDENTIFIER": "kernel", "MESSAGE": [104, 105, 255]},
+    ])
+    assert journal[0]["unit"] == "ssh.service" and journal[0]["priority"] == 3
+    assert journal[1]["message"] == "hi\ufffd" and journal[1]["timestamp"] is None
+
+
+def test_parse_ss_vmstat_iostat_sensors():
+    ss = parse_ss(SS)
+    assert ss[0]["process"] == "cupsd" and ss[0]["pid"] == 812
+    assert ss[1]["process"] is None
+    
+    assert parse_vmstat(VMSTAT)["cs"] == 300
+    
+    iostat = parse_iostat(IOSTAT)
+    assert iostat["cpu"]["iowait"] == 0.5
+    assert iostat["devices"][0]["r/s"] == 5.1
+    
+    chips = parse_sensors(SENSORS)
+    assert chips[0]["temperatures"] == {"Tctl": 48.9}
+    assert chips[1]["fans"] == {"fan2": 1021}
+
+
+def test_format_uses_parsed_records():
+    result = {"ok": True, "data": {"stdout": DF, "exit_code": 0, "records": parse_df(DF)}}
+    text = format_tool_result("df_command", result)
+    assert "main system (root): 467.0GB free out of 915.0GB total (47% used)" in text
+    assert "/run" not in text
+    assert "across 2 filesystems" in text
+    
+    # Container roots are overlay mounts and must still be reported
+    overlay = "Filesystem Type 1B-blocks Used Avail Use% Mounted on\noverlay overlay 1000000000 400000000 600000000 40% /\n"
+    result = {"ok": True, "data": {"stdout": overlay, "exit_code": 0, "records": parse_df(overlay)}}
+    assert "main system (root)" in format_tool_result("df_command", result)
+    
+    result = {"ok": True, "data": {"stdout": PS, "exit_code": 0, "records": parse_ps(PS)}}
+    text = format_tool_result("ps_command", result)
+    assert text.splitlines()[1].startswith("• /usr/bin/python3 train.py")
+    
+    result = {"ok": True, "data": {"stdout": SENSORS, "exit_code": 0, "records": parse_sensors(SENSORS)}}
+    assert format_tool_result("sensors_command", result) == "CPU temperature: 48.9°C (Tctl: 48.9°C)"
+    # Aliases the model may call resolve to the same formatter
+    assert format_tool_result("sensors", result) == "CPU temperature: 48.9°C (Tctl: 48.9°C)"
+
+    result = {"ok": True, "data": {"stdout": json.dumps(IP_ADDR), "exit_code": 0, "records": parse_ip_addr(IP_ADDR)}}
+    assert format_tool_result("ip_addr_command", result).startswith("Primary IP: 192.168.1.20.")
+
+
+def test_command_tool_ingests_json(monkeypatch):
+    from src.toolchat.tools.cmd import command_tool
+    
+    spec = CommandToolSpec(
+        name="test_json",
+        description="JSON test",
+        args_schema={"type": "object", "properties": {}},
+        tier=ToolTier.READ_ONLY,
+        binary="/usr/bin/true",
+        argv_template=[],
+        output_format="json_lines",
+    )
+    stdout = '{"a": 1}\n{"a": 2}\n{"a": '
+    monkeypatch.setattr(command_tool.command_runner, "run_command", lambda **kwargs: {"ok": True, "stdout": stdout, "exit_code": 0})
+    
+    result = CommandTool(spec).execute({})
+    
+    # The line cut short by the output cap is dropped
+    assert result.data["records"] == [{"a": 1}, {"a": 2}]
+    
+    spec.output_format = "json"
+    result = CommandTool(spec).execute({})
+    assert result.ok is True and "records" not in result.data
+
+
+def test_json_tools_report_truncated_output(monkeypatch):
+    from src.toolchat.tools.cmd import command_tool
+    from src.toolchat.tools.cmd.specs_network import create_ip_addr_tool
+    from src.toolchat.tools.cmd.specs_logs import create_journalctl_tool
+    
+    stdout = json.dumps(IP_ADDR)[:150]
+    monkeypatch.setattr(command_tool.command_runner, "run_command", lambda **kwargs: {"ok": True, "stdout": stdout, "exit_code": 0, "truncated": True})
+    result = create_ip_addr_tool().execute({})
+    
+    text = format_tool_result("ip_addr_command", {"ok": True, "data": result.data})
+    assert "truncated" in text and "No IP addresses" not in text
+    
+    entry = {"__REALTIME_TIMESTAMP": "1700000000000000", "_SYSTEMD_UNIT": "ssh.service", "PRIORITY": "6", "MESSAGE": "started"}
+    stdout = json.dumps(entry) + "\n" + json.dumps(entry)[:40]
+    result = create_journalctl_tool().execute({"lines": 2})
+    
+    text = format_tool_result("journalctl_command", {"ok": True, "data": result.data})
+    assert "(1 entries, showing last 1)" in text and "most recent entries are missing" in text
+
+
+def test_format_falls_back_without_records():
+    result = {"ok": True, "data": {"stdout": FREE, "exit_code": 0}}
+    assert format_tool_result("free_command", result).startswith("Memory info:")
+
+    result = {"ok": True, "data": {"stdout": "hello\n", "exit_code": 0}}
+    assert format_tool_result("unknown_command", result) == "Command output:\nhello"
+    
+    result = {"ok": False, "message": "boom"}
+    assert format_tool_result("df_command", result) == "Tool 'df_command' failed. Error: boom"
@@ -1,3 +1,5 @@
+import asyncio
+import time
 import pytest
 from src.toolchat.tools.cmd.cmd_runner import CommandRunner
 
@@ -35,3 +37,118 @@ def test_command_runner_invalid_command():
     )
     
     assert result["ok"] is False
+
+
+async def test_async_commands_run_concurrently():
+    runner = CommandRunner()
+    
+    started = time.monotonic()
+    results = await asyncio.gather(*[
+        runner.run_command_async(command=["sleep", "1"], timeout=5) for _ in range(4)
+    ])
+    
+    assert all(r["ok"] for r in results)
+    assert time.monotonic() - started < 3
+
+
+async def test_async_timeout_kills_process_group(tmp_path):
+    runner = CommandRunner()
+    pid_file = tmp_path / "child.pid"
+    
+    result = await runner.run_command_async(
+        command=["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"],
+        timeout=1
+    )
+    
+    assert result["ok"] is False
+    assert "timed out" in result["stderr"].lower()
+    assert not _is_running(int(pid_file.read_text()))
+
+
+def test_sync_timeout_kills_process_group(tmp_path):
+    runner = CommandRunner()
+    pid_file = tmp_path / "child.pid"
+    
+    result = runner.run_command(
+        command=["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"],
+        timeout=1
+    )
+    
+    assert result["ok"] is False
+    assert not _is_running(int(pid_file.read_text()))
+
+
+def test_output_cap_stops_the_command():
+    runner = CommandRunner()
+    
+    started = time.monotonic()
+    result = runner.run_command(
+        command=["yes"],
+        timeout=10,
+        max_output_bytes=1000
+    )
+    
+    assert result["ok"] is True
+    assert result["truncated"] is True
+    assert len(result["stdout"]) == 1000
+    assert time.monotonic() - started < 5
+
+
+def test_output_cap_cuts_at_a_character_boundary():
+    runner = CommandRunner()
+    
+    # Each "é" is two bytes, so an odd cap splits the last character
+    result = runner.run_command(
+        command=["printf", "é" * 100],
+        timeout=5,
+        max_output_bytes=51
+    )
+    
+    assert result["truncated"] is True
+    assert result["stdout"] == "é" * 25
+
+
+def test_on_output_receives_chunks():
+    runner = CommandRunner()
+    chunks = []
+    
+    result = runner.run_command(
+        command=["sh", "-c", "echo one; sleep 0.2; echo two"],
+        timeout=5,
+        on_output=chunks.append
+    )
+    
+    assert result["ok"] is True
+    assert "".join(chunks) == result["stdout"] == "one\ntwo\n"
+
+
+async def test_async_output_cap_and_streaming():
+    runner = CommandRunner()
+    chunks = []
+    
+    result = await runner.run_command_async(
+        command=["yes"],
+        timeout=10,
+        max_output_bytes=1000,
+        on_output=chunks.append
+    )
+    
+    assert result["ok"] is True
+    assert result["truncated"] is True
+    assert "".join(chunks) == result["stdout"]
+    assert len(result["stdout"]) == 1000
+
+
+def _is_running(pid: int) -> bool:
+    # The orphaned grandchild may linger as a zombie until init reaps it
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                state = f.read().rsplit(")", 1)[1].split()[0]
+        except FileNotFoundError:
+            return False
+        if state == "Z":
+            return False
+        time.sleep(0.05)
+    return True
@@ -1,4 +1,5 @@
 import pytest
+import subprocess
 from pathlib import Path
 from src.toolchat.tools.exiftool_helper import ExifToolHelper
 
@@ -29,3 +30,16 @@ def test_get_metadata_no_file():
     result = helper.get_metadata(Path("/nonexistent/file.jpg"))
     
     assert result is None
+
+
+def test_get_dates_taken_signals_a_failed_batch(monkeypatch):
+    helper = ExifToolHelper()
+    helper.exiftool_available = True
+    
+    def timeout(*args, **kwargs):
+        raise subprocess.TimeoutExpired(args[0], kwargs.get("timeout"))
+    
+    monkeypatch.setattr(subprocess, "run", timeout)
+    
+    assert helper.get_dates_taken([Path("/photos/a.jpg")]) is None
+    assert helper.get_dates_taken([]) == {}
@@ -0,0 +1,137 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import pytest
+from pathlib import Path
+from src.toolchat.tools.file_mover import FileMover
+
+
+def _write(path: Path, data: bytes = b"photo-bytes") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_move_all_renames_and_resolves_collisions(tmp_path):
+    a = _write(tmp_path / "in" / "a.jpg", b"a")
+    b = _write(tmp_path / "in" / "sub" / "a.jpg", b"b")
+    _write(tmp_path / "out" / "a.jpg", b"existing")
+    
+    mover = FileMover(workers=2, batch_size=1)
+    journal = tmp_path / "out" / ".journal"
+    results = list(mover.move_all([(a, tmp_path / "out" / "a.jpg"), (b, tmp_path / "out" / "a.jpg")], journal))
+    
+    assert [dest.name for _, dest, _ in results] == ["a_1.jpg", "a_2.jpg"]
+    assert all(error is None for _, _, error in results)
+    assert (tmp_path / "out" / "a.jpg").read_bytes() == b"existing"
+    assert (tmp_path / "out" / "a_2.jpg").read_bytes() == b"b"
+    assert mover.stats["renamed"] == 2
+    assert not journal.exists()
+
+
+def test_move_all_cross_device_copy(tmp_path):
+    if not os.path.isdir("/dev/shm") or os.stat("/dev/shm").st_dev == os.stat(tmp_path).st_dev:
+        pytest.skip("no second filesystem available")
+    
+    with tempfile.TemporaryDirectory(dir="/dev/shm") as other:
+        source = _write(Path(other) / "big.jpg", os.urandom(300_000))
+        os.utime(source, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+        data = source.read_bytes()
+        dest = tmp_path / "out" / "big.jpg"
+        
+        mover = FileMover()
+        results = list(mover.move_all([(source, dest)], tmp_path / "out" / ".journal"))
+        
+        assert results[0][2] is None
+        assert not source.exists()
+        assert dest.read_bytes() == data
+        assert dest.stat().st_mtime_ns == 1_600_000_000_000_000_000
+        assert mover.stats["copied"] == 1
+        assert mover.stats["bytes_copied"] == len(data)
+
+
+def test_recover_finishes_interrupted_copy(tmp_path):
+    source = _write(tmp_path / "in" / "a.jpg")
+    dest = _write(tmp_path / "out" / "a.jpg")
+    pending = _write(tmp_path / "in" / "b.jpg")
+    partial = _write(tmp_path / "out" / ".b.jpg.partial")
+    journal = tmp_path / "out" / ".journal"
+    journal.write_text(
+        json.dumps(["B", str(source), str(dest)]) + "\n"
+        + json.dumps(["B", str(pending), str(tmp_path / "out" / "b.jpg")]) + "\n"
+        + '["D", "torn'
+    )
+    
+    assert FileMover.recover(journal) == 2
+    
+    assert not source.exists()
+    assert dest.exists()
+    assert pending.exists()
+    assert not partial.exists()
+    assert not journal.exists()
+
+
+def test_move_all_reports_a_source_it_could_not_remove(tmp_path, monkeypatch):
+    source = _write(tmp_path / "in" / "a.jpg")
+    dest = tmp_path / "out" / "a.jpg"
+    mover = FileMover()
+    
+    def copy_only(src, dst):
+        shutil.copy2(src, dst)
+        return "copy", src.stat().st_size
+    
+    real_unlink = os.unlink
+    
+    def unlink(path, *args, **kwargs):
+        if Path(path) == source:
+            raise PermissionError(13, "Permission denied")
+        return real_unlink(path, *args, **kwargs)
+    
+    monkeypatch.setattr(mover, "_move_one", copy_only)
+    monkeypatch.setattr(os, "unlink", unlink)
+    results = list(mover.move_all([(source, dest)], tmp_path / "out" / ".journal"))
+    
+    assert "could not remove the original" in results[0][2]
+    assert source.exists() and dest.exists()
+    assert mover.stats["copied"] == 0
+    assert mover.stats["failed"] == 1
+
+
+def test_recover_removes_the_journal_when_a_source_cannot_be_removed(tmp_path, monkeypatch):
+    source = _write(tmp_path / "in" / "a.jpg")
+    dest = _write(tmp_path / "out" / "a.jpg")
+    journal = tmp_path / "out" / ".journal"
+    journal.write_text(json.dumps(["B", str(source), str(dest)]) + "\n")
+    
+    def unlink(self, missing_ok=False):
+        if self == source:
+            raise PermissionError(13, "Permission denied")
+        return real_unlink(self, missing_ok=missing_ok)
+    
+    real_unlink = Path.unlink
+    monkeypatch.setattr(Path, "unlink", unlink)
+    FileMover.recover(journal)
+    
+    assert source.exists()
+    assert not journal.exists()
+
+
+def test_runs_sharing_a_journal_take_turns(tmp_path):
+    first = [(_write(tmp_path / "in" / f"a{i}.jpg"), tmp_path / "out" / f"a{i}.jpg") for i in range(2)]
+    second = [(_write(tmp_path / "in" / "b.jpg"), tmp_path / "out" / "b.jpg")]
+    journal = tmp_path / "out" / ".journal"
+    
+    running = FileMover(batch_size=1).move_all(first, journal)
+    next(running)  # holds the journal lock until the generator finishes
+    finished = threading.Event()
+    thread = threading.Thread(target=lambda: (list(FileMover().move_all(second, journal)), finished.set()))
+    thread.start()
+    
+    assert not finished.wait(0.3)
+    list(running)
+    assert finished.wait(5)
+    thread.join()
+    assert (tmp_path / "out" / "b.jpg").exists()
+    assert not journal.exists()
@@ -0,0 +1,134 @@
+import shutil
+import subprocess
+import pytest
+from src.toolchat.tools import nvml
+
+# Minimal stand-in for libnvidia-ml: two GPUs, the second without power readings
+FAKE_NVML_SOURCE = r"""
+#include <string.h>
+
+typedef struct { unsigned int gpu; unsigned int memory; } util_t;
+typedef struct { unsigned long long total; unsigned long long free; unsigned long long used; } mem_t;
+
+int init_calls = 0;
+int handle_calls = 0;
+
+int nvmlInit_v2(void) { init_calls++; return 0; }
+int nvmlShutdown(void) { return 0; }
+int nvmlDeviceGetCount_v2(unsigned int *count) { *count = 2; return 0; }
+
+int nvmlDeviceGetHandleByIndex_v2(unsigned int index, void **handle) {
+    handle_calls++;
+    *handle = (void *)(unsigned long)(index + 1);
+    return 0;
+}
+
+int nvmlDeviceGetName(void *handle, char *name, unsigned int length) {
+    strncpy(name, (unsigned long)handle == 1 ? "Fake RTX 4090" : "Fake T4", length);
+    return 0;
+}
+
+int nvmlDeviceGetTemperature(void *handle, int sensor, unsigned int *temp) {
+    *temp = 60 + (unsigned int)(unsigned long)handle;
+    return 0;
+}
+
+int nvmlDeviceGetUtilizationRates(void *handle, util_t *util) {
+    util->gpu = 42;
+    util->memory = 7;
+    return 0;
+}
+
+int nvmlDeviceGetMemoryInfo(void *handle, mem_t *mem) {
+    mem->total = 24ULL * 1024 * 1024 * 1024;
+    mem->used = 1536ULL * 1024 * 1024;
+    mem->free = mem->total - mem->used;
+    return 0;
+}
+
+int nvmlDeviceGetPowerUsage(void *handle, unsigned int *milliwatts) {
+    if ((unsigned long)handle == 2) return 3; /* NVML_ERROR_NOT_SUPPORTED */
+    *milliwatts = 215500;
+    return 0;
+}
+"""
+
+
+@pytest.fixture
+def fake_nvml(tmp_path, monkeypatch):
+    compiler = shutil.which("cc") or shutil.which("gcc")
+    if compiler is None:
+        pytest.skip("C compiler not available to build the fake NVML library")
+
+    source = tmp_path / "fake_nvml.c"
+    library = tmp_path / "libfake-nvml.so"
+    source.write_text(FAKE_NVML_SOURCE)
+    subprocess.run([compiler, "-shared", "-fPIC", "-o", str(library), str(source)], check=True)
+
+    monkeypatch.setattr(nvml.settings, "nvml_library", str(library))
+    nvml.reset_gpu_backend()
+    yield library
+    nvml.reset_gpu_backend()
+
+
+def test_nvml_backend_reads_typed_values(fake_nvml):
+    backend = nvml.get_gpu_backend()
+
+    assert backend.name == "nvml"
+    gpus = backend.read()
+    assert gpus[0] == {
+        "index": 0,
+        "name": "Fake RTX 4090",
+        "temperature_c": 61,
+        "utilization_percent": 42,
+        "memory_used_mb": 1536,
+        "memory_total_mb": 24576,
+        "power_draw_w": 215.5,
+    }
+    # Unsupported queries come back as None instead of failing the whole read
+    assert gpus[1]["power_draw_w"] is None
+    assert gpus[1]["temperature_c"] == 62
+
+
+def test_nvml_backend_initialises_once(fake_nvml):
+    import ctypes
+
+    backend = nvml.get_gpu_backend()
+    for _ in range(5):
+        backend.read()
+
+    assert nvml.get_gpu_backend() is backend
+    assert ctypes.c_int.in_dll(backend._lib, "init_calls").value == 1
+    assert ctypes.c_int.in_dll(backend._lib, "handle_calls").value == 2
+
+
+def test_gpu_tool_and_metrics_use_backend(fake_nvml):
+    from src.toolchat.tools.gpu import GPUTemperatureTool, gpu_metrics
+
+    result = GPUTemperatureTool().execute({})
+
+    assert result.ok is True
+    assert result.data["backend"] == "nvml"
+    assert result.data["gpu_count"] == 2
+    metrics = gpu_metrics()
+    assert metrics["gpu0.power_draw_w"] == 215.5
+    assert "gpu1.power_draw_w" not in metrics
+
+
+def test_falls_back_to_nvidia_smi(tmp_path, monkeypatch):
+    monkeypatch.setattr(nvml.settings, "nvml_library", str(tmp_path / "missing.so"))
+    monkeypatch.setattr(nvml.shutil, "which", lambda name: "/usr/bin/nvidia-smi")
+    monkeypatch.setattr(nvml.subprocess, "run", lambda *a, **kw: subprocess.CompletedProcess(
+        a[0], 0, stdout="0, Fake GPU, 55, 3, 512, 8192, [N/A]\n", stderr=""
+    ))
+    nvml.reset_gpu_backend()
+    try:
+        backend = nvml.get_gpu_backend()
+        gpus = backend.read()
+    finally:
+        nvml.reset_gpu_backend()
+
+    assert backend.name == "nvidia-smi"
+    assert gpus[0]["temperature_c"] == 55
+    assert gpus[0]["memory_total_mb"] == 8192
+    assert gpus[0]["power_draw_w"] is None
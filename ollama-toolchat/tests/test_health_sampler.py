@@ -0,0 +1,63 @@
+import os
+import time
+from src.toolchat.infra.sampler import HealthSampler
+
+
+def _burn_cpu(seconds: float):
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+
+
+def test_first_sample_is_baseline_only():
+    sampler = HealthSampler(interval=60, history=4)
+    
+    assert sampler.sample() is None
+    assert sampler.history() == []
+
+
+def test_sample_reports_per_process_cpu_delta():
+    sampler = HealthSampler(interval=60, history=4)
+    sampler.sample()
+    _burn_cpu(0.3)
+    sample = sampler.sample()
+    
+    assert 0 <= sample["cpu_percent"] <= 100
+    ours = [p for p in sample["top_cpu_processes"] if p["pid"] == os.getpid()]
+    # psutil's own cpu_percent reports 0.0 here because it has no previous call
+    assert ours and ours[0]["cpu_percent"] > 10
+    assert sample["memory_total_gb"] > 0
+
+
+def test_process_missed_last_sample_is_not_measured():
+    sampler = HealthSampler(interval=60, history=4)
+    sampler.sample()
+    # As if our cpu_times could not be read last time
+    sampler._prev_procs = {key: cpu for key, cpu in sampler._prev_procs.items() if key[0] != os.getpid()}
+    _burn_cpu(0.1)
+    sample = sampler.sample()
+    
+    # Its lifetime CPU would otherwise be reported as this interval's
+    assert os.getpid() not in [p["pid"] for p in sample["top_cpu_processes"]]
+
+
+def test_ring_buffer_keeps_latest_samples():
+    sampler = HealthSampler(interval=60, history=2)
+    sampler.sample()
+    for _ in range(3):
+        sampler.sample()
+    
+    assert len(sampler.history()) == 2
+    assert sampler.latest() is sampler.history()[-1]
+
+
+def test_latest_starts_sampler_on_demand():
+    sampler = HealthSampler(interval=0.05, history=4)
+    try:
+        sample = sampler.latest(timeout=5)
+        assert sample is not None
+        assert sampler.running
+    finally:
+        sampler.stop()
+    
+    assert not sampler.running
@@ -0,0 +1,105 @@
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.toolchat.agent.intent_router import EmbeddingCache, IntentRouter
+from src.toolchat.agent.ollama_client import OllamaClient
+
+np = pytest.importorskip("numpy")
+
+INTENTS = {
+    "free_command": ["how much memory is free", "am I out of RAM"],
+    "df_command": ["how much disk space is left", "is my drive full"],
+}
+
+
+def _bag_of_words(text, dims=64):
+    vector = [0.0] * dims
+    for word in text.lower().split():
+        vector[zlib.crc32(word.encode()) % dims] += 1.0
+    return vector
+
+
+@pytest.fixture
+def embed_server():
+    """Stand-in for Ollama's /api/embed: bag-of-words vectors, requests recorded."""
+    requests = []
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests.append(body)
+            reply = json.dumps({"model": body["model"], "embeddings": [_bag_of_words(t) for t in body["input"]]})
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(reply.encode())
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests
+    server.shutdown()
+    server.server_close()
+
+
+def _router(url, tmp_path, **kwargs):
+    return IntentRouter(
+        client=OllamaClient(base_url=url),
+        model="fake-embed",
+        threshold=0.8,
+        intents=INTENTS,
+        cache=EmbeddingCache(str(tmp_path / "embeddings.db")),
+        **kwargs,
+    )
+
+
+def test_routes_paraphrase_to_nearest_tool(embed_server, tmp_path):
+    url, requests = embed_server
+    router = _router(url, tmp_path)
+    
+    match = router.route("is my drive almost full")
+    
+    assert match.tool == "df_command"
+    assert match.text == "is my drive full"
+    assert match.score > 0.8
+    assert requests[0]["model"] == "fake-embed"
+    assert [m.tool for m in router.search("is my drive almost full", k=4)][0] == "df_command"
+
+
+def test_below_threshold_is_left_to_the_llm(embed_server, tmp_path):
+    url, _ = embed_server
+    router = _router(url, tmp_path)
+    
+    assert router.route("tell me a joke") is None
+    assert router.ready
+
+
+def test_index_embeddings_are_cached_on_disk(embed_server, tmp_path):
+    url, requests = embed_server
+    _router(url, tmp_path).route("am I out of memory")
+    assert len(requests[0]["input"]) == 4
+    
+    requests.clear()
+    router = _router(url, tmp_path)
+    assert router.route("am I out of RAM now").tool == "free_command"
+    # Only the query itself was embedded
+    assert [r["input"] for r in requests] == [["am I out of RAM now"]]
+
+
+def test_unavailable_server_falls_back_and_backs_off(tmp_path):
+    router = IntentRouter(
+        client=OllamaClient(base_url="http://127.0.0.1:9"),
+        model="fake-embed",
+        intents=INTENTS,
+        cache=EmbeddingCache(str(tmp_path / "embeddings.db")),
+        retry_after=60,
+    )
+    
+    assert router.route("is my drive full") is None
+    assert not router.ready
+    assert router._unavailable_until > 0
+    assert router.prepare() is False
@@ -0,0 +1,73 @@
+import pytest
+from src.toolchat.infra.metrics_store import MetricsStore, parse_duration
+
+T0 = 1_700_000_000
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MetricsStore(db_path=str(tmp_path / "metrics.db"))
+
+
+def test_parse_duration():
+    assert parse_duration("90s") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("2h") == 7200
+    assert parse_duration("7d") == 7 * 86400
+    assert parse_duration("45") == 45
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+
+def test_query_min_avg_max_over_window(store):
+    for i in range(360):
+        store.record({"memory.percent": 40.0 + (i % 10)}, T0 + i * 10)
+    
+    history = store.query("memory.percent", T0, T0 + 3600, max_points=6, now=T0 + 3600)
+    
+    assert history["resolution_sec"] == 10
+    assert history["samples"] == 360
+    assert (history["min"], history["avg"], history["max"]) == (40.0, 44.5, 49.0)
+    assert len(history["points"]) <= 7
+
+
+def test_old_windows_use_downsampled_tier(store):
+    store.record({"cpu.percent": 10.0}, T0)
+    store.record({"cpu.percent": 90.0}, T0 + 30)
+    
+    # A week later only the hourly tier still covers the window
+    history = store.query("cpu.percent", T0 - 60, T0 + 600, now=T0 + 7 * 86400)
+    
+    assert history["resolution_sec"] == 3600
+    assert (history["min"], history["avg"], history["max"]) == (10.0, 50.0, 90.0)
+
+
+def test_non_finite_values_are_skipped(store):
+    store.record({"gpu0.power_w": float("nan"), "cpu.percent": 5.0}, T0)
+    
+    assert store.list_metrics() == ["cpu.percent"]
+
+
+def test_metrics_history_tool_reads_store(store, monkeypatch):
+    import time
+    from src.toolchat.tools import metrics_history
+    from src.toolchat.tools.metrics_history import MetricsHistoryTool
+    
+    monkeypatch.setattr(metrics_history, "metrics_store", store)
+    now = time.time()
+    store.record({"memory.percent": 91.0}, now - 3600)
+    store.record({"memory.percent": 35.0}, now - 60)
+    
+    tool = MetricsHistoryTool()
+    hour_ago = tool.execute({"metric": "memory.percent", "window": "30m", "end_ago": "45m"})
+    recent = tool.execute({"metric": "memory.percent", "window": "10m"})
+    missing = tool.execute({"metric": "memory.percent", "window": "10m", "end_ago": "3h"})
+    
+    assert hour_ago.ok is True and hour_ago.data["max"] == 91.0
+    assert recent.ok is True and recent.data["max"] == 35.0
+    assert missing.ok is False and missing.error_code == "no_metric_data"
+    
+    as_text = tool.execute({"metric": "memory.percent", "window": "10m", "points": "3"})
+    bad_points = tool.execute({"metric": "memory.percent", "window": "10m", "points": "many"})
+    assert as_text.ok is True
+    assert bad_points.ok is False and bad_points.error_code == "invalid_arguments"
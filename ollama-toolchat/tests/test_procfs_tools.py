@@ -0,0 +1,112 @@
+import os
+import pytest
+from src.toolchat.tools import procfs
+from src.toolchat.tools.procfs import MemoryInfoTool, UptimeTool, VmstatTool, UnameTool, WhoamiTool, PROCFS_TOOLS
+from src.toolchat.tools.base import ToolTier
+from src.toolchat.agent.formatters import render_direct_answer
+
+MEMINFO = """MemTotal:       16000000 kB
+MemFree:         2000000 kB
+MemAvailable:    9000000 kB
+Buffers:          500000 kB
+Cached:          6000000 kB
+SReclaimable:     500000 kB
+SwapTotal:       4000000 kB
+SwapFree:        3000000 kB
+"""
+
+
+@pytest.fixture
+def fake_proc(tmp_path, monkeypatch):
+    (tmp_path / "meminfo").write_text(MEMINFO)
+    (tmp_path / "uptime").write_text("200000.50 190000.00\n")
+    (tmp_path / "loadavg").write_text("0.50 1.25 2.00 3/812 12345\n")
+    (tmp_path / "stat").write_text(
+        "cpu  600 0 200 1000 200 0 0 0 0 0\n"
+        "cpu0 600 0 200 1000 200 0 0 0 0 0\n"
+        "intr 4000000 1 2 3\n"
+        "ctxt 8000000\n"
+        "btime 1700000000\n"
+        "procs_running 2\n"
+        "procs_blocked 1\n"
+    )
+    (tmp_path / "vmstat").write_text("pgpgin 400000\npgpgout 200000\npswpin 0\npswpout 0\npgmajfault 17\n")
+    monkeypatch.setattr(procfs, "PROC", tmp_path)
+    return tmp_path
+
+
+def test_procfs_tools_are_read_only():
+    names = {tool_class().spec.name for tool_class in PROCFS_TOOLS}
+    
+    assert names == {"free_command", "uptime_command", "vmstat_command", "hostname_command", "uname_command", "whoami_command"}
+    assert all(tool_class().spec.tier == ToolTier.READ_ONLY for tool_class in PROCFS_TOOLS)
+
+
+def test_memory_info_matches_free_definitions(fake_proc):
+    result = MemoryInfoTool().execute({})
+    
+    assert result.ok is True
+    memory = result.data["memory"]
+    assert memory["total_bytes"] == 16000000 * 1024
+    # used = total - free - buffers - (cached + SReclaimable)
+    assert memory["used_bytes"] == (16000000 - 2000000 - 500000 - 6500000) * 1024
+    assert memory["available_bytes"] == 9000000 * 1024
+    assert result.data["swap"]["used_bytes"] == 1000000 * 1024
+
+
+def test_uptime_and_load(fake_proc):
+    data = UptimeTool().execute({}).data
+    
+    assert data["uptime"] == "2 days, 7:33"
+    assert data["load_average"] == {"1m": 0.5, "5m": 1.25, "15m": 2.0}
+    assert (data["tasks_running"], data["tasks_total"]) == (3, 812)
+
+
+def test_vmstat_rates_since_boot(fake_proc):
+    data = VmstatTool().execute({}).data
+    
+    assert data["procs_running"] == 2 and data["procs_blocked"] == 1
+    assert data["context_switches_per_sec"] == 40.0
+    assert data["cpu_percent"]["idle"] == 50.0
+    assert data["cpu_percent"]["iowait"] == 10.0
+
+
+def test_missing_proc_file_is_an_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(procfs, "PROC", tmp_path)
+    
+    result = MemoryInfoTool().execute({})
+    
+    assert result.ok is False
+    assert result.error_code == "procfs_error"
+
+
+def test_uname_and_whoami_use_syscalls():
+    assert UnameTool().execute({}).data["kernel_release"] == os.uname().release
+    assert WhoamiTool().execute({}).data["uid"] == os.geteuid()
+
+
+def test_direct_answers_render_from_results(fake_proc):
+    memory = MemoryInfoTool()
+    uptime = UptimeTool()
+    
+    assert render_direct_answer(memory.spec.direct_answer, memory.execute({}).data) == (
+        "You have **8.6GB** of memory available out of 15.3GB (43.8% in use). Swap: 976.6MB used of 3.8GB."
+    )
+    assert render_direct_answer(uptime.spec.direct_answer, uptime.execute({}).data).startswith(
+        "The system has been up for **2 days, 7:33**"
+    )
+    whoami = WhoamiTool()
+    assert f"(uid {os.geteuid()})" in render_direct_answer(whoami.spec.direct_answer, whoami.execute({}).data)
+
+
+def test_direct_answer_needs_every_field():
+    template = UnameTool().spec.direct_answer
+    data = {"sysname": "Linux", "kernel_release": "6.8.0", "machine": "x86_64"}
+    
+    # No os-release: let the LLM summarize instead
+    assert render_direct_answer(template, data) is None
+    assert render_direct_answer(template, {**data, "os": "Ubuntu 24.04"}) == (
+        "This machine runs **Ubuntu 24.04** with the Linux kernel 6.8.0 (x86_64)."
+    )
+    assert render_direct_answer("Hostname: {stdout}", {"stdout": "  \n"}) is None
+    assert render_direct_answer("Hostname: {stdout}", "not a dict") is None
@@ -0,0 +1,61 @@
+"""
+Tests for the phrase matcher behind the query classifier
+"""
+
+from src.toolchat.agent.phrase_matcher import PhraseMatcher
+from src.toolchat.agent.query_classifier import classify_query, get_auto_response_type, is_auto_response
+
+
+def test_matcher_finds_overlapping_phrases_in_one_pass():
+    matcher = PhraseMatcher([("cpu", 1), ("cpu temp", 2), ("temp", 3), ("my cpu temp now", 4)])
+    
+    found = [(m.phrase, m.start) for m in matcher.find_all("show my cpu temp")]
+    
+    assert found == [("cpu", 2), ("cpu temp", 2), ("temp", 3)]
+
+
+def test_matcher_prefers_the_most_specific_phrase():
+    matcher = PhraseMatcher([("memory", "a"), ("how much memory", "b"), ("free memory", "c")])
+    
+    assert matcher.best("how much memory is free").value == "b"
+    assert matcher.best("free memory please").value == "c"
+    assert matcher.best("nothing here") is None
+    assert [m.value for m in matcher.ranked("how much memory is free")] == ["b", "a"]
+
+
+def test_matcher_only_matches_whole_words():
+    matcher = PhraseMatcher([("mounted", 1), ("help", 2), ("cpu temp", 3)])
+    
+    assert matcher.best("show unmounted drives") is None
+    assert matcher.best("that was helpful") is None
+    assert matcher.best("what are my cpu temps?").value == 3
+    assert matcher.best("HELP!").value == 2
+
+
+def test_classifier_word_boundaries():
+    assert classify_query("list unmounted partitions") == (False, None)
+    assert classify_query("show mounted filesystems")[1] in ("findmnt_command", "lsblk_command")
+    assert classify_query("show journalctl errors") == (True, "journalctl_command")
+    # Longer spellings that used to match "... temp" inside a word
+    assert classify_query("what's my graphics card temperature?") == (True, "gpu_temperature")
+    assert classify_query("nvidia temperature") == (True, "gpu_temperature")
+    assert classify_query("memory usage by processes") == (True, "ps_command")
+
+
+def test_classifier_picks_longest_pattern():
+    # "processes using" is more specific than "using memory" alone would be
+    assert classify_query("which processes using memory right now") == (True, "ps_command")
+    assert classify_query("what is my ip address") == (True, "ip_addr_command")
+
+
+def test_classifier_regex_fallback():
+    assert classify_query("display my ram") == (True, "free_command")
+    assert classify_query("tell me a joke") == (False, None)
+
+
+def test_auto_response_agrees_with_classification():
+    for query in ["what can you do", "help me check disk space", "how much disk space do i have"]:
+        _, tool = classify_query(query)
+        assert is_auto_response(query) == tool.startswith("auto_response:")
+        if is_auto_response(query):
+            assert tool == f"auto_response:{get_auto_response_type(query)}"
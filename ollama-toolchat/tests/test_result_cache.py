@@ -0,0 +1,55 @@
+import time
+from src.toolchat.agent.result_cache import ResultCache
+from src.toolchat.tools.base import ToolResult
+
+
+def test_hit_ignores_argument_order():
+    cache = ResultCache(max_entries=4)
+    cache.put("df_command", {"path": "/", "human": True}, ToolResult(ok=True, data={"n": 1}), ttl=10)
+    
+    hit = cache.get("df_command", {"human": True, "path": "/"})
+    
+    assert hit is not None
+    assert hit.data == {"n": 1}
+    assert cache.get("df_command", {"path": "/home"}) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire():
+    cache = ResultCache(max_entries=4)
+    cache.put("ps_command", {}, ToolResult(ok=True, data={}), ttl=0.05)
+    
+    time.sleep(0.1)
+    
+    assert cache.get("ps_command", {}) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = ResultCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.put(name, {}, ToolResult(ok=True, data=name), ttl=10)
+    cache.get("a", {})
+    
+    cache.put("c", {}, ToolResult(ok=True, data="c"), ttl=10)
+    
+    assert cache.get("b", {}) is None
+    assert cache.get("a", {}) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_failures_are_not_cached():
+    cache = ResultCache(max_entries=2)
+    cache.put("ps_command", {}, ToolResult(ok=False, error_code="command_failed"), ttl=10)
+    
+    assert cache.get("ps_command", {}) is None
+
+
+def test_cached_result_is_a_copy():
+    cache = ResultCache(max_entries=2)
+    cache.put("free_command", {}, ToolResult(ok=True, data={"free": 1}), ttl=10)
+    
+    cache.get("free_command", {}).data["free"] = 2
+    
+    assert cache.get("free_command", {}).data == {"free": 1}
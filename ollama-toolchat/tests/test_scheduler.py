@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from src.toolchat.agent.scheduler import Pool, ToolScheduler
+from src.toolchat.tools.base import ToolSpec, ToolTier
+
+
+def _spec(name: str, resource_class: str = "quick", tier: ToolTier = ToolTier.READ_ONLY) -> ToolSpec:
+    return ToolSpec(name=name, description="", args_schema={}, tier=tier, resource_class=resource_class)
+
+
+async def test_class_pool_bounds_concurrency():
+    scheduler = ToolScheduler(class_slots={"disk_scan": 2}, tier_slots={})
+    spec = _spec("du_command", "disk_scan")
+    running = []
+    peak = []
+    
+    async def scan(session_id):
+        async with scheduler.slot_async(spec, session_id):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.05)
+            running.pop()
+    
+    await asyncio.gather(*[scan(f"s{i}") for i in range(6)])
+    
+    assert max(peak) == 2
+    stats = scheduler.stats()["classes"]["disk_scan"]
+    assert stats["granted"] == 6
+    assert stats["peak_queued"] == 4
+    assert stats["running"] == 0
+
+
+async def test_quick_tools_go_before_queued_scans():
+    pool = Pool("write_safe", 1)
+    order = []
+    await pool.acquire_async(0, "holder")
+    
+    async def wait(priority, label):
+        await pool.acquire_async(priority, label)
+        order.append(label)
+        pool.release()
+    
+    scan = asyncio.ensure_future(wait(2, "scan"))
+    await asyncio.sleep(0)
+    quick = asyncio.ensure_future(wait(0, "quick"))
+    await asyncio.sleep(0)
+    pool.release()
+    await asyncio.gather(scan, quick)
+    
+    assert order == ["quick", "scan"]
+
+
+async def test_quick_reads_take_precedence_over_scans_in_shared_slots():
+    scheduler = ToolScheduler(class_slots={}, tier_slots={}, shared_slots=3, quick_reserved_slots=1)
+    scan, quick = _spec("du_command", "disk_scan"), _spec("free_command")
+    release = asyncio.Event()
+    started = []
+    
+    async def run(spec, label):
+        async with scheduler.slot_async(spec, label):
+            started.append(label)
+            await release.wait()
+    
+    tasks = [asyncio.ensure_future(run(scan, f"scan{i}")) for i in range(3)]
+    await asyncio.sleep(0.01)
+    # The reserved slot is kept free for quick reads
+    assert started == ["scan0", "scan1"]
+    
+    tasks.append(asyncio.ensure_future(run(quick, "quick")))
+    await asyncio.sleep(0.01)
+    assert started == ["scan0", "scan1", "quick"]
+    assert scheduler.stats()["shared"]["queued"] == 1
+    
+    release.set()
+    await asyncio.gather(*tasks)
+    assert started[-1] == "scan2"
+
+
+async def test_sessions_take_turns():
+    pool = Pool("disk_scan", 1)
+    order = []
+    await pool.acquire_async(2, "busy")
+    
+    async def wait(session_id):
+        await pool.acquire_async(2, session_id)
+        order.append(session_id)
+        await asyncio.sleep(0)
+        pool.release()
+    
+    tasks = []
+    for session_id in ["busy", "busy", "busy", "other"]:
+        tasks.append(asyncio.ensure_future(wait(session_id)))
+        await asyncio.sleep(0)
+    pool.release()
+    await asyncio.gather(*tasks)
+    
+    assert order == ["other", "busy", "busy", "busy"]
+
+
+async def test_cancelled_waiter_gives_up_its_place():
+    pool = Pool("cpu", 1)
+    await pool.acquire_async(1, "a")
+    
+    waiter = asyncio.ensure_future(pool.acquire_async(1, "b"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    assert pool.stats()["queued"] == 0
+    
+    pool.release()
+    assert pool.stats()["running"] == 0
+
+
+def test_threads_share_the_tier_pool():
+    scheduler = ToolScheduler(class_slots={}, tier_slots={ToolTier.SYSTEM_CHANGE: 1})
+    spec = _spec("apt_install", tier=ToolTier.SYSTEM_CHANGE)
+    running = []
+    peak = []
+    
+    def install():
+        with scheduler.slot(spec, "session"):
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.pop()
+    
+    threads = [threading.Thread(target=install) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert max(peak) == 1
+    assert scheduler.stats()["tiers"]["system_change"]["granted"] == 3
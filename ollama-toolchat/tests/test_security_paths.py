@@ -1,6 +1,7 @@
+import time
 import pytest
 from pathlib import Path
-from src.toolchat.infra.security import PathValidator, PathSecurityError
+from src.toolchat.infra.security import PathTrie, PathValidator, PathSecurityError
 
 
 def test_path_validator_read_access():
@@ -64,3 +65,45 @@ def test_validate_write_raises_on_denied():
     
     with pytest.raises(PathSecurityError):
         validator.validate_write("/tmp/test/readonly.txt")
+
+
+def test_path_trie_matches_whole_components():
+    trie = PathTrie([Path("/mnt/server"), Path("/home/user/Pictures")])
+    
+    assert trie.covers(Path("/mnt/server"))
+    assert trie.covers(Path("/mnt/server/media/a.jpg"))
+    assert trie.covers(Path("/home/user/Pictures/2024"))
+    assert not trie.covers(Path("/mnt/server2/file"))
+    assert not trie.covers(Path("/home/user"))
+    assert not trie.covers(Path("/"))
+
+
+def test_resolved_paths_expire(tmp_path):
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    link = tmp_path / "current"
+    link.symlink_to(first)
+    validator = PathValidator(
+        read_roots=[str(tmp_path)],
+        write_roots=[],
+        resolve_ttl=0.05
+    )
+    
+    assert validator.validate_read(str(link)) == first
+    link.unlink()
+    link.symlink_to(second)
+    assert validator.validate_read(str(link)) == first
+    
+    time.sleep(0.1)
+    assert validator.validate_read(str(link)) == second
+
+
+def test_symlink_out_of_roots_is_denied(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "escape").symlink_to("/etc")
+    validator = PathValidator(read_roots=[str(root)], write_roots=[])
+    
+    assert not validator.can_read(str(root / "escape" / "passwd"))
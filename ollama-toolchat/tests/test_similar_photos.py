@@ -0,0 +1,123 @@
+import pytest
+from pathlib import Path
+from src.toolchat.tools.similar_photos import SimilarPhotosTool, BKTree, hamming
+from src.toolchat.tools.base import ToolTier
+
+
+def _make_scene(path: Path, size, seed: int = 0):
+    from PIL import Image, ImageDraw
+    image = Image.new("RGB", size, color=(30, 30, 30))
+    draw = ImageDraw.Draw(image)
+    width, height = size
+    for i in range(6):
+        x = (i * 37 + seed * 53) % 80 / 100 * width
+        y = (i * 61 + seed * 29) % 80 / 100 * height
+        shade = (i * 40 + seed * 90) % 255
+        draw.rectangle([x, y, x + width / 5, y + height / 4], fill=(shade, 255 - shade, 128))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path, quality=70)
+
+
+@pytest.fixture
+def similar_tool(tmp_path, monkeypatch):
+    from src.toolchat.infra.security import PathValidator
+    from src.toolchat.tools import similar_photos
+    from src.toolchat.tools.photo_hash_index import PhotoHashIndex
+    
+    validator = PathValidator(read_roots=[str(tmp_path)], write_roots=[str(tmp_path)])
+    monkeypatch.setattr(similar_photos, "path_validator", validator)
+    monkeypatch.setattr(similar_photos, "photo_hash_index", PhotoHashIndex(db_path=str(tmp_path / "phash.db")))
+    return SimilarPhotosTool()
+
+
+def test_similar_photos_spec():
+    tool = SimilarPhotosTool()
+    
+    assert tool.spec.name == "find_similar_photos"
+    assert tool.spec.tier == ToolTier.READ_ONLY
+    assert tool.spec.requires_confirmation is False
+
+
+def test_bktree_radius_search_matches_brute_force():
+    import random
+    rng = random.Random(7)
+    values = [rng.getrandbits(64) for _ in range(300)]
+    # Plant close neighbours so the radius actually matches something
+    values += [values[0] ^ 0b101, values[1] ^ (1 << 63)]
+    
+    tree = BKTree()
+    for value in values:
+        tree.add(value)
+    
+    for query in values[:20]:
+        expected = {v for v in values if hamming(query, v) <= 4}
+        assert {v for v, _ in tree.search(query, 4)} == expected
+
+
+def test_find_similar_photos_groups_resized_copy(similar_tool, tmp_path):
+    photos_dir = tmp_path / "pictures"
+    _make_scene(photos_dir / "original.jpg", (640, 480), seed=1)
+    _make_scene(photos_dir / "copies" / "small.jpg", (320, 240), seed=1)
+    _make_scene(photos_dir / "other.jpg", (640, 480), seed=2)
+    
+    result = similar_tool.execute({"path": str(photos_dir)})
+    
+    assert result.ok is True
+    assert result.data["photos_scanned"] == 3
+    assert result.data["similar_groups"] == 1
+    group = result.data["top_groups"][0]
+    assert group["count"] == 2
+    # The larger file is listed first as the one to keep
+    assert group["files"][0].endswith("original.jpg")
+    assert group["files"][1].endswith("small.jpg")
+
+
+def test_find_similar_photos_reuses_index(similar_tool, tmp_path, monkeypatch):
+    from src.toolchat.tools import similar_photos
+    
+    photos_dir = tmp_path / "pictures"
+    _make_scene(photos_dir / "a.jpg", (200, 150), seed=3)
+    _make_scene(photos_dir / "b.png", (100, 75), seed=3)
+    
+    first = similar_tool.execute({"path": str(photos_dir), "algorithm": "phash"})
+    assert first.data["hashes_computed"] == 2
+    
+    def fail(*args, **kwargs):
+        pytest.fail("indexed photos were hashed again")
+    
+    monkeypatch.setattr(similar_photos, "_hash_photos", fail)
+    second = similar_tool.execute({"path": str(photos_dir), "algorithm": "phash"})
+    
+    assert second.data["hashes_cached"] == 2
+    assert second.data["similar_groups"] == first.data["similar_groups"] == 1
+
+
+def test_find_similar_photos_rejects_bad_threshold(similar_tool, tmp_path):
+    result = similar_tool.execute({"path": str(tmp_path), "threshold": 40})
+    
+    assert result.ok is False
+    assert result.error_code == "invalid_threshold"
+    
+    result = similar_tool.execute({"path": str(tmp_path), "threshold": "six"})
+    assert result.error_code == "invalid_threshold"
+    
+    # Models often send numbers as strings
+    result = similar_tool.execute({"path": str(tmp_path), "threshold": "6"})
+    assert result.ok is True and result.data["threshold"] == 6
+
+
+def test_find_similar_photos_reports_photo_limit(similar_tool, tmp_path, monkeypatch):
+    from src.toolchat.tools import similar_photos
+    
+    photos_dir = tmp_path / "pictures"
+    for seed in range(3):
+        _make_scene(photos_dir / f"{seed}.jpg", (64, 48), seed=seed)
+    monkeypatch.setattr(similar_photos, "_MAX_PHOTOS", 2)
+    
+    result = similar_tool.execute({"path": str(photos_dir)})
+    
+    assert result.data["photos_scanned"] == 2
+    assert result.data["truncated"] is True and result.data["photo_limit"] == 2
+    
+    monkeypatch.setattr(similar_photos, "_MAX_PHOTOS", 3)
+    assert similar_tool.execute({"path": str(photos_dir)}).data["truncated"] is False
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.toolchat.agent.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    results = []
+    
+    def slow():
+        calls.append(1)
+        time.sleep(0.3)
+        return "done"
+    
+    def worker():
+        results.append(flight.do("df", slow))
+    
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert all(result == "done" for result, _ in results)
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    errors = []
+    
+    def failing():
+        time.sleep(0.2)
+        raise RuntimeError("scan failed")
+    
+    def worker():
+        try:
+            flight.do("du", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+    
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == ["scan failed"] * 3
+
+
+async def test_async_callers_share_one_execution_and_its_output():
+    flight = SingleFlight()
+    calls = []
+    seen = {"a": [], "b": []}
+    
+    async def scan(emit):
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        emit("chunk")
+        return "result"
+    
+    results = await asyncio.gather(
+        flight.do_async("find_duplicates", scan, on_output=seen["a"].append),
+        flight.do_async("find_duplicates", scan, on_output=seen["b"].append),
+    )
+    
+    assert len(calls) == 1
+    assert results == [("result", False), ("result", True)]
+    assert seen == {"a": ["chunk"], "b": ["chunk"]}
+    # Completed calls are not remembered
+    await flight.do_async("find_duplicates", scan)
+    assert len(calls) == 2
+
+
+async def test_execution_survives_until_the_last_waiter_cancels():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = []
+    
+    async def scan(emit):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+    
+    first = asyncio.ensure_future(flight.do_async("du", scan))
+    second = asyncio.ensure_future(flight.do_async("du", scan))
+    await started.wait()
+    
+    first.cancel()
+    await asyncio.sleep(0.05)
+    assert cancelled == []
+    
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    await asyncio.sleep(0)
+    assert cancelled == [1]
@@ -0,0 +1,47 @@
+from src.toolchat.agent.prompt import SUMMARY_PROMPT, build_summary_messages, get_system_prompt
+from src.toolchat.tools.procfs import PROCFS_TOOLS
+from src.toolchat.tools import registry as registry_module
+from src.toolchat.tools.registry import ToolRegistry
+
+TOOL_RESULT = "Memory: 12.1GB used of 31.2GB, 18.4GB available. Swap: 0B used of 2.0GB"
+
+
+def _history(turns):
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i} about my system"})
+        history.append({"role": "system", "content": "Command output:\n" + "x" * 800})
+        history.append({"role": "assistant", "content": f"answer {i}, explained in a sentence or two"})
+    return history
+
+
+def test_summary_messages_keep_only_recent_turns():
+    messages = build_summary_messages("how much ram do I have?", TOOL_RESULT, _history(5), depth=2)
+    
+    assert messages[0] == {"role": "system", "content": SUMMARY_PROMPT}
+    # Earlier tool results are dropped; the last two user/assistant messages remain
+    assert [m["content"] for m in messages[1:3]] == ["question 4 about my system", "answer 4, explained in a sentence or two"]
+    assert messages[-1]["role"] == "user"
+    assert messages[-1]["content"].startswith("how much ram do I have?")
+    assert TOOL_RESULT in messages[-1]["content"]
+    
+    assert len(build_summary_messages("q", TOOL_RESULT, _history(5), depth=0)) == 2
+
+
+def test_summary_prompt_is_an_order_of_magnitude_smaller(monkeypatch):
+    registry = ToolRegistry()
+    for tool_class in PROCFS_TOOLS:
+        registry.register(tool_class())
+    monkeypatch.setattr(registry_module, "registry", registry)
+    history = _history(6)
+    
+    # What the post-tool call used to send: the full tool-calling prompt and all history
+    before = [{"role": "system", "content": get_system_prompt()}] + history + [
+        {"role": "system", "content": TOOL_RESULT}
+    ]
+    after = build_summary_messages("how much ram do I have?", TOOL_RESULT, history, depth=4)
+    
+    def size(messages):
+        return sum(len(m["content"]) for m in messages)
+    
+    assert size(after) * 10 < size(before)
@@ -1,3 +1,4 @@
+import os
 import pytest
 from pathlib import Path
 from src.toolchat.tools.photos import OrganizePhotosTool
@@ -42,3 +43,239 @@ def test_organize_photos_invalid_input():
     result = tool.execute(args, dry_run=True)
     
     assert result.ok is False
+
+
+def _make_photo(path: Path, date_taken: str = None):
+    from PIL import Image
+    image = Image.new("RGB", (8, 8), color=(120, 80, 40))
+    exif = Image.Exif()
+    if date_taken:
+        exif.get_ifd(0x8769)[0x9003] = date_taken
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path, exif=exif)
+
+
+@pytest.fixture
+def photo_dirs(tmp_path, monkeypatch):
+    from src.toolchat.infra.security import PathValidator
+    from src.toolchat.tools import photos
+    from src.toolchat.tools.exif_cache import ExifDateCache
+    
+    validator = PathValidator(read_roots=[str(tmp_path)], write_roots=[str(tmp_path)])
+    monkeypatch.setattr(photos, "path_validator", validator)
+    # Keep cached dates out of the working directory's ollama-toolchat-exif.db
+    monkeypatch.setattr(photos, "exif_date_cache", ExifDateCache(db_path=str(tmp_path / "exif.db")))
+    return tmp_path / "inbox", tmp_path / "organized"
+
+
+def test_pillow_date_taken_reads_exif_ifd(tmp_path):
+    from src.toolchat.tools.photos import _pillow_date_taken
+    
+    photo = tmp_path / "a.jpg"
+    _make_photo(photo, "2021:07:04 12:30:00")
+    
+    assert _pillow_date_taken(photo).isoformat() == "2021-07-04T12:30:00"
+
+
+def test_organize_photos_parallel_plan_and_move(photo_dirs, monkeypatch):
+    from src.toolchat.tools import photos
+    
+    inbox, organized = photo_dirs
+    monkeypatch.setattr(photos, "_DATE_CHUNK_SIZE", 2)
+    
+    for i in range(5):
+        _make_photo(inbox / f"sub{i % 2}" / f"img{i}.jpg", f"2020:0{i + 1}:15 10:00:00")
+    # Same name and month as another photo: must not be planned onto the same file
+    _make_photo(inbox / "other" / "img0.jpg", "2020:01:20 10:00:00")
+    
+    tool = OrganizePhotosTool()
+    args = {"input_dir": str(inbox), "output_dir": str(organized)}
+    
+    result = tool.execute(args, dry_run=True)
+    assert result.ok is True
+    assert result.data["total_photos"] == 6
+    destinations = [p["destination"] for p in result.data["plan"]]
+    assert len(set(destinations)) == 6
+    assert not organized.exists()
+    
+    result = tool.execute({**args, "dry_run": False})
+    assert result.ok is True
+    assert sorted(p.name for p in (organized / "2020_01").iterdir()) == ["img0.jpg", "img0_1.jpg"]
+    assert (organized / "2020_05" / "img4.jpg").exists()
+
+
+def test_organize_photos_reports_failed_moves(photo_dirs, monkeypatch):
+    from src.toolchat.tools import photos
+    from src.toolchat.tools.file_mover import FileMover
+    
+    class FailingMover(FileMover):
+        def move_all(self, moves, journal_path):
+            moves = list(moves)
+            yield from super().move_all([m for m in moves if m[0].name != "bad.jpg"], journal_path)
+            for source, target in moves:
+                if source.name == "bad.jpg":
+                    yield source, target, "Permission denied"
+    
+    inbox, organized = photo_dirs
+    monkeypatch.setattr(photos, "FileMover", FailingMover)
+    _make_photo(inbox / "good.jpg", "2020:01:15 10:00:00")
+    _make_photo(inbox / "bad.jpg", "2020:02:15 10:00:00")
+    
+    result = OrganizePhotosTool().execute({"input_dir": str(inbox), "output_dir": str(organized), "dry_run": False})
+    
+    assert result.ok is False
+    assert result.error_code == "partial_failure"
+    assert result.message.startswith("Moved 1 photos, 1 failed:") and "Permission denied" in result.message
+    assert result.details["failed_photos"] == 1
+
+
+def test_exif_date_cache_roundtrip(tmp_path):
+    from datetime import datetime
+    from src.toolchat.tools.exif_cache import ExifDateCache, file_key
+    
+    cache = ExifDateCache(db_path=str(tmp_path / "exif.db"))
+    photo = tmp_path / "a.jpg"
+    _make_photo(photo)
+    key = file_key(photo.stat())
+    
+    assert cache.get(key) == (False, None)
+    
+    cache.put_many([(key, None)])
+    assert cache.get(key) == (True, None)
+    
+    cache.put_many([(key, datetime(2019, 3, 1, 8, 0))])
+    assert cache.get(key) == (True, datetime(2019, 3, 1, 8, 0))
+
+
+def test_organize_photos_reuses_cached_dates(photo_dirs, monkeypatch):
+    from src.toolchat.tools import photos
+    
+    inbox, organized = photo_dirs
+    _make_photo(inbox / "img.jpg", "2022:11:05 09:00:00")
+    _make_photo(inbox / "nodate.jpg")
+    
+    tool = OrganizePhotosTool()
+    args = {"input_dir": str(inbox), "output_dir": str(organized)}
+    first = tool.execute(args, dry_run=True)
+    
+    def fail(paths):
+        raise AssertionError(f"metadata re-extracted for {paths}")
+    
+    monkeypatch.setattr(photos, "_extract_dates", fail)
+    second = tool.execute(args, dry_run=True)
+    
+    assert second.ok is True
+    assert second.data["plan"] == first.data["plan"]
+
+
+def test_organize_photos_does_not_cache_misses_from_a_failed_exiftool_batch(photo_dirs, monkeypatch):
+    from src.toolchat.tools import photos
+    from src.toolchat.tools.exif_cache import file_key
+    
+    inbox, organized = photo_dirs
+    _make_photo(inbox / "img.jpg", "2022:11:05 09:00:00")
+    _make_photo(inbox / "nodate.jpg")
+    monkeypatch.setattr(photos.exiftool_helper, "get_dates_taken", lambda paths: None)
+    
+    result = OrganizePhotosTool().execute({"input_dir": str(inbox), "output_dir": str(organized)}, dry_run=True)
+    
+    assert result.ok is True
+    dated, undated = (file_key(os.stat(inbox / name)) for name in ("img.jpg", "nodate.jpg"))
+    cached = photos.exif_date_cache.get_many([dated, undated])
+    assert dated in cached
+    assert undated not in cached
+
+
+def test_plan_operations_spill_to_disk():
+    from src.toolchat.tools.base import PlanOperations
+    
+    operations = PlanOperations(spill_threshold=3)
+    for i in range(7):
+        operations.append([f"/src/{i}", f"/dst/{i}", i])
+    operations.close()
+    
+    assert operations.spilled is True
+    assert len(operations) == 7
+    assert [op[2] for op in operations] == list(range(7))
+    
+    operations.discard()
+    assert operations.spilled is False
+
+
+def _spilled_operations():
+    from src.toolchat.tools.base import PlanOperations
+    
+    operations = PlanOperations(spill_threshold=1)
+    operations.append(["/src/a.jpg", "/dst/a.jpg", 0])
+    operations.close()
+    return operations, operations._path
+
+
+def test_expired_and_evicted_plans_remove_their_spill_files():
+    from datetime import timedelta
+    from src.toolchat.agent.planner import PlanStore
+    
+    store = PlanStore(ttl_sec=3600, max_plans=2)
+    files = []
+    plan_ids = []
+    for _ in range(3):
+        operations, path = _spilled_operations()
+        files.append(path)
+        plan_ids.append(store.create_plan("s1", "organize_photos", {}, "plan", operations))
+    
+    # Creating the third plan evicted the first
+    assert store.get_plan(plan_ids[0]) is None
+    assert not os.path.exists(files[0])
+    
+    store.get_plan(plan_ids[1]).created_at -= timedelta(hours=2)
+    assert store.get_plan(plan_ids[1]) is None
+    assert not os.path.exists(files[1])
+    
+    assert store.get_plan(plan_ids[2]) is not None
+    store.delete_plan(plan_ids[2])
+    assert not os.path.exists(files[2])
+
+
+def test_remove_stale_plan_files():
+    from src.toolchat.tools.base import PlanOperations
+    
+    stale, stale_path = _spilled_operations()
+    fresh, fresh_path = _spilled_operations()
+    os.utime(stale_path, (0, 0))
+    
+    assert PlanOperations.remove_stale_files(3600) >= 1
+    assert not os.path.exists(stale_path)
+    assert os.path.exists(fresh_path)
+    fresh.discard()
+
+
+def test_confirmed_plan_replays_without_rescan(photo_dirs, monkeypatch):
+    import os
+    from src.toolchat.agent.tool_router import ToolRouter
+    from src.toolchat.tools.registry import registry
+    
+    inbox, organized = photo_dirs
+    _make_photo(inbox / "keep.jpg", "2023:02:01 10:00:00")
+    _make_photo(inbox / "edited.jpg", "2023:03:01 10:00:00")
+    
+    tool = OrganizePhotosTool()
+    monkeypatch.setitem(registry._tools, "organize_photos", tool)
+    router = ToolRouter()
+    
+    args = {"input_dir": str(inbox), "output_dir": str(organized)}
+    result, plan_id = router.execute_tool("organize_photos", args, "test_session")
+    assert plan_id is not None
+    assert "operations" not in result.dict()
+    
+    # Touch one photo after the dry run; it must be skipped, not re-planned
+    stat = os.stat(inbox / "edited.jpg")
+    os.utime(inbox / "edited.jpg", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    monkeypatch.setattr(tool, "_scan_photos", lambda *a, **kw: pytest.fail("plan was recomputed"))
+    
+    result = router.execute_confirmed_plan(plan_id)
+    
+    assert result.ok is True
+    assert result.data["total_photos"] == 1
+    assert result.data["skipped_photos"] == 1
+    assert (organized / "2023_02" / "keep.jpg").exists()
+    assert (inbox / "edited.jpg").exists()
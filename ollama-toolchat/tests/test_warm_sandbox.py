@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import pytest
+from src.toolchat.infra import sandbox_helper
+from src.toolchat.infra.sandbox import SandboxRunner
+from src.toolchat.infra.warm_sandbox import WarmSandbox
+from tests.test_cmd_runner import _is_running
+
+
+@pytest.fixture
+def helper():
+    # No namespace: exercises the helper protocol without needing bwrap
+    sandbox = WarmSandbox(lambda argv, runtime_dir: argv, python=sys.executable)
+    yield sandbox
+    sandbox.close()
+
+
+def test_runs_commands_through_one_helper(helper):
+    first = helper.run(["echo", "hello"])
+    pid = helper.process.pid
+    second = helper.run(["sh", "-c", "echo oops >&2; exit 3"])
+    
+    assert first["ok"] is True
+    assert first["stdout"] == "hello\n"
+    assert second["ok"] is False
+    assert second["exit_code"] == 3
+    assert second["stderr"] == "oops\n"
+    assert helper.process.pid == pid
+
+
+def test_reports_commands_that_cannot_start(helper):
+    result = helper.run(["nonexistent_command_xyz"])
+    
+    assert result["ok"] is False
+    assert "No such file" in result["stderr"]
+
+
+def test_output_cap_kills_the_command(helper):
+    result = helper.run(["yes"], timeout=10, max_output_bytes=1000)
+    
+    assert result["ok"] is True
+    assert result["truncated"] is True
+    assert len(result["stdout"]) == 1000
+
+
+def test_timeout_kills_the_process_group(helper, tmp_path):
+    pid_file = tmp_path / "child.pid"
+    
+    result = helper.run(["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"], timeout=1)
+    
+    assert "timed out" in result["stderr"]
+    assert not _is_running(int(pid_file.read_text()))
+
+
+def test_processes_that_leave_the_group_are_killed(helper, tmp_path):
+    pid_file = tmp_path / "escaped.pid"
+    
+    # setsid puts the sleep outside the command's process group
+    result = helper.run(["sh", "-c", f"setsid sleep 30 > /dev/null 2>&1 & echo $! > {pid_file}"], timeout=5)
+    
+    assert result["ok"] is True
+    assert not _is_running(int(pid_file.read_text()))
+
+
+@pytest.mark.parametrize("has_children", [True, False])
+def test_sweep_only_looks_below_the_helper(monkeypatch, has_children):
+    if has_children and not sandbox_helper._HAS_CHILDREN:
+        pytest.skip("kernel without /proc/<pid>/task/<tid>/children")
+    monkeypatch.setattr(sandbox_helper, "_HAS_CHILDREN", has_children)
+    process = subprocess.Popen(["sh", "-c", "sleep 30 & wait"], start_new_session=True)
+    try:
+        time.sleep(0.2)
+        found = {pid: (ppid, session) for pid, ppid, session in sandbox_helper._descendants(os.getpid())}
+        
+        assert found[process.pid] == (os.getpid(), process.pid)
+        assert any(ppid == process.pid and session == process.pid for ppid, session in found.values())
+        assert 1 not in found and os.getppid() not in found
+    finally:
+        os.killpg(process.pid, 9)
+        process.wait()
+
+
+def test_each_command_gets_a_private_tmpdir(helper):
+    first = helper.run(["sh", "-c", 'echo secret > "$TMPDIR/f"; echo "$TMPDIR"'])
+    tmpdir = first["stdout"].strip()
+    
+    second = helper.run(["sh", "-c", 'echo "$TMPDIR"; ls "$TMPDIR"'])
+    
+    assert second["stdout"].strip() != tmpdir
+    assert not Path(tmpdir).exists()
+
+
+async def test_async_streams_output(helper):
+    chunks = []
+    
+    result = await helper.run_async(
+        ["sh", "-c", "echo one; sleep 0.1; echo two"], on_output=chunks.append
+    )
+    
+    assert result["ok"] is True
+    assert "".join(chunks) == "one\ntwo\n"
+
+
+def test_restarts_after_the_helper_exits(helper):
+    helper.run(["true"])
+    helper.process.kill()
+    helper.process.wait()
+    
+    assert helper.run(["echo", "again"])["stdout"] == "again\n"
+
+
+def test_runner_falls_back_when_the_helper_cannot_start(monkeypatch):
+    runner = SandboxRunner(mode="bwrap", warm=True)
+    monkeypatch.setattr(runner, "_wrap", lambda command, cwd, *args: (command, cwd))
+    monkeypatch.setattr(
+        "src.toolchat.infra.sandbox.settings.sandbox_helper_python", "/nonexistent/python3"
+    )
+    
+    result = runner.run(["echo", "cold"], timeout=5)
+    runner.close()
+    
+    assert result["stdout"] == "cold\n"
+
+
+def test_systemd_pool_spreads_commands_over_its_scopes(monkeypatch):
+    runner = SandboxRunner(mode="systemd", systemd_pool_size=2)
+    # No user systemd here: run the pool's helpers without a scope
+    monkeypatch.setattr(runner, "_systemd_command", lambda command, *args: command)
+    monkeypatch.setattr("src.toolchat.infra.sandbox.settings.sandbox_helper_python", sys.executable)
+    
+    try:
+        results = [runner.run(["echo", str(i)], timeout=5) for i in range(4)]
+        helpers = list(runner._helpers.values())
+        pids = {helper.process.pid for helper in helpers}
+    finally:
+        runner.close()
+    
+    assert [r["stdout"] for r in results] == ["0\n", "1\n", "2\n", "3\n"]
+    assert len(helpers) == 2
+    assert len(pids) == 2
+    timings = runner.stats.snapshot()["systemd_pool"]
+    assert timings["commands"] == 4
+    assert timings["setup_p50_ms"] is not None
+    assert "spawned_at" not in results[0]
+
+
+def test_direct_runs_record_setup_time():
+    runner = SandboxRunner(mode="none")
+    
+    runner.run(["true"], timeout=5)
+    
+    timings = runner.stats.snapshot()["none"]
+    assert timings["commands"] == 1
+    assert 0 <= timings["setup_p50_ms"] <= timings["total_p50_ms"]
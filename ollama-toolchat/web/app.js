@@ -85,6 +85,7 @@ async function sendMessage() {
 
 async function sendMessageStreaming(message) {
     let statusMessage = null;
+    let toolOutput = null;
     
     await streamingClient.sendMessageStreaming(sessionId, message, (event) => {
         switch (event.type) {
@@ -109,6 +110,14 @@ async function sendMessageStreaming(message) {
                 addMessage('system', `💭 ${event.explain}...`);
                 break;
             
+            case 'tool_output':
+                if (!toolOutput) {
+                    toolOutput = addToolOutput();
+                }
+                toolOutput.textContent += event.chunk;
+                chatContainer.scrollTop = chatContainer.scrollHeight;
+                break;
+            
             case 'tool_result':
                 // Tool result is handled internally, just show completion
                 break;
@@ -148,6 +157,21 @@ async function sendMessageStreaming(message) {
     });
 }
 
+function addToolOutput() {
+    const messageDiv = document.createElement('div');
+    messageDiv.className = 'message system';
+    
+    const contentDiv = document.createElement('div');
+    contentDiv.className = 'message-content';
+    
+    const pre = document.createElement('pre');
+    contentDiv.appendChild(pre);
+    messageDiv.appendChild(contentDiv);
+    chatContainer.appendChild(messageDiv);
+    
+    return pre;
+}
+
 function addStatusMessage(text) {
     const messageDiv = document.createElement('div');
     messageDiv.className = 'message system';